@@ -11,6 +11,9 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 # importa tu Settings y tu Base
 from app.shared.config import settings
 from app.ports.infrastructure.base import Base
+import app.ports.infrastructure.models  # noqa: F401
+import app.users.infrastructure.models  # noqa: F401
+import app.forecasts.infrastructure.models  # noqa: F401
 
 # metadata de tu ORM
 target_metadata = Base.metadata
@@ -27,6 +30,9 @@ fileConfig(config.config_file_name)
 def include_object(object_, name, type_, reflected, compare_to):
     if type_ == "table" and name in ("spatial_ref_sys", "geometry_columns", "geography_columns"):
         return False
+    # Particiones de port_forecasts: las crea la aplicación, no el ORM
+    if type_ == "table" and reflected and name.startswith("port_forecasts_p"):
+        return False
     return True
 
 def run_migrations_offline():
@@ -0,0 +1,40 @@
+"""Add ports geography column
+
+Revision ID: 3b7d2c9a41f0
+Revises: e1fec8f200fc
+Create Date: 2026-10-18 09:12:44.120391
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b7d2c9a41f0'
+down_revision: Union[str, Sequence[str], None] = 'e1fec8f200fc'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS postgis")
+    # Columna generada: se mantiene sola a partir de latitude/longitude
+    op.execute(
+        """
+        ALTER TABLE ports
+        ADD COLUMN geog geography(Point, 4326)
+        GENERATED ALWAYS AS (
+            ST_SetSRID(ST_MakePoint(longitude, latitude), 4326)::geography
+        ) STORED
+        """
+    )
+    op.create_index(
+        'ix_ports_geog', 'ports', ['geog'], postgresql_using='gist'
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_ports_geog', table_name='ports')
+    op.drop_column('ports', 'geog')
@@ -0,0 +1,77 @@
+"""Add ports change notify trigger
+
+Revision ID: 8c41e5f0a2d9
+Revises: 3b7d2c9a41f0
+Create Date: 2026-10-18 10:02:17.514208
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c41e5f0a2d9'
+down_revision: Union[str, Sequence[str], None] = '3b7d2c9a41f0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Filas que caben en un payload de NOTIFY (máximo 8000 bytes)
+MAX_NOTIFY_ROWS = 50
+
+
+def upgrade() -> None:
+    # Un NOTIFY por sentencia con las filas de la tabla de transición (sin geog), para que los
+    # workers actualicen sus cachés sin volver a consultar la base; un COPY o un upsert por
+    # lotes que no cabe en el payload solo avisa del número de filas
+    op.execute(
+        f"""
+        CREATE OR REPLACE FUNCTION notify_ports_changed() RETURNS trigger AS $$
+        DECLARE
+            total integer;
+            payload text;
+        BEGIN
+            SELECT count(*) INTO total FROM changed_rows;
+            IF total = 0 THEN
+                RETURN NULL;
+            END IF;
+            IF total <= {MAX_NOTIFY_ROWS} THEN
+                SELECT json_build_object(
+                    'op', TG_OP,
+                    'rows', json_agg(json_build_object(
+                        'id', id,
+                        'name', name,
+                        'country', country,
+                        'latitude', latitude,
+                        'longitude', longitude
+                    ))
+                )::text
+                INTO payload
+                FROM changed_rows;
+            END IF;
+            IF payload IS NULL OR octet_length(payload) > 7900 THEN
+                payload := json_build_object('op', TG_OP, 'count', total)::text;
+            END IF;
+            PERFORM pg_notify('ports_changed', payload);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    # Las tablas de transición no admiten triggers con varios eventos: uno por operación
+    for event, table in (("INSERT", "NEW"), ("UPDATE", "NEW"), ("DELETE", "OLD")):
+        op.execute(
+            f"""
+            CREATE TRIGGER ports_changed_notify_{event.lower()}
+            AFTER {event} ON ports
+            REFERENCING {table} TABLE AS changed_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION notify_ports_changed()
+            """
+        )
+
+
+def downgrade() -> None:
+    for event in ("insert", "update", "delete"):
+        op.execute(f"DROP TRIGGER IF EXISTS ports_changed_notify_{event} ON ports")
+    op.execute("DROP FUNCTION IF EXISTS notify_ports_changed()")
@@ -0,0 +1,29 @@
+"""Add ports planar geometry index
+
+Revision ID: a4c9e2b7d610
+Revises: 5f2a9d7c1e34
+Create Date: 2026-10-18 12:05:31.517204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4c9e2b7d610'
+down_revision: Union[str, Sequence[str], None] = '5f2a9d7c1e34'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Viewports del mapa: && y ST_SnapToGrid en grados planos, no sobre la esfera
+    op.create_index(
+        'ix_ports_geom', 'ports', [sa.text('(geog::geometry)')], postgresql_using='gist'
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_ports_geom', table_name='ports')
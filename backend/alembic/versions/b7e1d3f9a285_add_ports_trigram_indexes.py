@@ -0,0 +1,36 @@
+"""Add ports trigram indexes
+
+Revision ID: b7e1d3f9a285
+Revises: a4c9e2b7d610
+Create Date: 2026-10-18 12:41:09.386254
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e1d3f9a285'
+down_revision: Union[str, Sequence[str], None] = 'a4c9e2b7d610'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # GIN de trigramas: sirven tanto a ILIKE 'q%' como al operador de similitud %
+    op.create_index(
+        'ix_ports_name_trgm', 'ports', ['name'],
+        postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'},
+    )
+    op.create_index(
+        'ix_ports_country_trgm', 'ports', ['country'],
+        postgresql_using='gin', postgresql_ops={'country': 'gin_trgm_ops'},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_ports_country_trgm', table_name='ports')
+    op.drop_index('ix_ports_name_trgm', table_name='ports')
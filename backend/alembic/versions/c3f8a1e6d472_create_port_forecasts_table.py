@@ -0,0 +1,48 @@
+"""Create port forecasts table
+
+Revision ID: c3f8a1e6d472
+Revises: b7e1d3f9a285
+Create Date: 2026-10-18 13:24:52.670118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3f8a1e6d472'
+down_revision: Union[str, Sequence[str], None] = 'b7e1d3f9a285'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Tabla particionada por rango de valid_time; las particiones semanales
+    # (port_forecasts_pYYYYMMDD) las crea el repositorio al ingerir
+    op.execute(
+        """
+        CREATE TABLE port_forecasts (
+            port_id integer NOT NULL REFERENCES ports (id) ON DELETE CASCADE,
+            valid_time timestamptz NOT NULL,
+            issued_at timestamptz NOT NULL,
+            wave_height double precision,
+            wave_period double precision,
+            wave_direction double precision,
+            wind_speed double precision,
+            wind_direction double precision,
+            wind_gust double precision,
+            tide_height double precision,
+            PRIMARY KEY (port_id, valid_time)
+        ) PARTITION BY RANGE (valid_time)
+        """
+    )
+    op.create_index(
+        'ix_port_forecasts_valid_time_brin', 'port_forecasts', ['valid_time'], postgresql_using='brin'
+    )
+
+
+def downgrade() -> None:
+    # Borra también todas las particiones
+    op.drop_table('port_forecasts')
@@ -0,0 +1,73 @@
+"""Create port forecast rollups
+
+Revision ID: d9a4b2c7e815
+Revises: c3f8a1e6d472
+Create Date: 2026-10-18 14:02:17.294861
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd9a4b2c7e815'
+down_revision: Union[str, Sequence[str], None] = 'c3f8a1e6d472'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+VARIABLES = (
+    'wave_height',
+    'wave_period',
+    'wave_direction',
+    'wind_speed',
+    'wind_direction',
+    'wind_gust',
+    'tide_height',
+)
+# Suma y número de valores no nulos en lugar de la media: la semana se combina exacta desde los días
+AGGREGATES = ('min', 'max', 'sum', 'count')
+ROLLUPS = ('port_forecast_daily', 'port_forecast_weekly')
+
+
+def upgrade() -> None:
+    for table in ROLLUPS:
+        op.create_table(
+            table,
+            sa.Column('port_id', sa.Integer(), sa.ForeignKey('ports.id', ondelete='CASCADE'), primary_key=True),
+            sa.Column('bucket_start', sa.DateTime(timezone=True), primary_key=True),
+            sa.Column('hours', sa.Integer(), nullable=False),
+            *(
+                sa.Column(f'{variable}_{aggregate}', sa.Integer() if aggregate == 'count' else sa.Float())
+                for variable in VARIABLES
+                for aggregate in AGGREGATES
+            ),
+        )
+
+    # Carga inicial con lo que ya hubiera, los días desde las filas horarias y las semanas desde
+    # los días; a partir de aquí los mantiene cada ingesta
+    columns = ', '.join(f'{variable}_{aggregate}' for variable in VARIABLES for aggregate in AGGREGATES)
+    op.execute(
+        f"""
+        INSERT INTO port_forecast_daily (port_id, bucket_start, hours, {columns})
+        SELECT port_id, date_trunc('day', valid_time, 'UTC'), count(*),
+               {', '.join(f'min({v}), max({v}), sum({v}), count({v})' for v in VARIABLES)}
+        FROM port_forecasts
+        GROUP BY 1, 2
+        """
+    )
+    op.execute(
+        f"""
+        INSERT INTO port_forecast_weekly (port_id, bucket_start, hours, {columns})
+        SELECT port_id, date_trunc('week', bucket_start, 'UTC'), sum(hours),
+               {', '.join(f'min({v}_min), max({v}_max), sum({v}_sum), sum({v}_count)' for v in VARIABLES)}
+        FROM port_forecast_daily
+        GROUP BY 1, 2
+        """
+    )
+
+
+def downgrade() -> None:
+    for table in reversed(ROLLUPS):
+        op.drop_table(table)
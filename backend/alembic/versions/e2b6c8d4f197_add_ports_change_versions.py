@@ -0,0 +1,67 @@
+"""Add ports change versions and tombstones
+
+Revision ID: e2b6c8d4f197
+Revises: d9a4b2c7e815
+Create Date: 2026-10-18 14:47:33.815062
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2b6c8d4f197'
+down_revision: Union[str, Sequence[str], None] = 'd9a4b2c7e815'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # La versión es el id (xid8) de la transacción que escribe la fila. Los id de transacción
+    # por debajo del xmin de un snapshot ya han terminado, así que el cursor puede avanzar hasta
+    # ese xmin sin saltarse transacciones que confirmen más tarde con una versión menor
+    op.add_column('ports', sa.Column('version', sa.BigInteger(), nullable=True))
+    op.add_column('ports', sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True))
+    op.execute("UPDATE ports SET version = pg_current_xact_id()::text::bigint, updated_at = now()")
+    op.alter_column('ports', 'version', nullable=False)
+    op.alter_column('ports', 'updated_at', nullable=False)
+    op.create_index('ix_ports_version', 'ports', ['version', 'id'])
+
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION ports_bump_version() RETURNS trigger AS $$
+        BEGIN
+            NEW.version := pg_current_xact_id()::text::bigint;
+            NEW.updated_at := now();
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER ports_bump_version
+        BEFORE INSERT OR UPDATE ON ports
+        FOR EACH ROW EXECUTE FUNCTION ports_bump_version()
+        """
+    )
+
+    op.create_table(
+        'port_tombstones',
+        sa.Column('id', sa.Integer(), primary_key=True, autoincrement=False),
+        sa.Column('version', sa.BigInteger(), nullable=False),
+        sa.Column('deleted_at', sa.DateTime(timezone=True), nullable=False),
+    )
+    op.create_index('ix_port_tombstones_version', 'port_tombstones', ['version', 'id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_port_tombstones_version', table_name='port_tombstones')
+    op.drop_table('port_tombstones')
+    op.execute("DROP TRIGGER IF EXISTS ports_bump_version ON ports")
+    op.execute("DROP FUNCTION IF EXISTS ports_bump_version()")
+    op.drop_index('ix_ports_version', table_name='ports')
+    op.drop_column('ports', 'updated_at')
+    op.drop_column('ports', 'version')
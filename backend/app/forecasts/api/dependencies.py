@@ -0,0 +1,12 @@
+from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.shared.dependencies import get_routing_db_session
+from app.forecasts.application.services import ForecastService
+from app.forecasts.infrastructure.repositories import ForecastRepository
+
+
+def get_forecast_service(
+    db: AsyncSession = Depends(get_routing_db_session),
+) -> ForecastService:
+    return ForecastRepository(db)
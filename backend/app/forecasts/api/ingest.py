@@ -0,0 +1,56 @@
+# app/forecasts/api/ingest.py
+
+import json
+from typing import AsyncIterator, List, Optional, Tuple
+
+from pydantic import ValidationError
+
+from app.forecasts.api.schemas import ForecastIngestResult, ForecastIngestRow
+from app.forecasts.application.services import ForecastService
+from app.forecasts.domain.models import Forecast
+from app.ports.api.bulk import iter_lines
+
+
+async def iter_forecast_rows(chunks: AsyncIterator[bytes]) -> AsyncIterator[Tuple[int, Optional[Forecast]]]:
+    # Devuelve (línea, Forecast) o (línea, None) si la fila no es válida
+    async for line_no, line in iter_lines(chunks):
+        if not line.strip():
+            continue
+        try:
+            row = ForecastIngestRow.model_validate(json.loads(line))
+        except (ValidationError, json.JSONDecodeError):
+            yield line_no, None
+            continue
+        yield line_no, Forecast(**row.model_dump())
+
+
+async def import_forecasts(
+    chunks: AsyncIterator[bytes], service: ForecastService, batch_size: int
+) -> ForecastIngestResult:
+    accepted = 0
+    rejected_lines: List[int] = []
+    batch: List[Tuple[int, Forecast]] = []
+
+    async def flush():
+        nonlocal accepted
+        rejected = await service.ingest_forecasts(batch)
+        accepted += len(batch) - len(rejected)
+        rejected_lines.extend(rejected)
+        batch.clear()
+
+    async for line_no, forecast in iter_forecast_rows(chunks):
+        if forecast is None:
+            rejected_lines.append(line_no)
+            continue
+        batch.append((line_no, forecast))
+        if len(batch) >= batch_size:
+            await flush()
+    if batch:
+        await flush()
+
+    rejected_lines.sort()
+    return ForecastIngestResult(
+        accepted=accepted,
+        rejected=len(rejected_lines),
+        rejected_lines=rejected_lines,
+    )
@@ -0,0 +1,119 @@
+# app/forecasts/api/router.py
+
+from datetime import datetime, timedelta, timezone
+from typing import List, Literal, Optional, Tuple
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+
+from app.forecasts.api.dependencies import get_forecast_service
+from app.forecasts.api.ingest import import_forecasts
+from app.forecasts.api.schemas import (
+    ForecastIngestResult,
+    ForecastSeriesRead,
+    ForecastSummaryBucketRead,
+    ForecastSummaryRead,
+)
+from app.forecasts.application.services import ForecastService
+from app.forecasts.domain.models import FORECAST_VARIABLES, ROLLUP_DAY
+from app.ports.api.bulk import bulk_format
+
+router = APIRouter(tags=["forecasts"])
+
+DEFAULT_FORECAST_RANGE = timedelta(days=7)
+MAX_FORECAST_RANGE = timedelta(days=31)
+DEFAULT_SUMMARY_RANGE = timedelta(days=30)
+MAX_SUMMARY_RANGE = timedelta(days=731)
+
+
+def as_utc(value: datetime) -> datetime:
+    # Las fechas sin zona se interpretan en UTC
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def parse_range(
+    start: Optional[datetime], end: Optional[datetime], default: timedelta, maximum: timedelta
+) -> Tuple[datetime, datetime]:
+    start = as_utc(start) if start else datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0)
+    end = as_utc(end) if end else start + default
+    if end <= start:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="'to' must be after 'from'")
+    if end - start > maximum:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {maximum.days} days per request",
+        )
+    return start, end
+
+
+def parse_variables(variables: Optional[str]) -> List[str]:
+    if not variables:
+        return list(FORECAST_VARIABLES)
+    selected = list(dict.fromkeys(value.strip() for value in variables.split(",") if value.strip()))
+    unknown = [value for value in selected if value not in FORECAST_VARIABLES]
+    if unknown or not selected:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown variables: {', '.join(unknown)}; use {', '.join(FORECAST_VARIABLES)}",
+        )
+    return selected
+
+
+@router.get("/ports/{port_id}/forecast/summary", response_model=ForecastSummaryRead)
+async def read_forecast_summary(
+    port_id: int,
+    start: Optional[datetime] = Query(None, alias="from"),
+    end: Optional[datetime] = Query(None, alias="to"),
+    period: Literal["day", "week"] = Query(ROLLUP_DAY),
+    variables: Optional[str] = Query(None, description="Comma-separated variables; all by default"),
+    service: ForecastService = Depends(get_forecast_service),
+):
+    start, end = parse_range(start, end, DEFAULT_SUMMARY_RANGE, MAX_SUMMARY_RANGE)
+    selected = parse_variables(variables)
+    buckets = await service.get_forecast_summary(port_id, start, end, period, selected)
+    if buckets is None:
+        raise HTTPException(status_code=404, detail="Port not found")
+    return ForecastSummaryRead(
+        port_id=port_id,
+        start=start,
+        end=end,
+        period=period,
+        variables=selected,
+        buckets=[ForecastSummaryBucketRead.model_validate(bucket) for bucket in buckets],
+    )
+
+@router.get("/ports/{port_id}/forecast", response_model=ForecastSeriesRead)
+async def read_forecast(
+    port_id: int,
+    start: Optional[datetime] = Query(None, alias="from"),
+    end: Optional[datetime] = Query(None, alias="to"),
+    variables: Optional[str] = Query(None, description="Comma-separated variables; all by default"),
+    service: ForecastService = Depends(get_forecast_service),
+):
+    start, end = parse_range(start, end, DEFAULT_FORECAST_RANGE, MAX_FORECAST_RANGE)
+    selected = parse_variables(variables)
+    series = await service.get_forecast(port_id, start, end, selected)
+    if series is None:
+        raise HTTPException(status_code=404, detail="Port not found")
+    return ForecastSeriesRead(
+        port_id=port_id,
+        start=start,
+        end=end,
+        variables=selected,
+        valid_times=series.valid_times,
+        values=series.values,
+    )
+
+@router.post("/forecasts/ingest", response_model=ForecastIngestResult)
+async def ingest_forecasts(
+    request: Request,
+    batch_size: int = Query(10000, ge=1, le=100000),
+    service: ForecastService = Depends(get_forecast_service),
+):
+    if bulk_format(request.headers.get("content-type")) != "ndjson":
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Use application/x-ndjson",
+        )
+    return await import_forecasts(request.stream(), service, batch_size)
@@ -0,0 +1,54 @@
+from datetime import datetime
+from typing import Dict, List, Optional
+from pydantic import AwareDatetime, BaseModel, ConfigDict
+
+class ForecastSeriesRead(BaseModel):
+    port_id: int
+    start: datetime
+    end: datetime
+    variables: List[str]
+    valid_times: List[datetime]
+    # values[variable][i] corresponde a valid_times[i]
+    values: Dict[str, List[Optional[float]]]
+
+class ForecastStatsRead(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    min: Optional[float]
+    max: Optional[float]
+    mean: Optional[float]
+
+class ForecastSummaryBucketRead(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    bucket_start: datetime
+    hours: int
+    values: Dict[str, ForecastStatsRead]
+    partial: bool
+
+class ForecastSummaryRead(BaseModel):
+    port_id: int
+    start: datetime
+    end: datetime
+    period: str
+    variables: List[str]
+    buckets: List[ForecastSummaryBucketRead]
+
+class ForecastIngestRow(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    port_id: int
+    valid_time: AwareDatetime
+    issued_at: AwareDatetime
+    wave_height: Optional[float] = None
+    wave_period: Optional[float] = None
+    wave_direction: Optional[float] = None
+    wind_speed: Optional[float] = None
+    wind_direction: Optional[float] = None
+    wind_gust: Optional[float] = None
+    tide_height: Optional[float] = None
+
+class ForecastIngestResult(BaseModel):
+    accepted: int
+    rejected: int
+    rejected_lines: List[int]
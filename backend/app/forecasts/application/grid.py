@@ -0,0 +1,191 @@
+import hashlib
+import os
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.ports.domain.models import Port
+
+
+@dataclass(frozen=True)
+class GridSpec:
+    # Rejilla regular lat/lon: centro de la primera celda, paso y número de celdas.
+    # Los campos tienen forma (tiempo, nlat, nlon).
+    lat0: float
+    lon0: float
+    dlat: float
+    dlon: float
+    nlat: int
+    nlon: int
+
+    @property
+    def is_global(self) -> bool:
+        # Rejilla que da la vuelta completa en longitud: la última columna es vecina de la primera
+        return abs(abs(self.dlon) * self.nlon - 360.0) < 1e-6
+
+
+def open_grid(path: str, spec: GridSpec, dtype: str = "float32", steps: Optional[int] = None) -> np.ndarray:
+    # Mapea el fichero sin leerlo: solo se cargan las páginas que toca el gather
+    if path.endswith(".npy"):
+        field = np.load(path, mmap_mode="r")
+    else:
+        itemsize = np.dtype(dtype).itemsize
+        if steps is None:
+            step_bytes = itemsize * spec.nlat * spec.nlon
+            with open(path, "rb") as f:
+                f.seek(0, 2)
+                steps, remainder = divmod(f.tell(), step_bytes)
+            # Un fichero truncado o corrupto no se ingiere a medias
+            if remainder:
+                raise ValueError(
+                    f"Grid {path} has {remainder} trailing bytes; size is not a multiple of {step_bytes}"
+                )
+        field = np.memmap(path, dtype=dtype, mode="r", shape=(steps, spec.nlat, spec.nlon))
+    if field.ndim != 3 or field.shape[1:] != (spec.nlat, spec.nlon):
+        raise ValueError(f"Grid {path} has shape {field.shape}, expected (time, {spec.nlat}, {spec.nlon})")
+    return field
+
+
+def coordinate_hash(ports: Sequence[Port]) -> str:
+    # Cambia si un puerto se mueve, se añade o se borra
+    ordered = sorted(ports, key=lambda port: port.id)
+    data = np.array([(port.id, port.latitude, port.longitude) for port in ordered], dtype=np.float64)
+    return hashlib.blake2b(data.tobytes(), digest_size=16).hexdigest()
+
+
+@dataclass(frozen=True)
+class PortCellIndex:
+    # Para cada puerto dentro de la rejilla: las 4 celdas vecinas (índice plano) y sus pesos bilineales
+    port_ids: np.ndarray
+    cells: np.ndarray
+    weights: np.ndarray
+    outside_ids: Tuple[int, ...]
+
+
+def build_cell_index(ports: Sequence[Port], spec: GridSpec) -> PortCellIndex:
+    ordered = sorted(ports, key=lambda port: port.id)
+    ids = np.array([port.id for port in ordered], dtype=np.int64)
+    lat = np.array([port.latitude for port in ordered], dtype=np.float64)
+    lon = np.array([port.longitude for port in ordered], dtype=np.float64)
+
+    # Posición fraccionaria en la rejilla
+    fy = (lat - spec.lat0) / spec.dlat
+    fx = (lon - spec.lon0) / spec.dlon
+    if spec.is_global:
+        fx = np.mod(fx, spec.nlon)
+        inside_x = np.ones(len(ids), dtype=bool)
+    else:
+        inside_x = (fx >= 0) & (fx <= spec.nlon - 1)
+    inside = inside_x & (fy >= 0) & (fy <= spec.nlat - 1)
+    fy, fx, ids_inside = fy[inside], fx[inside], ids[inside]
+
+    y0 = np.minimum(np.floor(fy).astype(np.int64), spec.nlat - 2 if spec.nlat > 1 else 0)
+    ty = fy - y0
+    if spec.is_global:
+        # np.mod puede devolver exactamente nlon para offsets negativos diminutos: se vuelve a envolver
+        x_floor = np.floor(fx)
+        tx = fx - x_floor
+        x0 = x_floor.astype(np.int64) % spec.nlon
+    else:
+        x0 = np.minimum(np.floor(fx).astype(np.int64), spec.nlon - 2 if spec.nlon > 1 else 0)
+        tx = fx - x0
+    y1 = np.minimum(y0 + 1, spec.nlat - 1)
+    x1 = (x0 + 1) % spec.nlon if spec.is_global else np.minimum(x0 + 1, spec.nlon - 1)
+
+    cells = np.stack(
+        [y0 * spec.nlon + x0, y0 * spec.nlon + x1, y1 * spec.nlon + x0, y1 * spec.nlon + x1], axis=1
+    )
+    weights = np.stack(
+        [(1 - ty) * (1 - tx), (1 - ty) * tx, ty * (1 - tx), ty * tx], axis=1
+    )
+    return PortCellIndex(
+        port_ids=ids_inside,
+        cells=np.ascontiguousarray(cells),
+        weights=np.ascontiguousarray(weights),
+        outside_ids=tuple(ids[~inside].tolist()),
+    )
+
+
+def save_cell_index(path: str, index: PortCellIndex) -> None:
+    # Escritura atómica: otro proceso de ingesta puede estar leyendo el mismo fichero
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        np.savez(
+            f,
+            port_ids=index.port_ids,
+            cells=index.cells,
+            weights=index.weights,
+            outside_ids=np.array(index.outside_ids, dtype=np.int64),
+        )
+    os.replace(tmp, path)
+
+
+def load_cell_index(path: str) -> PortCellIndex:
+    with np.load(path) as data:
+        return PortCellIndex(
+            port_ids=data["port_ids"],
+            cells=data["cells"],
+            weights=data["weights"],
+            outside_ids=tuple(data["outside_ids"].tolist()),
+        )
+
+
+class PortCellIndexCache:
+    # Índices por (rejilla, hash de coordenadas): solo se recalculan si los puertos cambian.
+    # Con directory se guardan en disco (.npz), así que sobreviven entre ejecuciones de la ingesta.
+    def __init__(self, max_entries: int = 8, directory: Optional[str] = None):
+        self.max_entries = max_entries
+        self.directory = directory
+        self._entries: "OrderedDict[Tuple[GridSpec, str], PortCellIndex]" = OrderedDict()
+        self.builds = 0
+        self.loads = 0
+
+    def path(self, spec: GridSpec, coordinates: str) -> str:
+        digest = hashlib.blake2b(repr(spec).encode("utf-8"), digest_size=8).hexdigest()
+        return os.path.join(self.directory, f"{digest}-{coordinates}.npz")
+
+    def get(self, ports: Sequence[Port], spec: GridSpec) -> PortCellIndex:
+        coordinates = coordinate_hash(ports)
+        key = (spec, coordinates)
+        index = self._entries.get(key)
+        if index is not None:
+            self._entries.move_to_end(key)
+            return index
+        index = self._load(spec, coordinates)
+        if index is None:
+            index = build_cell_index(ports, spec)
+            self.builds += 1
+            if self.directory is not None:
+                os.makedirs(self.directory, exist_ok=True)
+                save_cell_index(self.path(spec, coordinates), index)
+        self._entries[key] = index
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return index
+
+    def _load(self, spec: GridSpec, coordinates: str) -> Optional[PortCellIndex]:
+        if self.directory is None:
+            return None
+        try:
+            index = load_cell_index(self.path(spec, coordinates))
+        except (OSError, KeyError, ValueError):
+            # No existe o está corrupto: se reconstruye y se sobrescribe
+            return None
+        self.loads += 1
+        return index
+
+
+def sample_grid(field: np.ndarray, index: PortCellIndex, start: int = 0, stop: Optional[int] = None) -> np.ndarray:
+    # Un único gather vectorizado para todos los puertos y pasos de tiempo [start, stop): (tiempo, puerto).
+    # Las celdas sin dato (NaN, p. ej. tierra en un modelo de oleaje) no cuentan y los pesos se renormalizan.
+    steps = field[start:stop]
+    flat = steps.reshape(steps.shape[0], -1)
+    values = np.asarray(flat[:, index.cells], dtype=np.float64)
+    valid = np.isfinite(values)
+    weights = np.where(valid, index.weights, 0.0)
+    total = weights.sum(axis=2)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        sampled = (np.where(valid, values, 0.0) * weights).sum(axis=2) / total
+    return np.where(total > 0, sampled, np.nan)
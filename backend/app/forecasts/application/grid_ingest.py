@@ -0,0 +1,67 @@
+import asyncio
+from dataclasses import dataclass
+from datetime import datetime
+from typing import List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.forecasts.application.grid import GridSpec, PortCellIndexCache, sample_grid
+from app.forecasts.application.services import ForecastService
+from app.forecasts.domain.models import FORECAST_VARIABLES
+from app.ports.domain.models import Port
+
+
+@dataclass
+class GridIngestResult:
+    rows: int
+    ports: int
+    steps: int
+    # Puertos fuera de la rejilla: no reciben valores de este modelo
+    outside_ids: Tuple[int, ...]
+
+
+def to_nullable(values: np.ndarray) -> List[List[Optional[float]]]:
+    # NaN (sin dato) pasa a NULL en la base
+    result = values.astype(object)
+    result[np.isnan(values)] = None
+    return result.tolist()
+
+
+class GridIngestion:
+    def __init__(self, forecasts: ForecastService, index_cache: PortCellIndexCache, time_chunk: int = 24):
+        self.forecasts = forecasts
+        self.index_cache = index_cache
+        self.time_chunk = time_chunk
+
+    async def run(
+        self,
+        ports: Sequence[Port],
+        spec: GridSpec,
+        fields: Mapping[str, np.ndarray],
+        valid_times: Sequence[datetime],
+        issued_at: datetime,
+    ) -> GridIngestResult:
+        unknown = [variable for variable in fields if variable not in FORECAST_VARIABLES]
+        if unknown:
+            raise ValueError(f"Unknown forecast variables: {', '.join(unknown)}")
+        for variable, field in fields.items():
+            if field.shape[0] != len(valid_times):
+                raise ValueError(f"{variable} has {field.shape[0]} steps, expected {len(valid_times)}")
+
+        index = self.index_cache.get(ports, spec)
+        port_ids = index.port_ids.tolist()
+        rows = 0
+        # Por bloques de pasos de tiempo: la memoria queda acotada aunque el fichero no lo esté
+        for start in range(0, len(valid_times), self.time_chunk):
+            stop = min(start + self.time_chunk, len(valid_times))
+            values = {
+                variable: to_nullable(await asyncio.to_thread(sample_grid, field, index, start, stop))
+                for variable, field in fields.items()
+            }
+            rows += await self.forecasts.ingest_forecast_grid(port_ids, valid_times[start:stop], issued_at, values)
+        return GridIngestResult(
+            rows=rows,
+            ports=len(port_ids),
+            steps=len(valid_times),
+            outside_ids=index.outside_ids,
+        )
@@ -0,0 +1,34 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import List, Mapping, Optional, Sequence, Tuple
+from app.forecasts.domain.models import Forecast, ForecastSeries, ForecastSummaryBucket
+
+class ForecastService(ABC):
+
+    @abstractmethod
+    async def get_forecast(
+        self, port_id: int, start: datetime, end: datetime, variables: Sequence[str]
+    ) -> Optional[ForecastSeries]:
+        # Intervalo [start, end); None si el puerto no existe
+        raise NotImplementedError
+    @abstractmethod
+    async def get_forecast_summary(
+        self, port_id: int, start: datetime, end: datetime, period: str, variables: Sequence[str]
+    ) -> Optional[List[ForecastSummaryBucket]]:
+        # Min/max/media por día o semana (UTC) en [start, end); None si el puerto no existe
+        raise NotImplementedError
+    @abstractmethod
+    async def ingest_forecasts(self, rows: Sequence[Tuple[int, Forecast]]) -> List[int]:
+        # Recibe (línea, Forecast) y devuelve las líneas rechazadas (puerto inexistente)
+        raise NotImplementedError
+    @abstractmethod
+    async def ingest_forecast_grid(
+        self,
+        port_ids: Sequence[int],
+        valid_times: Sequence[datetime],
+        issued_at: datetime,
+        values: Mapping[str, Sequence[Sequence[Optional[float]]]],
+    ) -> int:
+        # Carga en columnas: values[variable][t][p] es el valor de port_ids[p] en valid_times[t].
+        # Devuelve el número de filas enviadas.
+        raise NotImplementedError
@@ -0,0 +1,54 @@
+# app/forecasts/domain/models.py
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional
+
+# Variables horarias previstas; cada una es una columna de port_forecasts
+FORECAST_VARIABLES = (
+    "wave_height",
+    "wave_period",
+    "wave_direction",
+    "wind_speed",
+    "wind_direction",
+    "wind_gust",
+    "tide_height",
+)
+
+@dataclass
+class Forecast:
+    port_id: int
+    valid_time: datetime
+    # Emisión del modelo: una previsión más reciente sustituye a la anterior para la misma hora
+    issued_at: datetime
+    wave_height: Optional[float] = None
+    wave_period: Optional[float] = None
+    wave_direction: Optional[float] = None
+    wind_speed: Optional[float] = None
+    wind_direction: Optional[float] = None
+    wind_gust: Optional[float] = None
+    tide_height: Optional[float] = None
+
+@dataclass
+class ForecastSeries:
+    # Serie en columnas: values[variable][i] corresponde a valid_times[i]
+    port_id: int
+    valid_times: List[datetime]
+    values: Dict[str, List[Optional[float]]]
+
+# Periodos de los rollups precalculados
+ROLLUP_DAY = "day"
+ROLLUP_WEEK = "week"
+
+@dataclass
+class ForecastStats:
+    min: Optional[float]
+    max: Optional[float]
+    mean: Optional[float]
+
+@dataclass
+class ForecastSummaryBucket:
+    # Agregado de un día o semana (UTC); partial si el intervalo pedido solo cubre parte del periodo
+    bucket_start: datetime
+    hours: int
+    values: Dict[str, ForecastStats]
+    partial: bool = False
@@ -0,0 +1,50 @@
+from sqlalchemy import Column, DateTime, Float, ForeignKey, Index, Integer, Table
+from app.ports.infrastructure.base import Base
+from app.forecasts.domain.models import FORECAST_VARIABLES
+
+class ForecastORM(Base):
+    __tablename__ = "port_forecasts"
+
+    port_id = Column(Integer, ForeignKey("ports.id", ondelete="CASCADE"), primary_key=True)
+    valid_time = Column(DateTime(timezone=True), primary_key=True)
+    issued_at = Column(DateTime(timezone=True), nullable=False)
+    wave_height = Column(Float)
+    wave_period = Column(Float)
+    wave_direction = Column(Float)
+    wind_speed = Column(Float)
+    wind_direction = Column(Float)
+    wind_gust = Column(Float)
+    tide_height = Column(Float)
+
+    # Particiones semanales por valid_time (se crean al ingerir); BRIN porque las filas
+    # llegan casi ordenadas por tiempo y ocupa una fracción de un B-tree
+    __table_args__ = (
+        Index("ix_port_forecasts_valid_time_brin", "valid_time", postgresql_using="brin"),
+        {"postgresql_partition_by": "RANGE (valid_time)"},
+    )
+
+def variable_columns(variables):
+    return [getattr(ForecastORM, variable) for variable in variables]
+
+ROLLUP_STATS = ("min", "max", "mean")
+# Se guardan suma y número de valores no nulos en lugar de la media: así la semana se obtiene
+# exactamente de sus días y la media se calcula al leer
+ROLLUP_AGGREGATES = ("min", "max", "sum", "count")
+
+def rollup_table(name: str) -> Table:
+    # Una fila por puerto y periodo con min/max/suma/cuenta de cada variable; hours = filas horarias agregadas
+    return Table(
+        name,
+        Base.metadata,
+        Column("port_id", Integer, ForeignKey("ports.id", ondelete="CASCADE"), primary_key=True),
+        Column("bucket_start", DateTime(timezone=True), primary_key=True),
+        Column("hours", Integer, nullable=False),
+        *(
+            Column(f"{variable}_{aggregate}", Integer if aggregate == "count" else Float)
+            for variable in FORECAST_VARIABLES
+            for aggregate in ROLLUP_AGGREGATES
+        ),
+    )
+
+forecast_daily = rollup_table("port_forecast_daily")
+forecast_weekly = rollup_table("port_forecast_weekly")
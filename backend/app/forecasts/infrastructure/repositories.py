@@ -0,0 +1,352 @@
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, List, Mapping, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import func, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.forecasts.application.services import ForecastService
+from app.forecasts.domain.models import (
+    FORECAST_VARIABLES,
+    ROLLUP_DAY,
+    ROLLUP_WEEK,
+    Forecast,
+    ForecastSeries,
+    ForecastStats,
+    ForecastSummaryBucket,
+)
+from app.forecasts.infrastructure.models import (
+    ROLLUP_AGGREGATES,
+    ROLLUP_STATS,
+    ForecastORM,
+    forecast_daily,
+    forecast_weekly,
+    variable_columns,
+)
+from app.ports.infrastructure.models import PortORM
+
+PARTITION_DAYS = 7
+_EPOCH_MONDAY = datetime(1970, 1, 5, tzinfo=timezone.utc)
+
+_VARIABLE_LIST = ", ".join(FORECAST_VARIABLES)
+
+_CREATE_FORECAST_IMPORT_TABLE = text(
+    f"""
+    CREATE TEMP TABLE IF NOT EXISTS port_forecasts_import (
+        line_no integer,
+        port_id integer,
+        valid_time timestamptz,
+        issued_at timestamptz,
+        {", ".join(f"{variable} double precision" for variable in FORECAST_VARIABLES)}
+    ) ON COMMIT DELETE ROWS
+    """
+)
+
+_REJECTED_FORECAST_LINES = text(
+    """
+    SELECT i.line_no
+    FROM port_forecasts_import i
+    WHERE NOT EXISTS (SELECT 1 FROM ports p WHERE p.id = i.port_id)
+    """
+)
+
+# DISTINCT ON: ON CONFLICT no admite dos filas con la misma clave; gana la emisión más reciente.
+# Una previsión más antigua que la guardada no la sobrescribe.
+_UPSERT_FROM_FORECAST_IMPORT = text(
+    f"""
+    INSERT INTO port_forecasts (port_id, valid_time, issued_at, {_VARIABLE_LIST})
+    SELECT DISTINCT ON (i.port_id, i.valid_time) i.port_id, i.valid_time, i.issued_at,
+           {", ".join(f"i.{variable}" for variable in FORECAST_VARIABLES)}
+    FROM port_forecasts_import i
+    JOIN ports p ON p.id = i.port_id
+    ORDER BY i.port_id, i.valid_time, i.issued_at DESC, i.line_no DESC
+    ON CONFLICT (port_id, valid_time) DO UPDATE SET
+        issued_at = EXCLUDED.issued_at,
+        {", ".join(f"{variable} = EXCLUDED.{variable}" for variable in FORECAST_VARIABLES)}
+    WHERE EXCLUDED.issued_at >= port_forecasts.issued_at
+    """
+)
+
+_ROLLUP_COLUMNS = [f"{variable}_{aggregate}" for variable in FORECAST_VARIABLES for aggregate in ROLLUP_AGGREGATES]
+_ROLLUP_UPDATE = ",\n            ".join(f"{column} = EXCLUDED.{column}" for column in _ROLLUP_COLUMNS)
+
+# Días: desde las filas horarias, solo los (puerto, día) tocados por el lote (como mucho 24 filas cada uno)
+_REFRESH_DAILY_ROLLUP = text(
+    f"""
+    INSERT INTO port_forecast_daily (port_id, bucket_start, hours, {", ".join(_ROLLUP_COLUMNS)})
+    SELECT f.port_id, a.bucket_start, count(*),
+           {", ".join(f"min(f.{v}), max(f.{v}), sum(f.{v}), count(f.{v})" for v in FORECAST_VARIABLES)}
+    FROM (
+        SELECT DISTINCT port_id, date_trunc('day', valid_time, 'UTC') AS bucket_start
+        FROM port_forecasts_import
+    ) a
+    JOIN port_forecasts f
+      ON f.port_id = a.port_id
+     AND f.valid_time >= a.bucket_start
+     AND f.valid_time < a.bucket_start + interval '1 day'
+    GROUP BY f.port_id, a.bucket_start
+    ON CONFLICT (port_id, bucket_start) DO UPDATE SET
+        hours = EXCLUDED.hours,
+        {_ROLLUP_UPDATE}
+    """
+)
+
+# Semanas: se combinan los 7 días ya actualizados en lugar de releer hasta 168 filas horarias
+_REFRESH_WEEKLY_ROLLUP = text(
+    f"""
+    INSERT INTO port_forecast_weekly (port_id, bucket_start, hours, {", ".join(_ROLLUP_COLUMNS)})
+    SELECT d.port_id, a.bucket_start, sum(d.hours),
+           {", ".join(f"min(d.{v}_min), max(d.{v}_max), sum(d.{v}_sum), sum(d.{v}_count)" for v in FORECAST_VARIABLES)}
+    FROM (
+        SELECT DISTINCT port_id, date_trunc('week', valid_time, 'UTC') AS bucket_start
+        FROM port_forecasts_import
+    ) a
+    JOIN port_forecast_daily d
+      ON d.port_id = a.port_id
+     AND d.bucket_start >= a.bucket_start
+     AND d.bucket_start < a.bucket_start + interval '7 days'
+    GROUP BY d.port_id, a.bucket_start
+    ON CONFLICT (port_id, bucket_start) DO UPDATE SET
+        hours = EXCLUDED.hours,
+        {_ROLLUP_UPDATE}
+    """
+)
+
+# El orden importa: la semana se calcula a partir de los días recién actualizados
+_REFRESH_ROLLUPS = (_REFRESH_DAILY_ROLLUP, _REFRESH_WEEKLY_ROLLUP)
+
+ROLLUP_TABLES = {
+    ROLLUP_DAY: forecast_daily,
+    ROLLUP_WEEK: forecast_weekly,
+}
+
+# Particiones ya comprobadas por este worker: el DDL solo se lanza la primera vez.
+# Solo se añaden tras el commit que las crea
+_known_partitions: Set[str] = set()
+
+# CREATE TABLE IF NOT EXISTS ... PARTITION OF no es seguro entre sesiones concurrentes:
+# los workers que crean particiones se turnan con este lock, que se suelta en el commit
+_LOCK_PARTITIONS = text("SELECT pg_advisory_xact_lock(hashtext('port_forecasts_partitions'))")
+
+
+def partition_bounds(valid_time: datetime) -> Tuple[datetime, datetime]:
+    # Semanas de lunes a lunes en UTC
+    valid_time = valid_time.astimezone(timezone.utc)
+    weeks = (valid_time - _EPOCH_MONDAY) // timedelta(days=PARTITION_DAYS)
+    start = _EPOCH_MONDAY + weeks * timedelta(days=PARTITION_DAYS)
+    return start, start + timedelta(days=PARTITION_DAYS)
+
+
+def bucket_floor(value: datetime, period: str) -> datetime:
+    if period == ROLLUP_WEEK:
+        # date_trunc('week') también empieza en lunes, igual que las particiones
+        return partition_bounds(value)[0]
+    value = value.astimezone(timezone.utc)
+    return datetime(value.year, value.month, value.day, tzinfo=timezone.utc)
+
+
+def bucket_size(period: str) -> timedelta:
+    return timedelta(days=PARTITION_DAYS if period == ROLLUP_WEEK else 1)
+
+
+def partition_name(start: datetime) -> str:
+    return f"port_forecasts_p{start:%Y%m%d}"
+
+
+def _stats(row, variables: Sequence[str]):
+    return {
+        variable: ForecastStats(
+            min=row[f"{variable}_min"],
+            max=row[f"{variable}_max"],
+            mean=row[f"{variable}_mean"],
+        )
+        for variable in variables
+    }
+
+
+class ForecastRepository(ForecastService):
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get_forecast(
+        self, port_id: int, start: datetime, end: datetime, variables: Sequence[str]
+    ) -> Optional[ForecastSeries]:
+        # Solo las columnas pedidas; el rango sobre valid_time poda las particiones fuera del intervalo
+        stmt = (
+            select(ForecastORM.valid_time, *variable_columns(variables))
+            .where(
+                ForecastORM.port_id == port_id,
+                ForecastORM.valid_time >= start,
+                ForecastORM.valid_time < end,
+            )
+            .order_by(ForecastORM.valid_time)
+        )
+        result = await self.session.execute(stmt)
+        rows = result.all()
+        if not rows:
+            exists = await self.session.scalar(select(PortORM.id).where(PortORM.id == port_id))
+            if exists is None:
+                return None
+        return ForecastSeries(
+            port_id=port_id,
+            valid_times=[row[0] for row in rows],
+            values={variable: [row[i + 1] for row in rows] for i, variable in enumerate(variables)},
+        )
+
+    async def get_forecast_summary(
+        self, port_id: int, start: datetime, end: datetime, period: str, variables: Sequence[str]
+    ) -> Optional[List[ForecastSummaryBucket]]:
+        size = bucket_size(period)
+        start_floor = bucket_floor(start, period)
+        first_full = start_floor if start_floor == start else start_floor + size
+        last_full_end = max(bucket_floor(end, period), first_full)
+
+        buckets = []
+        # Solo los extremos que no cubren un periodo completo se agregan desde las filas horarias
+        if start < first_full:
+            buckets.extend(await self._summarize_raw(port_id, start, min(first_full, end), variables))
+        if first_full < last_full_end:
+            buckets.extend(await self._read_rollup(ROLLUP_TABLES[period], port_id, first_full, last_full_end, variables))
+        if last_full_end < end:
+            buckets.extend(await self._summarize_raw(port_id, last_full_end, end, variables))
+
+        if not buckets:
+            exists = await self.session.scalar(select(PortORM.id).where(PortORM.id == port_id))
+            if exists is None:
+                return None
+        return buckets
+
+    async def _read_rollup(
+        self, table, port_id: int, start: datetime, end: datetime, variables: Sequence[str]
+    ) -> List[ForecastSummaryBucket]:
+        stats = []
+        for variable in variables:
+            mean = table.c[f"{variable}_sum"] / func.nullif(table.c[f"{variable}_count"], 0)
+            stats += [
+                table.c[f"{variable}_min"],
+                table.c[f"{variable}_max"],
+                mean.label(f"{variable}_mean"),
+            ]
+        stmt = (
+            select(table.c.bucket_start, table.c.hours, *stats)
+            .where(table.c.port_id == port_id, table.c.bucket_start >= start, table.c.bucket_start < end)
+            .order_by(table.c.bucket_start)
+        )
+        result = await self.session.execute(stmt)
+        return [
+            ForecastSummaryBucket(
+                bucket_start=row.bucket_start,
+                hours=row.hours,
+                values=_stats(row._mapping, variables),
+            )
+            for row in result.all()
+        ]
+
+    async def _summarize_raw(
+        self, port_id: int, start: datetime, end: datetime, variables: Sequence[str]
+    ) -> List[ForecastSummaryBucket]:
+        aggregates = {"min": func.min, "max": func.max, "mean": func.avg}
+        stmt = select(
+            func.count().label("hours"),
+            *(
+                aggregates[stat](getattr(ForecastORM, variable)).label(f"{variable}_{stat}")
+                for variable in variables
+                for stat in ROLLUP_STATS
+            ),
+        ).where(
+            ForecastORM.port_id == port_id,
+            ForecastORM.valid_time >= start,
+            ForecastORM.valid_time < end,
+        )
+        row = (await self.session.execute(stmt)).one()
+        if not row.hours:
+            return []
+        return [
+            ForecastSummaryBucket(
+                bucket_start=start,
+                hours=row.hours,
+                values=_stats(row._mapping, variables),
+                partial=True,
+            )
+        ]
+
+    async def ingest_forecasts(self, rows: Sequence[Tuple[int, Forecast]]) -> List[int]:
+        if not rows:
+            return []
+        await self.ensure_partitions(forecast.valid_time for _, forecast in rows)
+        return await self._copy_and_upsert(
+            (
+                line_no,
+                forecast.port_id,
+                forecast.valid_time,
+                forecast.issued_at,
+                *(getattr(forecast, variable) for variable in FORECAST_VARIABLES),
+            )
+            for line_no, forecast in rows
+        )
+
+    async def ingest_forecast_grid(
+        self,
+        port_ids: Sequence[int],
+        valid_times: Sequence[datetime],
+        issued_at: datetime,
+        values: Mapping[str, Sequence[Sequence[Optional[float]]]],
+    ) -> int:
+        if not port_ids or not valid_times:
+            return 0
+        await self.ensure_partitions(valid_times)
+        # Las variables que no vienen en la rejilla quedan a NULL
+        missing = [None] * len(port_ids)
+        columns = [values.get(variable) for variable in FORECAST_VARIABLES]
+
+        def records():
+            line_no = 0
+            for t, valid_time in enumerate(valid_times):
+                series = [column[t] if column is not None else missing for column in columns]
+                for p, port_id in enumerate(port_ids):
+                    line_no += 1
+                    yield (line_no, port_id, valid_time, issued_at, *(values_t[p] for values_t in series))
+
+        await self._copy_and_upsert(records())
+        return len(port_ids) * len(valid_times)
+
+    async def _copy_and_upsert(self, records: Iterable[tuple]) -> List[int]:
+        # COPY a una tabla temporal y un único INSERT ... ON CONFLICT, todo en la misma transacción
+        await self.session.execute(_CREATE_FORECAST_IMPORT_TABLE)
+        connection = await self.session.connection()
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(
+            "port_forecasts_import",
+            records=records,
+            columns=["line_no", "port_id", "valid_time", "issued_at", *FORECAST_VARIABLES],
+        )
+        result = await self.session.execute(_REJECTED_FORECAST_LINES)
+        rejected = sorted(result.scalars().all())
+        await self.session.execute(_UPSERT_FROM_FORECAST_IMPORT)
+        # Los rollups se actualizan en la misma transacción que las filas horarias
+        for refresh in _REFRESH_ROLLUPS:
+            await self.session.execute(refresh)
+        await self.session.commit()
+        return rejected
+
+    async def ensure_partitions(self, valid_times) -> None:
+        missing = {}
+        for valid_time in valid_times:
+            start, end = partition_bounds(valid_time)
+            name = partition_name(start)
+            if name not in _known_partitions:
+                missing[name] = (start, end)
+        if not missing:
+            return
+        # Quien espera el lock ve después las tablas del otro y el IF NOT EXISTS las salta
+        await self.session.execute(_LOCK_PARTITIONS)
+        for name, (start, end) in sorted(missing.items()):
+            await self.session.execute(
+                text(
+                    f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF port_forecasts "
+                    f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+                )
+            )
+        # El DDL va en su propia transacción para no retener el bloqueo del padre durante el COPY
+        await self.session.commit()
+        _known_partitions.update(missing)
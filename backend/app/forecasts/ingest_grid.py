@@ -0,0 +1,65 @@
+# Uso:
+#   python -m app.forecasts.ingest_grid --lat0 -90 --lon0 0 --dlat 0.25 --dlon 0.25 --nlat 721 --nlon 1440 \
+#       --start 2026-10-18T00:00Z --issued-at 2026-10-17T18:00Z wave_height=hs.npy wind_speed=ws.f32
+import argparse
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+from app.forecasts.application.grid import GridSpec, PortCellIndexCache, open_grid
+from app.forecasts.application.grid_ingest import GridIngestion
+from app.forecasts.infrastructure.repositories import ForecastRepository
+from app.ports.infrastructure.infrastructure import PortRepository
+from app.shared.config import settings
+from app.shared.database import async_session_factory
+
+
+def parse_time(value: str) -> datetime:
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Ingest gridded forecast fields into port_forecasts")
+    for name in ("lat0", "lon0", "dlat", "dlon"):
+        parser.add_argument(f"--{name}", type=float, required=True)
+    parser.add_argument("--nlat", type=int, required=True)
+    parser.add_argument("--nlon", type=int, required=True)
+    parser.add_argument("--start", type=parse_time, required=True, help="valid time of the first step")
+    parser.add_argument("--step-hours", type=float, default=1.0)
+    parser.add_argument("--issued-at", type=parse_time, required=True)
+    parser.add_argument("--dtype", default="float32", help="dtype of raw (non .npy) files")
+    parser.add_argument("--time-chunk", type=int, default=24)
+    parser.add_argument(
+        "--index-dir",
+        default=settings.FORECAST_GRID_INDEX_DIR,
+        help="directory for the cached port-to-cell index; rebuilt only when ports move or are added",
+    )
+    parser.add_argument("fields", nargs="+", help="variable=path, (time, nlat, nlon) .npy or raw file")
+    return parser.parse_args(argv)
+
+
+async def main(argv=None) -> None:
+    args = parse_args(argv)
+    spec = GridSpec(args.lat0, args.lon0, args.dlat, args.dlon, args.nlat, args.nlon)
+    fields = {}
+    for item in args.fields:
+        variable, _, path = item.partition("=")
+        fields[variable] = open_grid(path, spec, dtype=args.dtype)
+    lengths = {variable: field.shape[0] for variable, field in fields.items()}
+    if len(set(lengths.values())) > 1:
+        detail = ", ".join(f"{variable}={steps}" for variable, steps in lengths.items())
+        raise ValueError(f"Fields have different numbers of steps: {detail}")
+    steps = next(iter(lengths.values()))
+    valid_times = [args.start + timedelta(hours=args.step_hours * i) for i in range(steps)]
+
+    async with async_session_factory() as session:
+        ports = await PortRepository(session).list_ports()
+        ingestion = GridIngestion(
+            ForecastRepository(session), PortCellIndexCache(directory=args.index_dir), args.time_chunk
+        )
+        result = await ingestion.run(ports, spec, fields, valid_times, args.issued_at)
+    print(f"{result.rows} rows ({result.ports} ports x {result.steps} steps), {len(result.outside_ids)} ports outside the grid")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
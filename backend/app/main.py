@@ -1,6 +1,35 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
+from app.forecasts.api.router import router as forecasts_router
+from app.ports.api.dependencies import port_change_listener
 from app.ports.api.router import router as ports_router
+from app.shared.config import settings
+from app.shared.database import replica_set
+from app.shared.replicas import ReadYourWritesMiddleware
+from app.shared.metrics import router as metrics_router
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if settings.PORT_CHANGES_LISTENER_ENABLED:
+        await port_change_listener.start()
+    await replica_set.start(
+        settings.DB_REPLICA_HEALTHCHECK_SECONDS,
+        settings.DB_REPLICA_MAX_LAG_SECONDS,
+        settings.DB_REPLICA_HEALTHCHECK_TIMEOUT_SECONDS,
+    )
+    try:
+        yield
+    finally:
+        await replica_set.stop()
+        await port_change_listener.stop()
+
 
-app = FastAPI(title="Ports Forecast API")
+app = FastAPI(title="Ports Forecast API", lifespan=lifespan, default_response_class=ORJSONResponse)
+app.add_middleware(ReadYourWritesMiddleware, max_age_seconds=settings.DB_REPLICA_READ_YOUR_WRITES_SECONDS)
 
-app.include_router(ports_router)  
\ No newline at end of file
+app.include_router(ports_router)
+app.include_router(forecasts_router)
+app.include_router(metrics_router)
@@ -0,0 +1,112 @@
+# app/ports/api/bulk.py
+
+import codecs
+import csv
+import json
+from typing import AsyncIterator, List, Optional, Tuple
+
+from pydantic import ValidationError
+
+from app.ports.api.schemas import PortBulkImportResult, PortCreate
+from app.ports.application.services import PortService
+from app.ports.domain.models import Port
+
+BULK_FORMATS = {
+    "text/csv": "csv",
+    "application/x-ndjson": "ndjson",
+    "application/jsonl": "ndjson",
+}
+
+CSV_COLUMNS = ("name", "country", "latitude", "longitude")
+
+
+def bulk_format(content_type: Optional[str]) -> Optional[str]:
+    if not content_type:
+        return None
+    return BULK_FORMATS.get(content_type.split(";")[0].strip().lower())
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[Tuple[int, str]]:
+    # Decodificador incremental: un carácter UTF-8 puede quedar partido entre dos chunks
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    pending = ""
+    line_no = 0
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            line_no += 1
+            yield line_no, line.rstrip("\r")
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield line_no + 1, pending.rstrip("\r")
+
+
+def _to_port(data) -> Port:
+    payload = PortCreate.model_validate(data)
+    return Port(
+        name=payload.name,
+        country=payload.country,
+        latitude=payload.latitude,
+        longitude=payload.longitude,
+    )
+
+
+async def iter_port_rows(
+    chunks: AsyncIterator[bytes], fmt: str
+) -> AsyncIterator[Tuple[int, Optional[Port]]]:
+    # Devuelve (línea, Port) o (línea, None) si la fila no es válida
+    header: Optional[List[str]] = None
+    async for line_no, line in iter_lines(chunks):
+        if not line.strip():
+            continue
+        try:
+            if fmt == "csv":
+                values = next(csv.reader([line]))
+                if header is None:
+                    header = [value.strip().lower() for value in values]
+                    if sorted(header) != sorted(CSV_COLUMNS):
+                        raise ValueError(f"CSV header must be {','.join(CSV_COLUMNS)}")
+                    continue
+                if len(values) != len(header):
+                    yield line_no, None
+                    continue
+                port = _to_port(dict(zip(header, values)))
+            else:
+                port = _to_port(json.loads(line))
+        except (ValidationError, json.JSONDecodeError, csv.Error, TypeError):
+            yield line_no, None
+            continue
+        yield line_no, port
+
+
+async def import_ports(
+    chunks: AsyncIterator[bytes], fmt: str, service: PortService, batch_size: int
+) -> PortBulkImportResult:
+    inserted = 0
+    rejected_lines: List[int] = []
+    batch: List[Tuple[int, Port]] = []
+
+    async def flush():
+        nonlocal inserted
+        rejected = await service.bulk_create_ports(batch)
+        inserted += len(batch) - len(rejected)
+        rejected_lines.extend(rejected)
+        batch.clear()
+
+    async for line_no, port in iter_port_rows(chunks, fmt):
+        if port is None:
+            rejected_lines.append(line_no)
+            continue
+        batch.append((line_no, port))
+        if len(batch) >= batch_size:
+            await flush()
+    if batch:
+        await flush()
+
+    rejected_lines.sort()
+    return PortBulkImportResult(
+        inserted=inserted,
+        rejected=len(rejected_lines),
+        rejected_lines=rejected_lines,
+    )
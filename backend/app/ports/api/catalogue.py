@@ -0,0 +1,104 @@
+# app/ports/api/catalogue.py
+
+import gzip
+import hashlib
+import time
+from dataclasses import dataclass
+from typing import Callable, List, Optional
+
+from app.ports.api.serialization import ports_to_json
+from app.ports.application.cache import PortCache
+from app.ports.domain.models import Port
+
+
+def body_etag(body: bytes) -> str:
+    # ETag fuerte derivado del contenido: igual en todos los workers para el mismo catálogo
+    return '"%s"' % hashlib.blake2b(body, digest_size=16).hexdigest()
+
+
+GZIP_ETAG_SUFFIX = "-gz"
+
+
+def gzip_etag(etag: str) -> str:
+    # Cada content-coding es una representación distinta y lleva su propio ETag fuerte (RFC 9110 8.8.3)
+    return etag[:-1] + GZIP_ETAG_SUFFIX + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip().removeprefix("W/")
+        # If-None-Match usa comparación débil (RFC 9110 13.1.2): vale el ETag de cualquier codificación
+        if candidate.endswith(GZIP_ETAG_SUFFIX + '"'):
+            candidate = candidate[: -len(GZIP_ETAG_SUFFIX) - 1] + '"'
+        if candidate == "*" or candidate == etag:
+            return True
+    return False
+
+
+def accepts_gzip(accept_encoding: Optional[str]) -> bool:
+    for coding in (accept_encoding or "").split(","):
+        name, _, params = coding.partition(";")
+        if name.strip().lower() not in ("gzip", "*"):
+            continue
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                return float(params[2:]) > 0
+            except ValueError:
+                return False
+        return True
+    return False
+
+
+@dataclass(frozen=True)
+class PortCatalogueSnapshot:
+    version: int
+    expires_at: float
+    etag: str
+    body: bytes
+    gzip_body: bytes
+
+
+class PortCatalogue:
+    # Cuerpo del listado completo ya serializado y comprimido.
+    # La versión del catálogo es la generación de PortCache, que cambia con cada
+    # escritura de este worker y con cada NOTIFY de los demás.
+    def __init__(
+        self,
+        cache: PortCache,
+        compress_level: int = 6,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.cache = cache
+        self.compress_level = compress_level
+        self._clock = clock
+        self._snapshot: Optional[PortCatalogueSnapshot] = None
+        self.rebuilds = 0
+
+    @property
+    def version(self) -> int:
+        return self.cache.generation
+
+    def current(self) -> Optional[PortCatalogueSnapshot]:
+        snapshot = self._snapshot
+        if snapshot is None or snapshot.version != self.version or snapshot.expires_at <= self._clock():
+            return None
+        return snapshot
+
+    def build(self, ports: List[Port], version: int) -> PortCatalogueSnapshot:
+        body = ports_to_json(ports)
+        snapshot = PortCatalogueSnapshot(
+            version=version,
+            expires_at=self._clock() + self.cache.ttl_seconds,
+            etag=body_etag(body),
+            body=body,
+            gzip_body=gzip.compress(body, compresslevel=self.compress_level, mtime=0),
+        )
+        self.rebuilds += 1
+        # Si hubo una escritura durante la lectura, el snapshot sirve a esta petición pero no se guarda.
+        # Tampoco por encima de max_list_size, el mismo límite que PortCache aplica al listado
+        if version == self.version and len(ports) <= self.cache.max_list_size:
+            self._snapshot = snapshot
+        return snapshot
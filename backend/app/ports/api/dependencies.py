@@ -0,0 +1,107 @@
+import asyncio
+
+from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.shared.config import settings
+from app.shared.database import replica_set
+from app.shared.dependencies import get_routing_db_session
+from app.ports.api.catalogue import PortCatalogue
+from app.ports.application.cache import CachingPortService, PortCache
+from app.ports.application.coalescing import CoalescingPortService
+from app.ports.application.distances import PortCoordinateIndex
+from app.ports.application.search import PortPrefixIndex
+from app.ports.application.services import PortService
+from app.ports.application.tiles import PortTileCache
+from app.ports.domain.models import Port, PortChange
+from app.ports.infrastructure.infrastructure import PortRepository
+from app.ports.infrastructure.notifications import PortChangeBroadcaster, PortChangeListener
+from app.shared.singleflight import SingleFlight
+
+# Una sola caché por worker, compartida entre peticiones
+port_cache = PortCache(
+    max_entries=settings.PORT_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.PORT_CACHE_TTL_SECONDS,
+    max_list_size=settings.PORT_CACHE_MAX_LIST_SIZE,
+)
+
+port_catalogue = PortCatalogue(port_cache)
+port_coordinates = PortCoordinateIndex(port_cache)
+port_tiles = PortTileCache(
+    max_entries=settings.PORT_TILE_CACHE_MAX_ENTRIES,
+    max_bytes=settings.PORT_TILE_CACHE_MAX_BYTES,
+    ttl_seconds=settings.PORT_TILE_CACHE_TTL_SECONDS,
+)
+port_prefixes = (
+    PortPrefixIndex(ttl_seconds=settings.PORT_SEARCH_PREFIX_INDEX_TTL_SECONDS)
+    if settings.PORT_SEARCH_PREFIX_INDEX_ENABLED
+    else None
+)
+
+# Lecturas en vuelo del worker; solo llegan aquí los fallos de la caché
+port_reads = SingleFlight()
+
+
+def get_port_service(
+    db: AsyncSession = Depends(get_routing_db_session),
+) -> PortService:
+    service: PortService = PortRepository(db)
+    if settings.PORT_READ_COALESCING_ENABLED:
+        service = CoalescingPortService(service, port_reads, lambda: port_cache.generation)
+    return CachingPortService(service, port_cache, port_tiles, port_prefixes)
+
+
+def handle_port_change(change: PortChange) -> None:
+    if change.id is None:
+        # Sentencia masiva (COPY, upsert por lotes): un único vaciado en lugar de fila a fila
+        clear_port_caches()
+        port_changes.publish(change)
+        return
+    invalidate_port(change)
+    after_replica_lag(invalidate_port, change)
+    if port_prefixes is not None:
+        if change.op == "DELETE" or change.name is None:
+            port_prefixes.remove(change.id)
+        else:
+            port = Port(
+                name=change.name,
+                country=change.country,
+                latitude=change.latitude,
+                longitude=change.longitude,
+            )
+            port.id = change.id
+            port_prefixes.add(port)
+    port_changes.publish(change)
+
+
+def clear_port_caches() -> None:
+    reset_port_caches()
+    after_replica_lag(reset_port_caches)
+
+
+def invalidate_port(change: PortChange) -> None:
+    port_cache.invalidate(change.id)
+    port_tiles.invalidate_port(change.id, change.latitude, change.longitude)
+
+
+def reset_port_caches() -> None:
+    port_cache.clear()
+    port_tiles.clear()
+    if port_prefixes is not None:
+        port_prefixes.reset()
+
+
+def after_replica_lag(invalidate, *args) -> None:
+    # Una réplica retrasada puede volver a llenar la caché con la fila anterior al cambio;
+    # se repite la invalidación cuando ya lo han aplicado, sin llevar las lecturas al primario
+    if replica_set.engines:
+        asyncio.get_running_loop().call_later(settings.DB_REPLICA_READ_YOUR_WRITES_SECONDS, invalidate, *args)
+
+
+# Cambios hechos por cualquier worker llegan vía LISTEN/NOTIFY
+port_changes = PortChangeBroadcaster()
+port_change_listener = PortChangeListener(
+    settings.asyncpg_dsn,
+    on_change=handle_port_change,
+    on_reconnect=clear_port_caches,
+)
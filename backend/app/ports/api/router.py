@@ -1,27 +1,164 @@
 # app/ports/api/router.py
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from typing import List
+import asyncio
+from typing import AsyncIterator, Dict, List, Optional, Tuple, Union
 
-from sqlalchemy.ext.asyncio import AsyncSession
-from app.shared.dependencies import get_db_session
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
 
+from app.shared.database import routing_session_factory
+
+from app.ports.api.catalogue import accepts_gzip, body_etag, etag_matches, gzip_etag
+from app.ports.api.dependencies import (
+    get_port_service,
+    port_cache,
+    port_catalogue,
+    port_changes,
+    port_coordinates,
+    port_reads,
+    port_tiles,
+)
+from app.ports.application.services import PortService
 from app.ports.infrastructure.infrastructure import PortRepository
-from app.ports.api.schemas import PortCreate, PortRead, PortUpdate
-from app.ports.domain.models import Port
+from app.ports.api.schemas import (
+    PortBatchItem,
+    PortBatchRead,
+    PortBatchRequest,
+    PortBulkImportResult,
+    PortChangesSinceRead,
+    PortClusterRead,
+    PortCreate,
+    PortDistanceMatrixRead,
+    PortDistanceMatrixRequest,
+    PortDistanceRead,
+    PortPageRead,
+    PortRead,
+    PortSearchRead,
+    PortUpdate,
+    PortUpsert,
+    PortUpsertResult,
+    PortVersionChangeRead,
+    PortViewportRead,
+)
+from app.ports.api.bulk import bulk_format, import_ports
+from app.ports.api.serialization import (
+    iter_distance_matrix_json,
+    port_to_json,
+    port_to_ndjson_line,
+    ports_page_to_json,
+)
+from app.ports.application.distances import PortCoordinates, distance_matrix_blocks
+from app.ports.domain.models import Port, UPSERT_CREATED
 
 router = APIRouter(prefix="/ports", tags=["ports"])
 
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+DEFAULT_PAGE_SIZE = 100
+MAX_UPSERT_BATCH = 10000
+MAX_BATCH_GET_IDS = 500
+SSE_KEEPALIVE_SECONDS = 15.0
+# A partir de este zoom /bbox devuelve puertos sueltos en lugar de clusters
+CLUSTER_MAX_ZOOM = 12
+CLUSTER_CELL_PIXELS = 64
+CLUSTER_SAMPLE_SIZE = 5
+MAX_VIEWPORT_PORTS = 2000
+MAX_VIEWPORT_CLUSTERS = 1000
+MAX_SEARCH_RESULTS = 50
+MIN_SEARCH_QUERY_LENGTH = 1
+DEFAULT_CHANGES_PAGE_SIZE = 1000
+MAX_CHANGES_PAGE_SIZE = 10000
+# Por encima de este número de celdas la matriz se envía por bloques
+DISTANCE_MATRIX_STREAM_CELLS = 250_000
+DISTANCE_MATRIX_BLOCK_ROWS = 256
+MVT_MEDIA_TYPE = "application/vnd.mapbox-vector-tile"
+MAX_TILE_ZOOM = 22
+
+
+def to_distance_read(results: List[Tuple[Port, float]]) -> List[PortDistanceRead]:
+    return [
+        PortDistanceRead(
+            id=port.id,
+            name=port.name,
+            country=port.country,
+            latitude=port.latitude,
+            longitude=port.longitude,
+            distance_km=distance_km,
+        )
+        for port, distance_km in results
+    ]
+
+def to_batch_read(port_ids: List[int], ports: List[Optional[Port]]) -> PortBatchRead:
+    return PortBatchRead(
+        items=[
+            PortBatchItem(
+                id=port_id,
+                port=PortRead.model_validate(port, from_attributes=True) if port else None,
+            )
+            for port_id, port in zip(port_ids, ports)
+        ],
+        missing=[port_id for port_id, port in zip(port_ids, ports) if port is None],
+    )
+
+def cluster_grid_size(zoom: int) -> float:
+    # Celdas de CLUSTER_CELL_PIXELS px en un mapa web de teselas de 256 px, en grados
+    return 360.0 / (256 * 2 ** zoom) * CLUSTER_CELL_PIXELS
+
+async def catalogue_response(request: Request, service: PortService) -> Response:
+    snapshot = port_catalogue.current()
+    if snapshot is None:
+        version = port_catalogue.version
+        snapshot = port_catalogue.build(await service.list_ports(), version)
+    # Con snapshot vigente, el 304 y el 200 salen de memoria sin tocar la base
+    use_gzip = accepts_gzip(request.headers.get("accept-encoding"))
+    headers = {
+        "ETag": gzip_etag(snapshot.etag) if use_gzip else snapshot.etag,
+        "Vary": "Accept-Encoding",
+    }
+    if etag_matches(request.headers.get("if-none-match"), snapshot.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    if use_gzip:
+        headers["Content-Encoding"] = "gzip"
+        return Response(snapshot.gzip_body, media_type="application/json", headers=headers)
+    return Response(snapshot.body, media_type="application/json", headers=headers)
 
-def get_port_service(
-    db: AsyncSession = Depends(get_db_session),
-) -> PortRepository:
-    return PortRepository(db)
+async def current_coordinates(service: PortService) -> PortCoordinates:
+    coordinates = port_coordinates.current()
+    if coordinates is None:
+        version = port_coordinates.version
+        coordinates = port_coordinates.build(await service.list_ports(), version)
+    return coordinates
+
+async def compute_blocks(blocks) -> AsyncIterator:
+    # NumPy libera el GIL: cada bloque se calcula en un hilo sin bloquear el event loop
+    for compute in blocks:
+        yield await asyncio.to_thread(compute)
+
+async def stream_ports_ndjson(after_id: Optional[int], limit: Optional[int]) -> AsyncIterator[bytes]:
+    # FastAPI cierra las dependencias antes de enviar un StreamingResponse,
+    # así que el stream abre su propia sesión
+    async with routing_session_factory() as session:
+        async for port in PortRepository(session).stream_ports(after_id, limit):
+            yield port_to_ndjson_line(port)
+
+async def stream_port_changes() -> AsyncIterator[bytes]:
+    queue = port_changes.subscribe()
+    try:
+        while True:
+            try:
+                change = await asyncio.wait_for(queue.get(), timeout=SSE_KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                # Comentario SSE para que proxies y clientes no den la conexión por muerta
+                yield b": keep-alive\n\n"
+                continue
+            yield b"event: %s\ndata: %s\n\n" % (change.op.lower().encode("ascii"), orjson.dumps(change))
+    finally:
+        port_changes.unsubscribe(queue)
 
 @router.post("/", response_model=PortRead, status_code=status.HTTP_201_CREATED)
 async def create_port(
     payload: PortCreate,
-    service: PortRepository = Depends(get_port_service),
+    service: PortService = Depends(get_port_service),
 ):
     try:
         return await service.create_port(
@@ -31,27 +168,303 @@ async def create_port(
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 
+@router.post("/bulk", response_model=PortBulkImportResult)
+async def bulk_import_ports(
+    request: Request,
+    batch_size: int = Query(5000, ge=1, le=50000),
+    service: PortService = Depends(get_port_service),
+):
+    fmt = bulk_format(request.headers.get("content-type"))
+    if fmt is None:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Use text/csv or application/x-ndjson",
+        )
+    try:
+        return await import_ports(request.stream(), fmt, service, batch_size)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.post("/upsert", response_model=List[PortUpsertResult])
+async def upsert_ports(
+    payload: List[PortCreate],
+    service: PortService = Depends(get_port_service),
+):
+    if len(payload) > MAX_UPSERT_BATCH:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {MAX_UPSERT_BATCH} ports per batch",
+        )
+    ports = [Port(name=p.name, country=p.country, latitude=p.latitude, longitude=p.longitude) for p in payload]
+    results = await service.upsert_ports(ports)
+    return [
+        PortUpsertResult(status=result_status, port=PortRead.model_validate(port, from_attributes=True))
+        for port, result_status in results
+    ]
+
+@router.put("/by-name/{name}", response_model=PortUpsertResult)
+async def upsert_port_by_name(
+    name: str,
+    payload: PortUpsert,
+    response: Response,
+    service: PortService = Depends(get_port_service),
+):
+    port = Port(name=name, country=payload.country, latitude=payload.latitude, longitude=payload.longitude)
+    [(saved, result_status)] = await service.upsert_ports([port])
+    if result_status == UPSERT_CREATED:
+        response.status_code = status.HTTP_201_CREATED
+    return PortUpsertResult(status=result_status, port=PortRead.model_validate(saved, from_attributes=True))
+
+
+# Las rutas fijas van antes de /{port_id} para que no las capture
+@router.get("/changes")
+async def port_changes_stream():
+    return StreamingResponse(
+        stream_port_changes(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@router.get("/changes-since", response_model=PortChangesSinceRead)
+async def read_port_changes_since(
+    version: int = Query(0, ge=0),
+    after_id: int = Query(0, ge=0),
+    limit: int = Query(DEFAULT_CHANGES_PAGE_SIZE, ge=1, le=MAX_CHANGES_PAGE_SIZE),
+    service: PortService = Depends(get_port_service),
+):
+    # version=0 devuelve el catálogo completo; después, solo lo cambiado desde el cursor recibido
+    changes, watermark = await service.list_port_changes(version, after_id, limit + 1)
+    has_more = len(changes) > limit
+    changes = changes[:limit]
+    if has_more:
+        # Una transacción puede tener más cambios que la página: se sigue por id dentro de ella
+        cursor = (changes[-1].version, changes[-1].id)
+    else:
+        # Sin más cambios el cursor salta al watermark; nunca retrocede
+        cursor = max((version, after_id), (watermark, 0))
+    return PortChangesSinceRead(
+        version=cursor[0],
+        after_id=cursor[1],
+        has_more=has_more,
+        changes=[PortVersionChangeRead.model_validate(change, from_attributes=True) for change in changes],
+    )
+
+@router.get("/cache/stats", response_model=Dict[str, int])
+async def port_cache_stats():
+    stats = port_cache.snapshot_stats()
+    stats["catalogue_version"] = port_catalogue.version
+    stats["catalogue_rebuilds"] = port_catalogue.rebuilds
+    for key, value in port_tiles.snapshot_stats().items():
+        stats[f"tile_{key}"] = value
+    # Lecturas que esperaron la consulta de otra petición en lugar de lanzar la suya
+    stats["read_executions"] = port_reads.executions
+    stats["read_coalesced"] = port_reads.coalesced
+    stats["read_in_flight"] = port_reads.in_flight
+    return stats
+
+@router.get("/batch", response_model=PortBatchRead)
+async def read_ports_batch(
+    ids: str = Query(..., description="Comma-separated port ids"),
+    service: PortService = Depends(get_port_service),
+):
+    try:
+        port_ids = [int(value) for value in ids.split(",") if value.strip()]
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="ids must be integers")
+    if len(port_ids) > MAX_BATCH_GET_IDS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {MAX_BATCH_GET_IDS} ids per GET; use POST /ports/batch",
+        )
+    return to_batch_read(port_ids, await service.get_ports_by_ids(port_ids))
+
+@router.post("/batch", response_model=PortBatchRead)
+async def read_ports_batch_post(
+    payload: PortBatchRequest,
+    service: PortService = Depends(get_port_service),
+):
+    return to_batch_read(payload.ids, await service.get_ports_by_ids(payload.ids))
+
+@router.post("/distance-matrix", response_model=PortDistanceMatrixRead)
+async def distance_matrix(
+    payload: PortDistanceMatrixRequest,
+    service: PortService = Depends(get_port_service),
+):
+    coordinates = await current_coordinates(service)
+    origin_positions, missing_origins = coordinates.positions(payload.origin_ids)
+    destination_positions, missing_destinations = coordinates.positions(payload.destination_ids)
+    missing = list(dict.fromkeys(missing_origins + missing_destinations))
+    if missing:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail={"missing": missing})
+
+    header = {
+        "method": payload.method,
+        "unit": "km",
+        "origin_ids": payload.origin_ids,
+        "destination_ids": payload.destination_ids,
+    }
+    cells = len(payload.origin_ids) * len(payload.destination_ids)
+    block_rows = DISTANCE_MATRIX_BLOCK_ROWS if cells > DISTANCE_MATRIX_STREAM_CELLS else len(payload.origin_ids)
+    body = iter_distance_matrix_json(
+        header,
+        compute_blocks(
+            distance_matrix_blocks(coordinates, origin_positions, destination_positions, payload.method, block_rows)
+        ),
+    )
+    if cells > DISTANCE_MATRIX_STREAM_CELLS:
+        return StreamingResponse(body, media_type="application/json")
+    return Response(b"".join([chunk async for chunk in body]), media_type="application/json")
+
+@router.get("/nearest", response_model=List[PortDistanceRead])
+async def nearest_ports(
+    lat: float = Query(..., ge=-90, le=90),
+    lon: float = Query(..., ge=-180, le=180),
+    k: int = Query(10, ge=1, le=100),
+    service: PortService = Depends(get_port_service),
+):
+    return to_distance_read(await service.find_nearest_ports(lat, lon, k))
+
+@router.get("/within", response_model=List[PortDistanceRead])
+async def ports_within(
+    lat: float = Query(..., ge=-90, le=90),
+    lon: float = Query(..., ge=-180, le=180),
+    radius_km: float = Query(..., gt=0, le=20000),
+    limit: int = Query(100, ge=1, le=1000),
+    service: PortService = Depends(get_port_service),
+):
+    return to_distance_read(await service.find_ports_within(lat, lon, radius_km, limit))
+
+@router.get("/search", response_model=List[PortSearchRead])
+async def search_ports(
+    q: str = Query(..., max_length=100),
+    limit: int = Query(10, ge=1, le=MAX_SEARCH_RESULTS),
+    service: PortService = Depends(get_port_service),
+):
+    # La longitud mínima se mide sin espacios: un q en blanco llegaría como ILIKE '%' y traería la tabla entera
+    query = q.strip()
+    if len(query) < MIN_SEARCH_QUERY_LENGTH:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"q must have at least {MIN_SEARCH_QUERY_LENGTH} non-blank characters",
+        )
+    return [
+        PortSearchRead(
+            id=port.id,
+            name=port.name,
+            country=port.country,
+            latitude=port.latitude,
+            longitude=port.longitude,
+            score=score,
+        )
+        for port, score in await service.search_ports(query, limit)
+    ]
+
+@router.get("/bbox", response_model=PortViewportRead)
+async def ports_in_bbox(
+    min_lat: float = Query(..., ge=-90, le=90),
+    min_lon: float = Query(..., ge=-180, le=180),
+    max_lat: float = Query(..., ge=-90, le=90),
+    max_lon: float = Query(..., ge=-180, le=180),
+    zoom: int = Query(..., ge=0, le=22),
+    service: PortService = Depends(get_port_service),
+):
+    if min_lat > max_lat:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="min_lat must not exceed max_lat")
+    # Pedimos una fila de más para saber si la respuesta está recortada
+    if zoom >= CLUSTER_MAX_ZOOM:
+        ports = await service.find_ports_in_bbox(min_lat, min_lon, max_lat, max_lon, MAX_VIEWPORT_PORTS + 1)
+        return PortViewportRead(
+            zoom=zoom,
+            clustered=False,
+            ports=[PortRead.model_validate(port) for port in ports[:MAX_VIEWPORT_PORTS]],
+            truncated=len(ports) > MAX_VIEWPORT_PORTS,
+        )
+    clusters = await service.cluster_ports_in_bbox(
+        min_lat,
+        min_lon,
+        max_lat,
+        max_lon,
+        cluster_grid_size(zoom),
+        CLUSTER_SAMPLE_SIZE,
+        MAX_VIEWPORT_CLUSTERS + 1,
+    )
+    return PortViewportRead(
+        zoom=zoom,
+        clustered=True,
+        clusters=[PortClusterRead.model_validate(cluster) for cluster in clusters[:MAX_VIEWPORT_CLUSTERS]],
+        truncated=len(clusters) > MAX_VIEWPORT_CLUSTERS,
+    )
+
+@router.get("/tiles/{z}/{x}/{y}.mvt", response_class=Response)
+async def port_tile(
+    z: int,
+    x: int,
+    y: int,
+    request: Request,
+    service: PortService = Depends(get_port_service),
+):
+    if not 0 <= z <= MAX_TILE_ZOOM or not (0 <= x < 2 ** z and 0 <= y < 2 ** z):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Tile out of range")
+    tile = await service.get_port_tile(z, x, y)
+    etag = body_etag(tile.data)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    return Response(tile.data, media_type=MVT_MEDIA_TYPE, headers={"ETag": etag})
+
 @router.get("/{port_id}", response_model=PortRead)
 async def read_port(
     port_id: int,
-    service: PortRepository = Depends(get_port_service),
+    request: Request,
+    service: PortService = Depends(get_port_service),
 ):
+    if_none_match = request.headers.get("if-none-match")
+    # Revalidación sin tocar el puerto: el ETag guardado se invalida con él
+    etag = port_cache.get_etag(port_id) if if_none_match else None
+    if etag is not None and etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    generation = port_cache.generation
     port = await service.get_port_by_id(port_id)
     if not port:
         raise HTTPException(status_code=404, detail="Port not found")
-    return port
+    body = port_to_json(port)
+    etag = body_etag(body)
+    port_cache.put_etag(port_id, etag, generation)
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    return Response(body, media_type="application/json", headers={"ETag": etag})
 
-@router.get("/", response_model=List[PortRead])
+@router.get("/", response_model=Union[List[PortRead], PortPageRead])
 async def list_ports(
-    service: PortRepository = Depends(get_port_service),
+    request: Request,
+    after_id: Optional[int] = Query(None, ge=0),
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    service: PortService = Depends(get_port_service),
 ):
-    return await service.list_ports()
+    if NDJSON_MEDIA_TYPE in request.headers.get("accept", ""):
+        # Sin limit se emite desde el cursor hasta el final; con limit, como mucho esas filas
+        return StreamingResponse(stream_ports_ndjson(after_id, limit), media_type=NDJSON_MEDIA_TYPE)
+    if after_id is None and limit is None:
+        return await catalogue_response(request, service)
+
+    page_size = limit or DEFAULT_PAGE_SIZE
+    # Pedimos una fila de más para saber si hay página siguiente
+    ports = await service.list_ports_page(after_id, page_size + 1)
+    headers = {}
+    next_cursor = None
+    if len(ports) > page_size:
+        ports = ports[:page_size]
+        next_cursor = ports[-1].id
+        headers["X-Next-Cursor"] = str(next_cursor)
+        headers["Link"] = f'</ports/?after_id={next_cursor}&limit={page_size}>; rel="next"'
+    # El cursor va también en el cuerpo para clientes que no leen cabeceras
+    return Response(ports_page_to_json(ports, next_cursor), media_type="application/json", headers=headers)
 
 @router.put("/{port_id}", response_model=PortRead)
 async def update_port(
     port_id: int,
     payload: PortUpdate,
-    service: PortRepository = Depends(get_port_service),
+    service: PortService = Depends(get_port_service),
 ):
     port = await service.update_port(
         port_id,
@@ -67,7 +480,7 @@ async def update_port(
 @router.delete("/{port_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_port(
     port_id: int,
-    service: PortRepository = Depends(get_port_service),
+    service: PortService = Depends(get_port_service),
 ):
     success = await service.delete_port(port_id)
     if not success:
@@ -1,20 +1,101 @@
-from typing import Optional
-from pydantic import BaseModel
+from typing import List, Literal, Optional
+from pydantic import BaseModel, ConfigDict, Field
 
+# Mismos límites que la columna geog generada: fuera de rango la base falla con un 500
 class PortCreate(BaseModel):
     name: str
     country: str
+    latitude: float = Field(ge=-90, le=90)
+    longitude: float = Field(ge=-180, le=180)
+
+class PortRead(PortCreate):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+
+class PortPageRead(BaseModel):
+    # Página de GET /ports/?after_id=&limit=; next_cursor es None en la última
+    items: List[PortRead]
+    next_cursor: Optional[int] = None
+
+class PortDistanceRead(PortRead):
+    distance_km: float
+
+class PortSearchRead(PortRead):
+    # 1.0 para coincidencias por prefijo; similitud de trigramas en otro caso
+    score: float
+
+class PortClusterRead(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    count: int
     latitude: float
     longitude: float
+    sample_ids: List[int]
 
-class PortRead(PortCreate):
+class PortViewportRead(BaseModel):
+    zoom: int
+    clustered: bool
+    ports: List[PortRead] = []
+    clusters: List[PortClusterRead] = []
+    # Hay más resultados de los devueltos: el cliente debe acercar el zoom
+    truncated: bool = False
+
+class PortUpsert(BaseModel):
+    country: str
+    latitude: float = Field(ge=-90, le=90)
+    longitude: float = Field(ge=-180, le=180)
+
+class PortUpsertResult(BaseModel):
+    status: str
+    port: PortRead
+
+class PortBatchRequest(BaseModel):
+    ids: List[int] = Field(..., max_length=5000)
+
+class PortDistanceMatrixRequest(BaseModel):
+    origin_ids: List[int] = Field(..., min_length=1, max_length=5000)
+    destination_ids: List[int] = Field(..., min_length=1, max_length=5000)
+    method: Literal["haversine", "vincenty"] = "haversine"
+
+class PortDistanceMatrixRead(BaseModel):
+    method: str
+    unit: str
+    origin_ids: List[int]
+    destination_ids: List[int]
+    # distances[i][j]: km de origin_ids[i] a destination_ids[j]
+    distances: List[List[float]]
+
+class PortBatchItem(BaseModel):
     id: int
+    port: Optional[PortRead] = None
 
-    class Config:
-        orm_mode = True
+class PortBatchRead(BaseModel):
+    items: List[PortBatchItem]
+    missing: List[int]
+
+class PortVersionChangeRead(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    op: Literal["upsert", "delete"]
+    id: int
+    version: int
+    port: Optional[PortRead] = None
+
+class PortChangesSinceRead(BaseModel):
+    # Cursor (version, after_id) a enviar en la siguiente llamada; has_more indica que quedan cambios
+    version: int
+    after_id: int
+    has_more: bool
+    changes: List[PortVersionChangeRead]
 
 class PortUpdate(BaseModel):
     name: Optional[str] = None
     country: Optional[str] = None
-    latitude: Optional[float] = None
-    longitude: Optional[float] = None
\ No newline at end of file
+    latitude: Optional[float] = Field(None, ge=-90, le=90)
+    longitude: Optional[float] = Field(None, ge=-180, le=180)
+
+class PortBulkImportResult(BaseModel):
+    inserted: int
+    rejected: int
+    rejected_lines: List[int]
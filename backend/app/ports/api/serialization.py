@@ -0,0 +1,39 @@
+from typing import AsyncIterator, Dict, Optional, Sequence
+
+import numpy as np
+import orjson
+
+from app.ports.domain.models import Port
+
+# orjson serializa los dataclass Port directamente (en C), sin pasar por PortRead:
+# mismo JSON que PortRead (name, country, latitude, longitude, id)
+
+
+def ports_to_json(ports: Sequence[Port]) -> bytes:
+    return orjson.dumps(ports)
+
+
+def ports_page_to_json(ports: Sequence[Port], next_cursor: Optional[int]) -> bytes:
+    # Mismo documento que PortPageRead
+    return orjson.dumps({"items": ports, "next_cursor": next_cursor})
+
+
+def port_to_json(port: Port) -> bytes:
+    return orjson.dumps(port)
+
+
+def port_to_ndjson_line(port: Port) -> bytes:
+    return orjson.dumps(port, option=orjson.OPT_APPEND_NEWLINE)
+
+
+async def iter_distance_matrix_json(header: Dict, blocks: AsyncIterator[np.ndarray]) -> AsyncIterator[bytes]:
+    # Mismo documento que PortDistanceMatrixRead, emitido por bloques de filas
+    yield orjson.dumps(header)[:-1] + b',"distances":['
+    first = True
+    async for block in blocks:
+        rows = orjson.dumps(block, option=orjson.OPT_SERIALIZE_NUMPY)[1:-1]
+        if not rows:
+            continue
+        yield rows if first else b"," + rows
+        first = False
+    yield b"]}"
@@ -0,0 +1,303 @@
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import AsyncIterator, Callable, Dict, List, Optional, Sequence, Tuple
+
+from app.ports.application.search import PortPrefixIndex
+from app.ports.application.services import PortService
+from app.ports.application.tiles import PortTileCache
+from app.ports.domain.models import Port, PortCluster, PortTile, PortVersionChange, UPSERT_UNCHANGED
+
+
+@dataclass
+class PortCacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    list_hits: int = 0
+    list_misses: int = 0
+    invalidations: int = 0
+    etag_hits: int = 0
+
+
+class PortCache:
+    # Caché en proceso compartida por todas las peticiones del worker.
+    # Los Port devueltos son compartidos: tratarlos como solo lectura.
+    def __init__(
+        self,
+        max_entries: int,
+        ttl_seconds: float,
+        max_list_size: int,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.max_list_size = max_list_size
+        self._clock = clock
+        self._entries: "OrderedDict[int, Tuple[float, Port]]" = OrderedDict()
+        self._list: Optional[Tuple[float, List[Port]]] = None
+        # ETag de cada puerto ya serializado: un 304 se resuelve sin buscar ni serializar el puerto
+        self._etags: "OrderedDict[int, Tuple[float, str]]" = OrderedDict()
+        # Cambia con cada invalidación; evita guardar lecturas que empezaron antes de una escritura
+        self.generation = 0
+        self.stats = PortCacheStats()
+
+    def get(self, port_id: int) -> Optional[Port]:
+        entry = self._entries.get(port_id)
+        if entry is None or entry[0] <= self._clock():
+            if entry is not None:
+                del self._entries[port_id]
+            self.stats.misses += 1
+            return None
+        self._entries.move_to_end(port_id)
+        self.stats.hits += 1
+        return entry[1]
+
+    def put(self, port: Port, generation: Optional[int] = None) -> None:
+        if generation is not None and generation != self.generation:
+            return
+        self._entries[port.id] = (self._clock() + self.ttl_seconds, port)
+        self._entries.move_to_end(port.id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+
+    def get_etag(self, port_id: int) -> Optional[str]:
+        entry = self._etags.get(port_id)
+        if entry is None or entry[0] <= self._clock():
+            return None
+        self._etags.move_to_end(port_id)
+        self.stats.etag_hits += 1
+        return entry[1]
+
+    def put_etag(self, port_id: int, etag: str, generation: Optional[int] = None) -> None:
+        if generation is not None and generation != self.generation:
+            return
+        self._etags[port_id] = (self._clock() + self.ttl_seconds, etag)
+        self._etags.move_to_end(port_id)
+        while len(self._etags) > self.max_entries:
+            self._etags.popitem(last=False)
+
+    def get_list(self) -> Optional[List[Port]]:
+        if self._list is None or self._list[0] <= self._clock():
+            self._list = None
+            self.stats.list_misses += 1
+            return None
+        self.stats.list_hits += 1
+        return self._list[1]
+
+    def put_list(self, ports: List[Port], generation: Optional[int] = None) -> None:
+        if generation is not None and generation != self.generation:
+            return
+        if len(ports) > self.max_list_size:
+            return
+        self._list = (self._clock() + self.ttl_seconds, ports)
+
+    def invalidate(self, port_id: int) -> None:
+        self.generation += 1
+        self.stats.invalidations += 1
+        self._entries.pop(port_id, None)
+        self._etags.pop(port_id, None)
+        self._list = None
+
+    def invalidate_list(self) -> None:
+        self.generation += 1
+        self._list = None
+
+    def clear(self) -> None:
+        self.generation += 1
+        self._entries.clear()
+        self._etags.clear()
+        self._list = None
+
+    def snapshot_stats(self) -> Dict[str, int]:
+        stats = asdict(self.stats)
+        stats["entries"] = len(self._entries)
+        stats["etags"] = len(self._etags)
+        stats["max_entries"] = self.max_entries
+        stats["list_cached"] = int(self._list is not None)
+        return stats
+
+
+class CachingPortService(PortService):
+    # Decorador de PortService: lecturas desde la caché, escrituras invalidan
+    def __init__(
+        self,
+        inner: PortService,
+        cache: PortCache,
+        tiles: Optional[PortTileCache] = None,
+        prefixes: Optional[PortPrefixIndex] = None,
+    ):
+        self.inner = inner
+        self.cache = cache
+        self.tiles = tiles
+        self.prefixes = prefixes
+
+    def _invalidate_tiles(self, port_id: int, port: Optional[Port] = None) -> None:
+        if self.tiles is None:
+            return
+        if port is None:
+            self.tiles.invalidate_port(port_id)
+        else:
+            self.tiles.invalidate_port(port_id, port.latitude, port.longitude)
+
+    async def create_port(self, name: str, country: str, latitude: float, longitude: float) -> Port:
+        port = await self.inner.create_port(name, country, latitude, longitude)
+        self.cache.invalidate_list()
+        self.cache.put(port)
+        self._invalidate_tiles(port.id, port)
+        if self.prefixes is not None:
+            self.prefixes.add(port)
+        return port
+
+    async def get_port_by_id(self, port_id: int) -> Optional[Port]:
+        port = self.cache.get(port_id)
+        if port is not None:
+            return port
+        generation = self.cache.generation
+        port = await self.inner.get_port_by_id(port_id)
+        if port is not None:
+            self.cache.put(port, generation)
+        return port
+
+    async def get_ports_by_ids(self, port_ids: Sequence[int]) -> List[Optional[Port]]:
+        # Cada id se consulta una vez aunque venga repetido: las estadísticas cuentan ids distintos
+        unique_ids = list(dict.fromkeys(port_ids))
+        found = {}
+        for port_id in unique_ids:
+            port = self.cache.get(port_id)
+            if port is not None:
+                found[port_id] = port
+        # Solo los fallos van a la base, en una única consulta
+        misses = [port_id for port_id in unique_ids if port_id not in found]
+        if misses:
+            generation = self.cache.generation
+            for port in await self.inner.get_ports_by_ids(misses):
+                if port is not None:
+                    found[port.id] = port
+                    self.cache.put(port, generation)
+        return [found.get(port_id) for port_id in port_ids]
+
+    async def list_ports(self) -> List[Port]:
+        ports = self.cache.get_list()
+        if ports is not None:
+            return ports
+        generation = self.cache.generation
+        ports = await self.inner.list_ports()
+        self.cache.put_list(ports, generation)
+        return ports
+
+    async def list_ports_page(self, after_id: Optional[int], limit: int) -> List[Port]:
+        return await self.inner.list_ports_page(after_id, limit)
+
+    def stream_ports(self, after_id: Optional[int] = None, limit: Optional[int] = None) -> AsyncIterator[Port]:
+        return self.inner.stream_ports(after_id, limit)
+
+    async def update_port(
+        self,
+        port_id: int,
+        name: Optional[str] = None,
+        country: Optional[str] = None,
+        latitude: Optional[float] = None,
+        longitude: Optional[float] = None
+    ) -> Optional[Port]:
+        port = await self.inner.update_port(
+            port_id, name=name, country=country, latitude=latitude, longitude=longitude
+        )
+        self.cache.invalidate(port_id)
+        self._invalidate_tiles(port_id, port)
+        if self.prefixes is not None and port is not None:
+            self.prefixes.add(port)
+        return port
+
+    async def delete_port(self, port_id: int) -> bool:
+        deleted = await self.inner.delete_port(port_id)
+        self.cache.invalidate(port_id)
+        self._invalidate_tiles(port_id)
+        if self.prefixes is not None:
+            self.prefixes.remove(port_id)
+        return deleted
+
+    async def bulk_create_ports(self, rows: Sequence[Tuple[int, Port]]) -> List[int]:
+        rejected = await self.inner.bulk_create_ports(rows)
+        self.cache.invalidate_list()
+        if self.tiles is not None:
+            self.tiles.clear()
+        if self.prefixes is not None:
+            self.prefixes.reset()
+        return rejected
+
+    async def upsert_ports(self, ports: Sequence[Port]) -> List[Tuple[Port, str]]:
+        results = await self.inner.upsert_ports(ports)
+        for port, status in results:
+            if status != UPSERT_UNCHANGED:
+                self.cache.invalidate(port.id)
+                self._invalidate_tiles(port.id, port)
+                if self.prefixes is not None:
+                    self.prefixes.add(port)
+        return results
+
+    async def list_port_changes(
+        self, after_version: int, after_id: int, limit: int
+    ) -> Tuple[List[PortVersionChange], int]:
+        # La sincronización incremental siempre lee de la base: la caché no conoce versiones
+        return await self.inner.list_port_changes(after_version, after_id, limit)
+
+    async def find_nearest_ports(self, latitude: float, longitude: float, k: int) -> List[Tuple[Port, float]]:
+        return await self.inner.find_nearest_ports(latitude, longitude, k)
+
+    async def find_ports_within(
+        self, latitude: float, longitude: float, radius_km: float, limit: int
+    ) -> List[Tuple[Port, float]]:
+        return await self.inner.find_ports_within(latitude, longitude, radius_km, limit)
+
+    async def find_ports_in_bbox(
+        self, min_lat: float, min_lon: float, max_lat: float, max_lon: float, limit: int
+    ) -> List[Port]:
+        return await self.inner.find_ports_in_bbox(min_lat, min_lon, max_lat, max_lon, limit)
+
+    async def cluster_ports_in_bbox(
+        self,
+        min_lat: float,
+        min_lon: float,
+        max_lat: float,
+        max_lon: float,
+        grid_size: float,
+        sample_size: int,
+        limit: int,
+    ) -> List[PortCluster]:
+        return await self.inner.cluster_ports_in_bbox(
+            min_lat, min_lon, max_lat, max_lon, grid_size, sample_size, limit
+        )
+
+    async def get_port_tile(self, z: int, x: int, y: int) -> PortTile:
+        if self.tiles is None:
+            return await self.inner.get_port_tile(z, x, y)
+        key = (z, x, y)
+        version = self.cache.generation
+        tile = self.tiles.get(key, version)
+        if tile is not None:
+            return tile
+        tile = await self.inner.get_port_tile(z, x, y)
+        self.tiles.put(key, tile, version)
+        return tile
+
+    async def search_ports(self, query: str, limit: int) -> List[Tuple[Port, float]]:
+        if self.prefixes is None:
+            return await self.inner.search_ports(query, limit)
+        if not self.prefixes.is_fresh():
+            generation = self.prefixes.generation
+            self.prefixes.load(await self.list_ports(), generation)
+        # Si los prefijos llenan el límite salen de memoria; si no, se completan con los
+        # trigramas de la base (erratas) sin repetir puertos
+        results = self.prefixes.search(query, limit)
+        if len(results) >= limit:
+            return results
+        seen = {port.id for port, _ in results}
+        for port, score in await self.inner.search_ports(query, limit):
+            if len(results) >= limit:
+                break
+            if port.id not in seen:
+                seen.add(port.id)
+                results.append((port, score))
+        return results
@@ -0,0 +1,127 @@
+from typing import AsyncIterator, Callable, List, Optional, Sequence, Tuple
+
+from app.ports.application.services import PortService
+from app.ports.domain.models import Port, PortCluster, PortTile, PortVersionChange
+from app.shared.singleflight import SingleFlight
+
+
+class CoalescingPortService(PortService):
+    # Lecturas idénticas y concurrentes del worker comparten una única consulta (la del primero
+    # que llega); el resto no abre conexión. Los resultados son compartidos: solo lectura.
+    def __init__(
+        self,
+        inner: PortService,
+        flight: SingleFlight,
+        generation: Callable[[], int] = lambda: 0,
+    ):
+        self.inner = inner
+        self.flight = flight
+        # La generación de la caché entra en la clave: una lectura que empezó antes de una
+        # escritura no se comparte con las que llegan después
+        self.generation = generation
+
+    def _key(self, *parts) -> tuple:
+        return (*parts, self.generation())
+
+    async def create_port(self, name: str, country: str, latitude: float, longitude: float) -> Port:
+        return await self.inner.create_port(name, country, latitude, longitude)
+
+    async def get_port_by_id(self, port_id: int) -> Optional[Port]:
+        return await self.flight.do(
+            self._key("get", port_id), lambda: self.inner.get_port_by_id(port_id)
+        )
+
+    async def get_ports_by_ids(self, port_ids: Sequence[int]) -> List[Optional[Port]]:
+        port_ids = tuple(port_ids)
+        return await self.flight.do(
+            self._key("batch", port_ids), lambda: self.inner.get_ports_by_ids(port_ids)
+        )
+
+    async def list_ports(self) -> List[Port]:
+        return await self.flight.do(self._key("list"), self.inner.list_ports)
+
+    async def list_ports_page(self, after_id: Optional[int], limit: int) -> List[Port]:
+        return await self.flight.do(
+            self._key("page", after_id, limit), lambda: self.inner.list_ports_page(after_id, limit)
+        )
+
+    def stream_ports(self, after_id: Optional[int] = None, limit: Optional[int] = None) -> AsyncIterator[Port]:
+        return self.inner.stream_ports(after_id, limit)
+
+    async def update_port(
+        self,
+        port_id: int,
+        name: Optional[str] = None,
+        country: Optional[str] = None,
+        latitude: Optional[float] = None,
+        longitude: Optional[float] = None
+    ) -> Optional[Port]:
+        return await self.inner.update_port(
+            port_id, name=name, country=country, latitude=latitude, longitude=longitude
+        )
+
+    async def delete_port(self, port_id: int) -> bool:
+        return await self.inner.delete_port(port_id)
+
+    async def bulk_create_ports(self, rows: Sequence[Tuple[int, Port]]) -> List[int]:
+        return await self.inner.bulk_create_ports(rows)
+
+    async def upsert_ports(self, ports: Sequence[Port]) -> List[Tuple[Port, str]]:
+        return await self.inner.upsert_ports(ports)
+
+    async def list_port_changes(
+        self, after_version: int, after_id: int, limit: int
+    ) -> Tuple[List[PortVersionChange], int]:
+        return await self.flight.do(
+            self._key("changes", after_version, after_id, limit),
+            lambda: self.inner.list_port_changes(after_version, after_id, limit),
+        )
+
+    async def find_nearest_ports(self, latitude: float, longitude: float, k: int) -> List[Tuple[Port, float]]:
+        return await self.flight.do(
+            self._key("nearest", latitude, longitude, k),
+            lambda: self.inner.find_nearest_ports(latitude, longitude, k),
+        )
+
+    async def find_ports_within(
+        self, latitude: float, longitude: float, radius_km: float, limit: int
+    ) -> List[Tuple[Port, float]]:
+        return await self.flight.do(
+            self._key("within", latitude, longitude, radius_km, limit),
+            lambda: self.inner.find_ports_within(latitude, longitude, radius_km, limit),
+        )
+
+    async def find_ports_in_bbox(
+        self, min_lat: float, min_lon: float, max_lat: float, max_lon: float, limit: int
+    ) -> List[Port]:
+        return await self.flight.do(
+            self._key("bbox", min_lat, min_lon, max_lat, max_lon, limit),
+            lambda: self.inner.find_ports_in_bbox(min_lat, min_lon, max_lat, max_lon, limit),
+        )
+
+    async def cluster_ports_in_bbox(
+        self,
+        min_lat: float,
+        min_lon: float,
+        max_lat: float,
+        max_lon: float,
+        grid_size: float,
+        sample_size: int,
+        limit: int,
+    ) -> List[PortCluster]:
+        return await self.flight.do(
+            self._key("clusters", min_lat, min_lon, max_lat, max_lon, grid_size, sample_size, limit),
+            lambda: self.inner.cluster_ports_in_bbox(
+                min_lat, min_lon, max_lat, max_lon, grid_size, sample_size, limit
+            ),
+        )
+
+    async def get_port_tile(self, z: int, x: int, y: int) -> PortTile:
+        return await self.flight.do(
+            self._key("tile", z, x, y), lambda: self.inner.get_port_tile(z, x, y)
+        )
+
+    async def search_ports(self, query: str, limit: int) -> List[Tuple[Port, float]]:
+        return await self.flight.do(
+            self._key("search", query, limit), lambda: self.inner.search_ports(query, limit)
+        )
@@ -0,0 +1,179 @@
+import time
+from dataclasses import dataclass
+from typing import Callable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.ports.application.cache import PortCache
+from app.ports.domain.models import Port
+
+EARTH_RADIUS_KM = 6371.0088
+# Elipsoide WGS84 para Vincenty
+WGS84_A = 6378137.0
+WGS84_F = 1 / 298.257223563
+WGS84_B = (1 - WGS84_F) * WGS84_A
+VINCENTY_MAX_ITERATIONS = 200
+VINCENTY_TOLERANCE = 1e-12
+
+HAVERSINE = "haversine"
+VINCENTY = "vincenty"
+
+
+def haversine_matrix(origins: np.ndarray, destinations: np.ndarray) -> np.ndarray:
+    # origins (m, 2) y destinations (n, 2) en radianes [lat, lon]; devuelve km (m, n)
+    lat1 = origins[:, 0:1]
+    lon1 = origins[:, 1:2]
+    lat2 = destinations[:, 0]
+    lon2 = destinations[:, 1]
+    a = np.sin((lat2 - lat1) * 0.5) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) * 0.5) ** 2
+    return 2.0 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def _haversine_pairs(origins: np.ndarray, destinations: np.ndarray) -> np.ndarray:
+    # Distancia de cada origen con su destino (no la matriz completa)
+    dlat = destinations[:, 0] - origins[:, 0]
+    dlon = destinations[:, 1] - origins[:, 1]
+    a = np.sin(dlat * 0.5) ** 2 + np.cos(origins[:, 0]) * np.cos(destinations[:, 0]) * np.sin(dlon * 0.5) ** 2
+    return 2.0 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def vincenty_matrix(origins: np.ndarray, destinations: np.ndarray) -> np.ndarray:
+    # Fórmula inversa de Vincenty vectorizada. Cada iteración solo recalcula los pares que
+    # aún no han convergido; los casi antipodales que no convergen se resuelven con haversine.
+    shape = (origins.shape[0], destinations.shape[0])
+    U1 = np.arctan((1 - WGS84_F) * np.tan(origins[:, 0:1]))
+    U2 = np.arctan((1 - WGS84_F) * np.tan(destinations[:, 0][np.newaxis, :]))
+    sinU1 = np.broadcast_to(np.sin(U1), shape).ravel()
+    cosU1 = np.broadcast_to(np.cos(U1), shape).ravel()
+    sinU2 = np.broadcast_to(np.sin(U2), shape).ravel()
+    cosU2 = np.broadcast_to(np.cos(U2), shape).ravel()
+    L = (destinations[:, 1][np.newaxis, :] - origins[:, 1:2]).ravel()
+
+    lam = L.copy()
+    sin_sigma = np.empty_like(L)
+    cos_sigma = np.empty_like(L)
+    sigma = np.empty_like(L)
+    cos2_alpha = np.empty_like(L)
+    cos_2sigma_m = np.empty_like(L)
+    active = np.arange(L.size)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for _ in range(VINCENTY_MAX_ITERATIONS):
+            s_u1, c_u1, s_u2, c_u2 = sinU1[active], cosU1[active], sinU2[active], cosU2[active]
+            sin_lam, cos_lam = np.sin(lam[active]), np.cos(lam[active])
+            s_sigma = np.sqrt((c_u2 * sin_lam) ** 2 + (c_u1 * s_u2 - s_u1 * c_u2 * cos_lam) ** 2)
+            c_sigma = s_u1 * s_u2 + c_u1 * c_u2 * cos_lam
+            sig = np.arctan2(s_sigma, c_sigma)
+            sin_alpha = np.where(s_sigma == 0, 0.0, c_u1 * c_u2 * sin_lam / s_sigma)
+            c2_alpha = 1 - sin_alpha ** 2
+            # Sobre el ecuador cos2_alpha = 0
+            c_2sigma_m = np.where(c2_alpha == 0, 0.0, c_sigma - 2 * s_u1 * s_u2 / c2_alpha)
+            C = WGS84_F / 16 * c2_alpha * (4 + WGS84_F * (4 - 3 * c2_alpha))
+            lam_next = L[active] + (1 - C) * WGS84_F * sin_alpha * (
+                sig + C * s_sigma * (c_2sigma_m + C * c_sigma * (-1 + 2 * c_2sigma_m ** 2))
+            )
+            sin_sigma[active] = s_sigma
+            cos_sigma[active] = c_sigma
+            sigma[active] = sig
+            cos2_alpha[active] = c2_alpha
+            cos_2sigma_m[active] = c_2sigma_m
+            done = np.abs(lam_next - lam[active]) < VINCENTY_TOLERANCE
+            lam[active] = lam_next
+            active = active[~done]
+            if not active.size:
+                break
+
+        u2 = cos2_alpha * (WGS84_A ** 2 - WGS84_B ** 2) / WGS84_B ** 2
+        A = 1 + u2 / 16384 * (4096 + u2 * (-768 + u2 * (320 - 175 * u2)))
+        B = u2 / 1024 * (256 + u2 * (-128 + u2 * (74 - 47 * u2)))
+        delta_sigma = B * sin_sigma * (
+            cos_2sigma_m
+            + B / 4 * (
+                cos_sigma * (-1 + 2 * cos_2sigma_m ** 2)
+                - B / 6 * cos_2sigma_m * (-3 + 4 * sin_sigma ** 2) * (-3 + 4 * cos_2sigma_m ** 2)
+            )
+        )
+        distances = (WGS84_B * A * (sigma - delta_sigma) / 1000.0).reshape(shape)
+    if active.size:
+        rows, cols = np.unravel_index(active, shape)
+        distances[rows, cols] = _haversine_pairs(origins[rows], destinations[cols])
+    return distances
+
+
+DISTANCE_METHODS = {
+    HAVERSINE: haversine_matrix,
+    VINCENTY: vincenty_matrix,
+}
+
+
+@dataclass(frozen=True)
+class PortCoordinates:
+    # ids ordenados y sus coordenadas en radianes, en un único array float64 contiguo (n, 2)
+    version: int
+    expires_at: float
+    ids: np.ndarray
+    radians: np.ndarray
+
+    def positions(self, port_ids: Sequence[int]) -> Tuple[np.ndarray, List[int]]:
+        # Devuelve las posiciones de los ids en el array y los ids que no existen
+        wanted = np.asarray(port_ids, dtype=np.int64)
+        positions = np.searchsorted(self.ids, wanted)
+        positions = np.minimum(positions, max(len(self.ids) - 1, 0))
+        found = self.ids[positions] == wanted if len(self.ids) else np.zeros(len(wanted), dtype=bool)
+        missing = wanted[~found].tolist()
+        return positions, list(dict.fromkeys(missing))
+
+
+def build_coordinates(ports: Sequence[Port], version: int, expires_at: float) -> PortCoordinates:
+    ordered = sorted(ports, key=lambda port: port.id)
+    ids = np.fromiter((port.id for port in ordered), dtype=np.int64, count=len(ordered))
+    degrees = np.empty((len(ordered), 2), dtype=np.float64)
+    for i, port in enumerate(ordered):
+        degrees[i, 0] = port.latitude
+        degrees[i, 1] = port.longitude
+    return PortCoordinates(
+        version=version,
+        expires_at=expires_at,
+        ids=ids,
+        radians=np.ascontiguousarray(np.radians(degrees)),
+    )
+
+
+class PortCoordinateIndex:
+    # Coordenadas del catálogo por versión (generación de PortCache), como PortCatalogue
+    def __init__(self, cache: PortCache, clock: Callable[[], float] = time.monotonic):
+        self.cache = cache
+        self._clock = clock
+        self._coordinates: Optional[PortCoordinates] = None
+        self.rebuilds = 0
+
+    @property
+    def version(self) -> int:
+        return self.cache.generation
+
+    def current(self) -> Optional[PortCoordinates]:
+        coordinates = self._coordinates
+        if coordinates is None or coordinates.version != self.version or coordinates.expires_at <= self._clock():
+            return None
+        return coordinates
+
+    def build(self, ports: Sequence[Port], version: int) -> PortCoordinates:
+        coordinates = build_coordinates(ports, version, self._clock() + self.cache.ttl_seconds)
+        self.rebuilds += 1
+        if version == self.version:
+            self._coordinates = coordinates
+        return coordinates
+
+
+def distance_matrix_blocks(
+    coordinates: PortCoordinates,
+    origin_positions: np.ndarray,
+    destination_positions: np.ndarray,
+    method: str,
+    block_rows: int,
+) -> Iterator[Callable[[], np.ndarray]]:
+    # Un callable por bloque de filas: permite calcular cada bloque fuera del event loop
+    compute = DISTANCE_METHODS[method]
+    destinations = coordinates.radians[destination_positions]
+    for start in range(0, len(origin_positions), block_rows):
+        origins = coordinates.radians[origin_positions[start:start + block_rows]]
+        yield lambda origins=origins: compute(origins, destinations)
@@ -0,0 +1,127 @@
+import re
+import time
+from bisect import bisect_left, insort
+from typing import Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+from app.ports.domain.models import Port
+
+
+_WORD = re.compile(r"[^\W_]+")
+
+
+def normalize(text: str) -> str:
+    # Igual que ILIKE en PortRepository.search_ports: solo se ignoran las mayúsculas
+    # (los acentos y los espacios cuentan), para que el índice y la base den lo mismo
+    return text.lower()
+
+
+def trigrams(text: str) -> Set[str]:
+    # Como show_trgm de pg_trgm: cada palabra con dos espacios delante y uno detrás
+    found = set()
+    for word in _WORD.findall(text.lower()):
+        padded = f"  {word} "
+        found.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return found
+
+
+def similarity(a: str, b: str) -> float:
+    # similarity() de pg_trgm: trigramas comunes sobre trigramas distintos de ambos textos
+    left, right = trigrams(a), trigrams(b)
+    if not left or not right:
+        return 0.0
+    shared = len(left & right)
+    return shared / (len(left) + len(right) - shared)
+
+
+def search_score(port: Port, query: str) -> float:
+    # Mismo score que la consulta SQL: greatest(similarity(name, q), similarity(country, q))
+    return max(similarity(port.name, query), similarity(port.country, query))
+
+
+class PortPrefixIndex:
+    # Índice de prefijos en memoria para el autocompletado: listas ordenadas de (clave, id)
+    # que se actualizan puerto a puerto, sin reconstruir el índice entero.
+    def __init__(self, ttl_seconds: float, clock: Callable[[], float] = time.monotonic):
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._ports: Dict[int, Port] = {}
+        # Los mismos prefijos que la consulta SQL: nombre completo y país
+        self._names: List[Tuple[str, int]] = []
+        self._countries: List[Tuple[str, int]] = []
+        self._loaded_at: Optional[float] = None
+        self.generation = 0
+
+    @property
+    def size(self) -> int:
+        return len(self._ports)
+
+    def is_fresh(self) -> bool:
+        return self._loaded_at is not None and self._loaded_at + self.ttl_seconds > self._clock()
+
+    def load(self, ports: Sequence[Port], generation: Optional[int] = None) -> None:
+        if generation is not None and generation != self.generation:
+            return
+        self._ports = {}
+        self._names = []
+        self._countries = []
+        for port in ports:
+            self._ports[port.id] = port
+            self._names.append((normalize(port.name), port.id))
+            self._countries.append((normalize(port.country), port.id))
+        self._names.sort()
+        self._countries.sort()
+        self._loaded_at = self._clock()
+
+    def add(self, port: Port) -> None:
+        self.generation += 1
+        if self._loaded_at is None:
+            return
+        self.remove(port.id)
+        self._ports[port.id] = port
+        insort(self._names, (normalize(port.name), port.id))
+        insort(self._countries, (normalize(port.country), port.id))
+
+    def remove(self, port_id: int) -> None:
+        self.generation += 1
+        port = self._ports.pop(port_id, None)
+        if port is None:
+            return
+        self._discard(self._names, (normalize(port.name), port_id))
+        self._discard(self._countries, (normalize(port.country), port_id))
+
+    def reset(self) -> None:
+        # Se recargará entero en la próxima búsqueda
+        self.generation += 1
+        self._loaded_at = None
+        self._ports = {}
+        self._names = []
+        self._countries = []
+
+    def search(self, query: str, limit: int) -> List[Tuple[Port, float]]:
+        # Mismo orden que la consulta SQL: prefijo del nombre primero, luego score y nombre
+        prefix = normalize(query)
+        if not prefix:
+            return []
+        name_hits = set(self._matching(self._names, prefix))
+        hits = name_hits.union(self._matching(self._countries, prefix))
+        ranked = sorted(
+            ((self._ports[port_id], search_score(self._ports[port_id], query), port_id in name_hits)
+             for port_id in hits),
+            key=lambda hit: (not hit[2], -hit[1], hit[0].name),
+        )
+        return [(port, score) for port, score, _ in ranked[:limit]]
+
+    @staticmethod
+    def _matching(entries: List[Tuple[str, int]], prefix: str) -> List[int]:
+        found = []
+        index = bisect_left(entries, (prefix, -1))
+        while index < len(entries) and entries[index][0].startswith(prefix):
+            found.append(entries[index][1])
+            index += 1
+        return found
+
+    @staticmethod
+    def _discard(entries: List[Tuple[str, int]], entry: Tuple[str, int]) -> None:
+        index = bisect_left(entries, entry)
+        if index < len(entries) and entries[index] == entry:
+            del entries[index]
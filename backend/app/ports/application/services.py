@@ -1,6 +1,6 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
-from app.ports.domain.models import Port
+from typing import AsyncIterator, List, Optional, Sequence, Tuple
+from app.ports.domain.models import Port, PortCluster, PortTile, PortVersionChange
 
 class PortService(ABC):
    
@@ -11,11 +11,70 @@ class PortService(ABC):
     async def get_port_by_id(self, port_id: int) ->  Optional[Port]:
         raise NotImplementedError
     @abstractmethod
+    async def get_ports_by_ids(self, port_ids: Sequence[int]) -> List[Optional[Port]]:
+        # Mismo orden que port_ids; None para los que no existen
+        raise NotImplementedError
+    @abstractmethod
     async def list_ports(self) -> List[Port]:
         raise NotImplementedError
     @abstractmethod
+    async def list_ports_page(self, after_id: Optional[int], limit: int) -> List[Port]:
+        raise NotImplementedError
+    @abstractmethod
+    def stream_ports(self, after_id: Optional[int] = None, limit: Optional[int] = None) -> AsyncIterator[Port]:
+        raise NotImplementedError
+    @abstractmethod
     async def update_port(self,port_id: int):
         raise NotImplementedError
     @abstractmethod    
     async def delete_port(self,port_id: int) -> bool:
-        raise NotImplementedError
\ No newline at end of file
+        raise NotImplementedError
+    @abstractmethod
+    async def find_nearest_ports(self, latitude: float, longitude: float, k: int) -> List[Tuple[Port, float]]:
+        raise NotImplementedError
+    @abstractmethod
+    async def find_ports_within(
+        self, latitude: float, longitude: float, radius_km: float, limit: int
+    ) -> List[Tuple[Port, float]]:
+        raise NotImplementedError
+    @abstractmethod
+    async def find_ports_in_bbox(
+        self, min_lat: float, min_lon: float, max_lat: float, max_lon: float, limit: int
+    ) -> List[Port]:
+        # Si min_lon > max_lon el viewport cruza el antimeridiano
+        raise NotImplementedError
+    @abstractmethod
+    async def cluster_ports_in_bbox(
+        self,
+        min_lat: float,
+        min_lon: float,
+        max_lat: float,
+        max_lon: float,
+        grid_size: float,
+        sample_size: int,
+        limit: int,
+    ) -> List[PortCluster]:
+        raise NotImplementedError
+    @abstractmethod
+    async def get_port_tile(self, z: int, x: int, y: int) -> PortTile:
+        # Tesela Mapbox Vector Tile (Web Mercator) con los puertos que caen en ella
+        raise NotImplementedError
+    @abstractmethod
+    async def search_ports(self, query: str, limit: int) -> List[Tuple[Port, float]]:
+        # Autocompletado por prefijo y coincidencia aproximada (trigramas) en nombre y país
+        raise NotImplementedError
+    @abstractmethod
+    async def bulk_create_ports(self, rows: Sequence[Tuple[int, Port]]) -> List[int]:
+        # Recibe (línea, Port) y devuelve las líneas rechazadas (nombre duplicado)
+        raise NotImplementedError
+    @abstractmethod
+    async def upsert_ports(self, ports: Sequence[Port]) -> List[Tuple[Port, str]]:
+        # Devuelve, en el orden de entrada, el puerto y si se creó, actualizó o no cambió
+        raise NotImplementedError
+    @abstractmethod
+    async def list_port_changes(
+        self, after_version: int, after_id: int, limit: int
+    ) -> Tuple[List[PortVersionChange], int]:
+        # Altas, cambios y borrados (lápidas) posteriores a (after_version, after_id), en ese orden,
+        # y el watermark: toda versión menor ya está confirmada y se ha podido devolver
+        raise NotImplementedError
@@ -0,0 +1,132 @@
+import math
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Callable, Dict, Optional, Set, Tuple
+
+from app.ports.domain.models import PortTile
+
+TileKey = Tuple[int, int, int]
+
+# Extensión y buffer de las teselas: deben coincidir con la consulta ST_AsMVT
+TILE_EXTENT = 4096
+TILE_BUFFER = 256
+MAX_MERCATOR_LATITUDE = 85.05112878
+
+
+def tile_position(latitude: float, longitude: float, z: int) -> Tuple[float, float]:
+    # Coordenadas fraccionarias de tesela (Web Mercator) de un punto
+    n = 2 ** z
+    latitude = max(-MAX_MERCATOR_LATITUDE, min(MAX_MERCATOR_LATITUDE, latitude))
+    fx = (longitude + 180.0) / 360.0 * n
+    fy = (1.0 - math.asinh(math.tan(math.radians(latitude))) / math.pi) / 2.0 * n
+    return fx, fy
+
+
+def covering_tiles(latitude: float, longitude: float, z: int) -> Set[TileKey]:
+    # Con el buffer, un punto cerca del borde también aparece en las teselas vecinas
+    n = 2 ** z
+    margin = TILE_BUFFER / TILE_EXTENT
+    fx, fy = tile_position(latitude, longitude, z)
+    xs = {int(math.floor(fx - margin)) % n, int(math.floor(fx + margin)) % n, int(fx) % n}
+    ys = {
+        min(n - 1, max(0, int(math.floor(value))))
+        for value in (fy - margin, fy, fy + margin)
+    }
+    return {(z, x, y) for x in xs for y in ys}
+
+
+@dataclass
+class PortTileCacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+
+
+class PortTileCache:
+    # LRU de teselas codificadas, acotada en número y en bytes, por z/x/y y versión del catálogo
+    # (la generación de PortCache): una tesela de otra versión nunca se sirve, aunque el cambio
+    # llegue de otro worker o mueva un puerto a un zoom aún sin teselas. invalidate_port solo
+    # libera antes la memoria de las teselas que ya no se van a pedir.
+    def __init__(
+        self,
+        max_entries: int,
+        max_bytes: int,
+        ttl_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: "OrderedDict[TileKey, Tuple[float, int, PortTile]]" = OrderedDict()
+        self._tiles_by_port: Dict[int, Set[TileKey]] = {}
+        self._zoom_counts: Dict[int, int] = {}
+        self.size_bytes = 0
+        self.stats = PortTileCacheStats()
+
+    def get(self, key: TileKey, version: int) -> Optional[PortTile]:
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= self._clock() or entry[1] != version:
+            if entry is not None:
+                self._remove(key)
+            self.stats.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.stats.hits += 1
+        return entry[2]
+
+    def put(self, key: TileKey, tile: PortTile, version: int) -> None:
+        # version es la del catálogo al empezar la lectura: si hubo una escritura entre medias,
+        # la tesela queda guardada con una versión que ya no se pide
+        if len(tile.data) > self.max_bytes:
+            return
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = (self._clock() + self.ttl_seconds, version, tile)
+        self.size_bytes += len(tile.data)
+        self._zoom_counts[key[0]] = self._zoom_counts.get(key[0], 0) + 1
+        for port_id in tile.port_ids:
+            self._tiles_by_port.setdefault(port_id, set()).add(key)
+        while len(self._entries) > self.max_entries or self.size_bytes > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+            self.stats.evictions += 1
+
+    def invalidate_port(
+        self, port_id: Optional[int], latitude: Optional[float] = None, longitude: Optional[float] = None
+    ) -> None:
+        keys = set(self._tiles_by_port.get(port_id, ())) if port_id is not None else set()
+        if latitude is not None and longitude is not None:
+            for z in list(self._zoom_counts):
+                keys |= covering_tiles(latitude, longitude, z)
+        for key in keys:
+            if key in self._entries:
+                self._remove(key)
+                self.stats.invalidations += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._tiles_by_port.clear()
+        self._zoom_counts.clear()
+        self.size_bytes = 0
+
+    def snapshot_stats(self) -> Dict[str, int]:
+        stats = asdict(self.stats)
+        stats["entries"] = len(self._entries)
+        stats["bytes"] = self.size_bytes
+        stats["max_bytes"] = self.max_bytes
+        return stats
+
+    def _remove(self, key: TileKey) -> None:
+        _, _, tile = self._entries.pop(key)
+        self.size_bytes -= len(tile.data)
+        self._zoom_counts[key[0]] -= 1
+        if not self._zoom_counts[key[0]]:
+            del self._zoom_counts[key[0]]
+        for port_id in tile.port_ids:
+            keys = self._tiles_by_port.get(port_id)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tiles_by_port[port_id]
@@ -1,6 +1,6 @@
 # app/ports/domain/models.py
 from dataclasses import dataclass, field
-from typing import Optional
+from typing import List, Optional
 
 @dataclass
 class Port:
@@ -10,3 +10,46 @@ class Port:
     longitude: float
     # El ID es generado por la base y se asigna después. No forma parte del constructor.
     id: Optional[int] = field(init=False, default=None)
+
+# Resultado de un upsert por nombre
+UPSERT_CREATED = "created"
+UPSERT_UPDATED = "updated"
+UPSERT_UNCHANGED = "unchanged"
+
+@dataclass
+class PortChange:
+    # Cambio emitido por la base (NOTIFY) al insertar, actualizar o borrar un puerto.
+    # En sentencias masivas id es None y count dice cuántas filas cambiaron: hay que releer todo.
+    op: str
+    id: Optional[int]
+    name: Optional[str] = None
+    country: Optional[str] = None
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
+    count: Optional[int] = None
+
+@dataclass
+class PortCluster:
+    # Celda de la rejilla del mapa: cuántos puertos caen en ella, su centroide y algunos ids
+    count: int
+    latitude: float
+    longitude: float
+    sample_ids: List[int]
+
+@dataclass
+class PortTile:
+    # Tesela MVT ya codificada y los puertos que contiene (para invalidar por id)
+    data: bytes
+    port_ids: List[int]
+
+# Operaciones de la sincronización incremental
+SYNC_UPSERT = "upsert"
+SYNC_DELETE = "delete"
+
+@dataclass
+class PortVersionChange:
+    # Cambio del catálogo posterior a una versión; port es None en los borrados
+    op: str
+    id: int
+    version: int
+    port: Optional[Port] = None
@@ -1,10 +1,185 @@
-from typing import List, Optional
+from typing import AsyncIterator, List, Optional, Sequence, Tuple
+from sqlalchemy import BigInteger, Float, Integer, String, any_, bindparam, func, literal, or_, text, update
+from sqlalchemy.dialects.postgresql import ARRAY, aggregate_order_by
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
-from app.ports.domain.models import Port
+from app.ports.application.tiles import TILE_BUFFER, TILE_EXTENT
+from app.ports.domain.models import (
+    SYNC_UPSERT,
+    Port,
+    PortCluster,
+    PortTile,
+    PortVersionChange,
+    UPSERT_UNCHANGED,
+)
 from app.ports.application.services import PortService
-from app.ports.infrastructure.models import PortORM, orm_to_domain, domain_to_orm
+from app.shared.replicas import REPLICA_READ
+from app.ports.infrastructure.models import (
+    PORT_COLUMNS,
+    PortORM,
+    domain_to_orm,
+    geography_point,
+    orm_to_domain,
+    planar_point,
+    row_to_domain,
+)
+
+STREAM_BATCH_SIZE = 1000
+
+
+def like_prefix(query: str) -> str:
+    escaped = query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"{escaped}%"
+
+# El filtro usa la misma expresión que ix_ports_geom; el margen del sobre cubre el buffer de la tesela
+_PORT_TILE = text(
+    """
+    WITH bounds AS (
+        SELECT ST_TileEnvelope(:z, :x, :y) AS geom,
+               ST_Transform(ST_TileEnvelope(:z, :x, :y, margin => :margin), 4326) AS filter
+    ),
+    features AS (
+        SELECT p.id, p.name, p.country,
+               ST_AsMVTGeom(ST_Transform(p.geog::geometry, 3857), bounds.geom, :extent, :buffer) AS geom
+        FROM ports p, bounds
+        WHERE p.geog::geometry && bounds.filter
+    )
+    SELECT COALESCE(ST_AsMVT(features, 'ports', :extent, 'geom', 'id'), ''::bytea) AS data,
+           COALESCE(array_agg(features.id), ARRAY[]::integer[]) AS port_ids
+    FROM features
+    """
+).bindparams(
+    bindparam("z", type_=Integer),
+    bindparam("x", type_=Integer),
+    bindparam("y", type_=Integer),
+    bindparam("margin", type_=Float),
+    bindparam("extent", type_=Integer),
+    bindparam("buffer", type_=Integer),
+).execution_options(**{REPLICA_READ: True})
+
+
+def bbox_filter(min_lat: float, min_lon: float, max_lat: float, max_lon: float):
+    # Un viewport que cruza el antimeridiano (min_lon > max_lon) se parte en dos cajas
+    if min_lon <= max_lon:
+        spans = [(min_lon, max_lon)]
+    else:
+        spans = [(min_lon, 180.0), (-180.0, max_lon)]
+    geom = planar_point(PortORM.geog)
+    return or_(
+        *(
+            geom.op("&&")(
+                func.ST_MakeEnvelope(
+                    literal(west, Float), literal(min_lat, Float), literal(east, Float), literal(max_lat, Float), 4326
+                )
+            )
+            for west, east in spans
+        )
+    )
+
+_CREATE_IMPORT_TABLE = text(
+    """
+    CREATE TEMP TABLE IF NOT EXISTS ports_import (
+        line_no integer,
+        name text,
+        country text,
+        latitude double precision,
+        longitude double precision
+    ) ON COMMIT DELETE ROWS
+    """
+)
+
+_INSERT_FROM_IMPORT_TABLE = text(
+    """
+    INSERT INTO ports (name, country, latitude, longitude)
+    SELECT name, country, latitude, longitude FROM ports_import ORDER BY line_no
+    ON CONFLICT (name) DO NOTHING
+    RETURNING name
+    """
+)
+
+# Un único statement por lote: los que no cambian no se reescriben (WHERE ... IS DISTINCT FROM)
+# y se devuelven desde la instantánea previa de la tabla
+_UPSERT_PORTS = text(
+    """
+    WITH input AS (
+        SELECT * FROM unnest(:names, :countries, :latitudes, :longitudes)
+            AS t(name, country, latitude, longitude)
+    ), upserted AS (
+        INSERT INTO ports (name, country, latitude, longitude)
+        SELECT name, country, latitude, longitude FROM input
+        ON CONFLICT (name) DO UPDATE
+        SET country = EXCLUDED.country,
+            latitude = EXCLUDED.latitude,
+            longitude = EXCLUDED.longitude
+        WHERE (ports.country, ports.latitude, ports.longitude)
+            IS DISTINCT FROM (EXCLUDED.country, EXCLUDED.latitude, EXCLUDED.longitude)
+        RETURNING id, name, country, latitude, longitude, (xmax = 0) AS inserted
+    )
+    SELECT id, name, country, latitude, longitude,
+           CASE WHEN inserted THEN 'created' ELSE 'updated' END AS status
+    FROM upserted
+    UNION ALL
+    SELECT p.id, p.name, p.country, p.latitude, p.longitude, 'unchanged' AS status
+    FROM ports p JOIN input i ON p.name = i.name
+    WHERE NOT EXISTS (SELECT 1 FROM upserted u WHERE u.name = p.name)
+    """
+).bindparams(
+    bindparam("names", type_=ARRAY(String)),
+    bindparam("countries", type_=ARRAY(String)),
+    bindparam("latitudes", type_=ARRAY(Float)),
+    bindparam("longitudes", type_=ARRAY(Float)),
+)
+
+# El borrado deja una lápida versionada con la transacción que borra, igual que las filas vivas
+_DELETE_PORT = text(
+    """
+    WITH deleted AS (
+        DELETE FROM ports WHERE id = :id RETURNING id
+    )
+    INSERT INTO port_tombstones (id, version, deleted_at)
+    SELECT id, pg_current_xact_id()::text::bigint, now() FROM deleted
+    ON CONFLICT (id) DO UPDATE
+    SET version = EXCLUDED.version, deleted_at = EXCLUDED.deleted_at
+    RETURNING id
+    """
+).bindparams(bindparam("id", type_=Integer))
+
+# Solo se devuelven cambios de transacciones por debajo del xmin del snapshot: todas han
+# terminado, y cualquier transacción aún abierta (o que confirme después) tiene versión >= xmin.
+# El watermark sale en la misma sentencia (mismo snapshot) aunque no haya cambios. Va siempre al
+# primario: una réplica puede no conocer aún una transacción abierta y dar un xmin mayor que ella.
+# Cada rama recorre su índice (version, id) y se corta en :limit antes de mezclarlas.
+_PORT_CHANGES_SINCE = text(
+    """
+    WITH watermark AS (
+        SELECT pg_snapshot_xmin(pg_current_snapshot())::text::bigint AS version
+    )
+    SELECT w.version AS watermark, c.op, c.id, c.version, c.name, c.country, c.latitude, c.longitude
+    FROM watermark w
+    LEFT JOIN LATERAL (
+        SELECT * FROM (
+            (SELECT 'upsert' AS op, p.id, p.version, p.name, p.country, p.latitude, p.longitude
+             FROM ports p
+             WHERE (p.version, p.id) > (:version, :after_id) AND p.version < w.version
+             ORDER BY p.version, p.id LIMIT :limit)
+            UNION ALL
+            (SELECT 'delete' AS op, t.id, t.version, NULL::varchar, NULL::varchar,
+                    NULL::double precision, NULL::double precision
+             FROM port_tombstones t
+             WHERE (t.version, t.id) > (:version, :after_id) AND t.version < w.version
+             ORDER BY t.version, t.id LIMIT :limit)
+        ) changes
+        ORDER BY version, id
+        LIMIT :limit
+    ) c ON true
+    ORDER BY c.version, c.id
+    """
+).bindparams(
+    bindparam("version", type_=BigInteger),
+    bindparam("after_id", type_=Integer),
+    bindparam("limit", type_=Integer),
+)
 
 class PortRepository(PortService):
     def __init__(self, session: AsyncSession):
@@ -18,13 +193,210 @@ class PortRepository(PortService):
         await self.session.refresh(port_orm)
         return orm_to_domain(port_orm)
 
+    async def bulk_create_ports(self, rows: Sequence[Tuple[int, Port]]) -> List[int]:
+        if not rows:
+            return []
+        # COPY a una tabla temporal y un único INSERT ... ON CONFLICT, todo en la misma transacción
+        await self.session.execute(_CREATE_IMPORT_TABLE)
+        connection = await self.session.connection()
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(
+            "ports_import",
+            records=[(line_no, p.name, p.country, p.latitude, p.longitude) for line_no, p in rows],
+            columns=["line_no", "name", "country", "latitude", "longitude"],
+        )
+        result = await self.session.execute(_INSERT_FROM_IMPORT_TABLE)
+        inserted_names = set(result.scalars().all())
+        await self.session.commit()
+
+        rejected = []
+        for line_no, port in sorted(rows, key=lambda row: row[0]):
+            if port.name in inserted_names:
+                # Solo la primera aparición de cada nombre se ha insertado
+                inserted_names.discard(port.name)
+            else:
+                rejected.append(line_no)
+        return rejected
+
+    async def upsert_ports(self, ports: Sequence[Port]) -> List[Tuple[Port, str]]:
+        if not ports:
+            return []
+        # ON CONFLICT DO UPDATE no admite dos filas con el mismo nombre: gana la última
+        unique = list({port.name: port for port in ports}.values())
+        result = await self.session.execute(
+            _UPSERT_PORTS,
+            {
+                "names": [p.name for p in unique],
+                "countries": [p.country for p in unique],
+                "latitudes": [p.latitude for p in unique],
+                "longitudes": [p.longitude for p in unique],
+            },
+        )
+        by_name = {row.name: (row_to_domain(row), row.status) for row in result}
+        missing = [p.name for p in unique if p.name not in by_name]
+        if missing:
+            # Fila insertada por otra transacción concurrente e idéntica: no cambia,
+            # pero no estaba en la instantánea del statement
+            rows = await self.session.execute(select(*PORT_COLUMNS).where(PortORM.name.in_(missing)))
+            by_name.update({row.name: (row_to_domain(row), UPSERT_UNCHANGED) for row in rows})
+        await self.session.commit()
+        return [by_name[port.name] for port in ports]
+
     async def get_port_by_id(self, port_id: int) -> Optional[Port]:
         port_orm = await self.session.get(PortORM, port_id)
         return orm_to_domain(port_orm) if port_orm else None
 
+    async def get_ports_by_ids(self, port_ids: Sequence[int]) -> List[Optional[Port]]:
+        if not port_ids:
+            return []
+        # Un solo parámetro array: WHERE id = ANY(:ids), sin un placeholder por id
+        ids = bindparam("ids", list(set(port_ids)), type_=ARRAY(Integer))
+        result = await self.session.execute(select(*PORT_COLUMNS).where(PortORM.id == any_(ids)))
+        by_id = {row.id: row_to_domain(row) for row in result}
+        return [by_id.get(port_id) for port_id in port_ids]
+
     async def list_ports(self) -> List[Port]:
-        result = await self.session.execute(select(PortORM))
-        return [orm_to_domain(p) for p in result.scalars().all()]
+        # Columnas sueltas en lugar de entidades ORM: sin identity map ni objetos PortORM por fila
+        result = await self.session.execute(select(*PORT_COLUMNS).order_by(PortORM.id))
+        return [row_to_domain(row) for row in result]
+
+    async def list_ports_page(self, after_id: Optional[int], limit: int) -> List[Port]:
+        # Paginación por clave: WHERE id > cursor usa el índice de la PK, sin OFFSET
+        stmt = select(*PORT_COLUMNS).order_by(PortORM.id).limit(limit)
+        if after_id is not None:
+            stmt = stmt.where(PortORM.id > after_id)
+        result = await self.session.execute(stmt)
+        return [row_to_domain(row) for row in result]
+
+    async def stream_ports(self, after_id: Optional[int] = None, limit: Optional[int] = None) -> AsyncIterator[Port]:
+        # Cursor de servidor: se leen filas por lotes sin cargar la tabla en memoria
+        stmt = (
+            select(*PORT_COLUMNS)
+            .order_by(PortORM.id)
+            .execution_options(yield_per=STREAM_BATCH_SIZE)
+        )
+        if after_id is not None:
+            stmt = stmt.where(PortORM.id > after_id)
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        result = await self.session.stream(stmt)
+        async for row in result:
+            yield row_to_domain(row)
+
+    async def find_nearest_ports(self, latitude: float, longitude: float, k: int) -> List[Tuple[Port, float]]:
+        point = geography_point(latitude, longitude)
+        # `<->` sobre geography usa el índice GiST (KNN) en lugar de recorrer la tabla
+        stmt = (
+            select(PortORM, func.ST_Distance(PortORM.geog, point))
+            .order_by(PortORM.geog.op("<->")(point))
+            .limit(k)
+        )
+        result = await self.session.execute(stmt)
+        return [(orm_to_domain(p), distance / 1000.0) for p, distance in result.all()]
+
+    async def find_ports_within(
+        self, latitude: float, longitude: float, radius_km: float, limit: int
+    ) -> List[Tuple[Port, float]]:
+        point = geography_point(latitude, longitude)
+        distance = func.ST_Distance(PortORM.geog, point)
+        stmt = (
+            select(PortORM, distance)
+            .where(func.ST_DWithin(PortORM.geog, point, radius_km * 1000.0))
+            .order_by(distance)
+            .limit(limit)
+        )
+        result = await self.session.execute(stmt)
+        return [(orm_to_domain(p), distance / 1000.0) for p, distance in result.all()]
+
+    async def find_ports_in_bbox(
+        self, min_lat: float, min_lon: float, max_lat: float, max_lon: float, limit: int
+    ) -> List[Port]:
+        stmt = (
+            select(*PORT_COLUMNS)
+            .where(bbox_filter(min_lat, min_lon, max_lat, max_lon))
+            .order_by(PortORM.id)
+            .limit(limit)
+        )
+        result = await self.session.execute(stmt)
+        return [row_to_domain(row) for row in result.all()]
+
+    async def cluster_ports_in_bbox(
+        self,
+        min_lat: float,
+        min_lon: float,
+        max_lat: float,
+        max_lon: float,
+        grid_size: float,
+        sample_size: int,
+        limit: int,
+    ) -> List[PortCluster]:
+        # Agregación en PostGIS: una fila por celda de la rejilla, no por puerto
+        size = literal(grid_size, Float)
+        cell = func.ST_SnapToGrid(planar_point(PortORM.geog), size, size)
+        sample_ids = func.array_agg(
+            aggregate_order_by(PortORM.id, PortORM.id), type_=ARRAY(Integer)
+        )[1:sample_size]
+        count = func.count()
+        # Longitud media como media de vectores unitarios: una celda a ambos lados de ±180°
+        # no acaba con el centroide en 0°, al otro lado del mundo
+        lon = func.radians(PortORM.longitude)
+        longitude = func.degrees(func.atan2(func.avg(func.sin(lon)), func.avg(func.cos(lon))))
+        stmt = (
+            select(
+                count.label("count"),
+                func.avg(PortORM.latitude).label("latitude"),
+                longitude.label("longitude"),
+                sample_ids.label("sample_ids"),
+            )
+            .where(bbox_filter(min_lat, min_lon, max_lat, max_lon))
+            .group_by(cell)
+            .order_by(count.desc())
+            .limit(limit)
+        )
+        result = await self.session.execute(stmt)
+        return [
+            PortCluster(
+                count=row.count,
+                latitude=row.latitude,
+                longitude=row.longitude,
+                sample_ids=list(row.sample_ids),
+            )
+            for row in result.all()
+        ]
+
+    async def get_port_tile(self, z: int, x: int, y: int) -> PortTile:
+        result = await self.session.execute(
+            _PORT_TILE,
+            {
+                "z": z,
+                "x": x,
+                "y": y,
+                "margin": TILE_BUFFER / TILE_EXTENT,
+                "extent": TILE_EXTENT,
+                "buffer": TILE_BUFFER,
+            },
+        )
+        row = result.one()
+        return PortTile(data=bytes(row.data), port_ids=list(row.port_ids))
+
+    async def search_ports(self, query: str, limit: int) -> List[Tuple[Port, float]]:
+        prefix = like_prefix(query)
+        name_prefix = PortORM.name.ilike(prefix)
+        score = func.greatest(func.similarity(PortORM.name, query), func.similarity(PortORM.country, query))
+        # ILIKE 'q%' y `%` (similitud >= pg_trgm.similarity_threshold) usan los índices GIN de trigramas
+        stmt = (
+            select(*PORT_COLUMNS, score.label("score"))
+            .where(
+                name_prefix
+                | PortORM.country.ilike(prefix)
+                | PortORM.name.op("%")(query)
+                | PortORM.country.op("%")(query)
+            )
+            .order_by(name_prefix.desc(), score.desc(), PortORM.name)
+            .limit(limit)
+        )
+        result = await self.session.execute(stmt)
+        return [(row_to_domain(row), row.score) for row in result.all()]
 
     async def update_port(
         self,
@@ -34,28 +406,53 @@ class PortRepository(PortService):
         latitude: Optional[float] = None,
         longitude: Optional[float] = None
     ) -> Optional[Port]:
-        port_orm = await self.session.get(PortORM, port_id)
-        if not port_orm:
-            return None
-
-        if name is not None:
-            port_orm.name = name
-        if country is not None:
-            port_orm.country = country
-        if latitude is not None:
-            port_orm.latitude = latitude
-        if longitude is not None:
-            port_orm.longitude = longitude
+        values = {
+            key: value
+            for key, value in (
+                ("name", name),
+                ("country", country),
+                ("latitude", latitude),
+                ("longitude", longitude),
+            )
+            if value is not None
+        }
+        if not values:
+            return await self.get_port_by_id(port_id)
 
-        self.session.add(port_orm)
+        # Un único UPDATE ... RETURNING: sin cargar la fila antes ni refrescarla después
+        stmt = (
+            update(PortORM)
+            .where(PortORM.id == port_id)
+            .values(**values)
+            .returning(*PORT_COLUMNS)
+            .execution_options(synchronize_session=False)
+        )
+        result = await self.session.execute(stmt)
+        row = result.first()
         await self.session.commit()
-        await self.session.refresh(port_orm)
-        return orm_to_domain(port_orm)
+        return row_to_domain(row) if row else None
 
     async def delete_port(self, port_id: int) -> bool:
-        port_orm = await self.session.get(PortORM, port_id)
-        if not port_orm:
-            return Falsegita
-        await self.session.delete(port_orm)
+        result = await self.session.execute(_DELETE_PORT, {"id": port_id})
+        deleted = result.first() is not None
         await self.session.commit()
-        return True
\ No newline at end of file
+        return deleted
+
+    async def list_port_changes(
+        self, after_version: int, after_id: int, limit: int
+    ) -> Tuple[List[PortVersionChange], int]:
+        result = await self.session.execute(
+            _PORT_CHANGES_SINCE, {"version": after_version, "after_id": after_id, "limit": limit}
+        )
+        rows = result.all()
+        changes = [
+            PortVersionChange(
+                op=row.op,
+                id=row.id,
+                version=row.version,
+                port=row_to_domain(row) if row.op == SYNC_UPSERT else None,
+            )
+            for row in rows
+            if row.op is not None
+        ]
+        return changes, rows[0].watermark
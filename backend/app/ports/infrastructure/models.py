@@ -1,7 +1,24 @@
-from sqlalchemy import Column, Integer, String, Float
+from sqlalchemy import BigInteger, Column, DateTime, FetchedValue, Integer, String, Float, Computed, Index, cast, func, literal, text
+from sqlalchemy.orm import deferred
+from sqlalchemy.types import UserDefinedType
 from .base import Base
 from app.ports.domain.models import Port
 
+
+class Geography(UserDefinedType):
+    cache_ok = True
+
+    def get_col_spec(self, **kw):
+        return "geography(Point, 4326)"
+
+
+class Geometry(UserDefinedType):
+    cache_ok = True
+
+    def get_col_spec(self, **kw):
+        return "geometry"
+
+
 class PortORM(Base):
     __tablename__ = "ports"
 
@@ -10,6 +27,50 @@ class PortORM(Base):
     country = Column(String, nullable=False)
     latitude = Column(Float, nullable=False)
     longitude = Column(Float, nullable=False)
+    # Columna generada por PostGIS (índice GiST); diferida para no cargarla en cada SELECT
+    geog = deferred(
+        Column(
+            Geography(),
+            Computed("ST_SetSRID(ST_MakePoint(longitude, latitude), 4326)::geography", persisted=True),
+        )
+    )
+
+    # Versión de cambio (xid8 de la transacción que escribe) y fecha; las fija un trigger en cada INSERT/UPDATE
+    version = Column(BigInteger, nullable=False, server_default=FetchedValue(), server_onupdate=FetchedValue())
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=FetchedValue(), server_onupdate=FetchedValue())
+
+    __table_args__ = (
+        Index("ix_ports_version", "version", "id"),
+        Index("ix_ports_geog", "geog", postgresql_using="gist"),
+        # Índice de expresión en grados planos para consultas de viewport (&&, ST_SnapToGrid)
+        Index("ix_ports_geom", text("(geog::geometry)"), postgresql_using="gist"),
+        # pg_trgm: búsqueda por prefijo (ILIKE) y aproximada (%) en nombre y país
+        Index("ix_ports_name_trgm", "name", postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"}),
+        Index("ix_ports_country_trgm", "country", postgresql_using="gin", postgresql_ops={"country": "gin_trgm_ops"}),
+    )
+
+class PortTombstoneORM(Base):
+    # Puertos borrados: permiten a los clientes sincronizar borrados por versión
+    __tablename__ = "port_tombstones"
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    version = Column(BigInteger, nullable=False)
+    deleted_at = Column(DateTime(timezone=True), nullable=False)
+
+    __table_args__ = (Index("ix_port_tombstones_version", "version", "id"),)
+
+# Columnas del dominio, para consultas que construyen Port sin pasar por el ORM
+PORT_COLUMNS = (PortORM.id, PortORM.name, PortORM.country, PortORM.latitude, PortORM.longitude)
+
+def geography_point(latitude: float, longitude: float):
+    return cast(
+        func.ST_SetSRID(func.ST_MakePoint(literal(longitude, Float), literal(latitude, Float)), 4326),
+        Geography(),
+    )
+
+def planar_point(geog):
+    # Debe coincidir con la expresión de ix_ports_geom para que el planner use el índice
+    return cast(geog, Geometry())
 
 def orm_to_domain(port_orm: PortORM) -> Port:
     port = Port(
@@ -21,6 +82,16 @@ def orm_to_domain(port_orm: PortORM) -> Port:
     port.id = port_orm.id
     return port
 
+def row_to_domain(row) -> Port:
+    port = Port(
+        name=row.name,
+        country=row.country,
+        latitude=row.latitude,
+        longitude=row.longitude,
+    )
+    port.id = row.id
+    return port
+
 def domain_to_orm(port: Port) -> PortORM:
     # NO seteamos el id; SQLAlchemy lo gestiona en INSERT
     return PortORM(
@@ -28,4 +99,4 @@ def domain_to_orm(port: Port) -> PortORM:
         country=port.country,
         latitude=port.latitude,
         longitude=port.longitude,
-    )
\ No newline at end of file
+    )
@@ -0,0 +1,133 @@
+import asyncio
+import json
+import logging
+from typing import Callable, List, Optional, Set
+
+import asyncpg
+
+from app.ports.domain.models import PortChange
+
+logger = logging.getLogger(__name__)
+
+PORTS_CHANNEL = "ports_changed"
+
+
+def parse_port_changes(payload: str) -> List[PortChange]:
+    # Un NOTIFY por sentencia: {"op", "rows": [...]} o, si no cabe, {"op", "count"}
+    data = json.loads(payload)
+    op = data["op"]
+    if "id" in data:
+        # Formato anterior, una fila por NOTIFY
+        rows = [data]
+    elif "rows" in data:
+        rows = data["rows"]
+    else:
+        return [PortChange(op=op, id=None, count=int(data["count"]))]
+    return [
+        PortChange(
+            op=op,
+            id=row["id"],
+            name=row.get("name"),
+            country=row.get("country"),
+            latitude=row.get("latitude"),
+            longitude=row.get("longitude"),
+        )
+        for row in rows
+    ]
+
+
+class PortChangeBroadcaster:
+    # Reparte los cambios a los suscriptores (streams SSE) de este worker
+    def __init__(self, queue_size: int = 100):
+        self.queue_size = queue_size
+        self._subscribers: Set[asyncio.Queue] = set()
+
+    def subscribe(self) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        self._subscribers.discard(queue)
+
+    def publish(self, change: PortChange) -> None:
+        for queue in self._subscribers:
+            if queue.full():
+                # Un cliente lento pierde el cambio más antiguo, no bloquea al resto
+                queue.get_nowait()
+            queue.put_nowait(change)
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+
+class PortChangeListener:
+    # Conexión asyncpg dedicada con LISTEN; se reconecta si la conexión cae
+    def __init__(
+        self,
+        dsn: str,
+        on_change: Callable[[PortChange], None],
+        on_reconnect: Optional[Callable[[], None]] = None,
+        reconnect_delay: float = 1.0,
+        max_reconnect_delay: float = 30.0,
+    ):
+        self.dsn = dsn
+        self.on_change = on_change
+        self.on_reconnect = on_reconnect
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def handle_notification(self, connection, pid, channel, payload) -> None:
+        try:
+            changes = parse_port_changes(payload)
+        except (ValueError, KeyError, TypeError):
+            logger.warning("Ignoring malformed %s payload: %r", channel, payload)
+            return
+        for change in changes:
+            self.on_change(change)
+
+    async def _run(self) -> None:
+        delay = self.reconnect_delay
+        connected_before = False
+        while True:
+            try:
+                connection = await asyncpg.connect(self.dsn)
+            except (OSError, asyncpg.PostgresError) as e:
+                logger.warning("Port change listener cannot connect: %s", e)
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.max_reconnect_delay)
+                continue
+
+            closed = asyncio.Event()
+            connection.add_termination_listener(lambda _: closed.set())
+            try:
+                await connection.add_listener(PORTS_CHANNEL, self.handle_notification)
+                # Tras una reconexión se han podido perder cambios: se vacían las cachés
+                if connected_before and self.on_reconnect is not None:
+                    self.on_reconnect()
+                connected_before = True
+                delay = self.reconnect_delay
+                await closed.wait()
+                logger.warning("Port change listener connection lost, reconnecting")
+            except (OSError, asyncpg.PostgresError, asyncpg.InterfaceError) as e:
+                logger.warning("Port change listener failed: %s", e)
+                await asyncio.sleep(delay)
+            finally:
+                if not connection.is_closed():
+                    await connection.close()
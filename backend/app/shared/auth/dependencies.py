@@ -3,17 +3,39 @@ from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError
 from app.shared.auth.jwt_service import JWTService
 from app.shared.config import settings
+from app.users.api.dependencies import get_user_repository
+from app.users.application.repositories import UserRepositoryABC
+from app.users.application.use_cases.change_password import ChangePasswordUseCase
+from app.users.application.use_cases.delete_user import DeleteUserUseCase
+from app.users.domain.models import User
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="users/login")
 
-jwt_service = JWTService(secret_key=JWT_SECRET_KEY)
+jwt_service = JWTService(secret_key=settings.JWT_SECRET_KEY, cache_size=settings.JWT_CACHE_SIZE)
 
-def get_current_user(token: str = Depends(oauth2_scheme)):
+async def get_current_user(
+    token: str = Depends(oauth2_scheme),
+    user_repo: UserRepositoryABC = Depends(get_user_repository),
+) -> User:
     try:
         payload = jwt_service.decode_token(token)
-        user_id: str = payload.get("sub")
-        if user_id is None:
-            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
-        # Aquí podrías recuperar el usuario de la base de datos si quieres
-        return user_id
-    except JWTError:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
\ No newline at end of file
+        user_id = int(payload.get("sub"))
+    except (JWTError, TypeError, ValueError):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+    # Resuelto desde la caché de usuarios; solo va a la base en un fallo o al caducar
+    user = await user_repo.get_user_by_id(user_id)
+    if user is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+    return user
+
+
+# Cambiar la contraseña o borrar el usuario revoca sus tokens en este worker
+def get_change_password_use_case(
+    user_repo: UserRepositoryABC = Depends(get_user_repository),
+) -> ChangePasswordUseCase:
+    return ChangePasswordUseCase(user_repo, jwt_service.revoke_subject)
+
+
+def get_delete_user_use_case(
+    user_repo: UserRepositoryABC = Depends(get_user_repository),
+) -> DeleteUserUseCase:
+    return DeleteUserUseCase(user_repo, jwt_service.revoke_subject)
@@ -1,16 +1,35 @@
-from datetime import datetime, timedelta, timezone
-from typing import Optional, Dict, Any
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Any, Optional, Set, Tuple
 from jose import jwt, JWTError, ExpiredSignatureError
 
 class JWTService:
-    def __init__(self, secret_key: str, algorithm: str = "HS256", access_token_expire_minutes: int = 30):
+    def __init__(
+        self,
+        secret_key: str,
+        algorithm: str = "HS256",
+        access_token_expire_minutes: int = 30,
+        cache_size: int = 1024,
+        clock: Callable[[], float] = time.time,
+    ):
         self.secret_key = secret_key
         self.algorithm = algorithm
         self.access_token_expire_minutes = access_token_expire_minutes
+        # Payloads ya verificados, indexados por sha256 del token; cache_size=0 la desactiva
+        self.cache_size = cache_size
+        self._clock = clock
+        self._cache: "OrderedDict[bytes, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._keys_by_subject: Dict[str, Set[bytes]] = {}
+        self._revoked_subjects: Dict[str, float] = {}
+        self.cache_hits = 0
+        self.cache_misses = 0
 
     def create_access_token(self, subject: str, additional_claims: Optional[Dict[str, Any]] = None) -> str:
-        now = datetime.now(timezone.utc)
-        expire = now + timedelta(minutes=self.access_token_expire_minutes)
+        # iat con fracción de segundo (NumericDate admite decimales): la revocación distingue
+        # los tokens emitidos antes y después de ella dentro del mismo segundo
+        now = self._clock()
+        expire = now + self.access_token_expire_minutes * 60
 
         payload = {
             "sub": subject,
@@ -24,16 +43,79 @@ class JWTService:
         return token
 
     def decode_token(self, token: str) -> Dict[str, Any]:
+        key = hashlib.sha256(token.encode("utf-8")).digest()
+        entry = self._cache.get(key)
+        if entry is not None:
+            expires_at, payload = entry
+            if expires_at > self._clock():
+                self._cache.move_to_end(key)
+                self.cache_hits += 1
+                return dict(payload)
+            # Caducado: se descarta y jose devuelve el error de expiración
+            self._evict(key)
+        self.cache_misses += 1
+
         try:
-            payload = jwt.decode(token, self.secret_key, algorithms=[self.algorithm])
-            return payload
-        except ExpiredSignatureError as e:
-            raise ExpiredSignatureError("Token has expired") from e
+            # La caducidad se comprueba con self._clock, el mismo reloj que usa la caché
+            payload = jwt.decode(
+                token, self.secret_key, algorithms=[self.algorithm], options={"verify_exp": False}
+            )
         except JWTError as e:
             raise JWTError("Invalid token") from e
+        expires_at = payload.get("exp")
+        if expires_at is not None and float(expires_at) <= self._clock():
+            raise ExpiredSignatureError("Token has expired")
+
+        if self._is_revoked(payload):
+            raise JWTError("Token has been revoked")
+        self._store(key, payload)
+        return payload
 
     def verify_token(self, token: str, subject: Optional[str] = None) -> bool:
         payload = self.decode_token(token)
         if subject and payload.get("sub") != subject:
             raise JWTError("Token subject mismatch")
-        return True
\ No newline at end of file
+        return True
+
+    def revoke_subject(self, subject: str) -> None:
+        # Los tokens emitidos hasta este momento para el sujeto dejan de ser válidos.
+        # Límite conocido: la revocación vive en memoria de este proceso. Los demás workers
+        # no se enteran y siguen aceptando esos tokens hasta su exp (como mucho
+        # access_token_expire_minutes); para cortarlos en todos hace falta estado compartido.
+        now = self._clock()
+        self._revoked_subjects[subject] = now
+        for key in list(self._keys_by_subject.get(subject, ())):
+            self._evict(key)
+        # Pasado el tiempo de vida de un token, la revocación ya no hace falta
+        max_age = self.access_token_expire_minutes * 60
+        for revoked_subject, revoked_at in list(self._revoked_subjects.items()):
+            if revoked_at + max_age < now:
+                del self._revoked_subjects[revoked_subject]
+
+    def _is_revoked(self, payload: Dict[str, Any]) -> bool:
+        revoked_at = self._revoked_subjects.get(payload.get("sub"))
+        # <=: un token con iat en segundos enteros (de otro emisor) del segundo de la revocación
+        # se da por revocado; los nuestros llevan fracción y quedan a un lado u otro
+        return revoked_at is not None and float(payload.get("iat", 0)) <= revoked_at
+
+    def _store(self, key: bytes, payload: Dict[str, Any]) -> None:
+        expires_at = payload.get("exp")
+        if self.cache_size <= 0 or expires_at is None:
+            return
+        self._cache[key] = (float(expires_at), dict(payload))
+        subject = payload.get("sub")
+        if subject is not None:
+            self._keys_by_subject.setdefault(subject, set()).add(key)
+        while len(self._cache) > self.cache_size:
+            self._evict(next(iter(self._cache)))
+
+    def _evict(self, key: bytes) -> None:
+        entry = self._cache.pop(key, None)
+        if entry is None:
+            return
+        subject = entry[1].get("sub")
+        keys = self._keys_by_subject.get(subject)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_subject[subject]
@@ -1,6 +1,7 @@
 from pydantic_settings import BaseSettings
 from pydantic import ConfigDict
 from pathlib import Path
+from typing import List
 
 class Settings(BaseSettings):
     POSTGRES_USER: str
@@ -10,6 +11,50 @@ class Settings(BaseSettings):
     POSTGRES_DB: str
     
     JWT_SECRET_KEY: str
+    JWT_CACHE_SIZE: int = 4096
+
+    PRINCIPAL_CACHE_MAX_ENTRIES: int = 10000
+    PRINCIPAL_CACHE_TTL_SECONDS: float = 30.0
+
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_PENDING: int = 32
+
+    DB_ECHO: bool = False
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_STATEMENT_CACHE_SIZE: int = 100
+
+    DB_REPLICA_URLS: List[str] = []
+    DB_REPLICA_STRATEGY: str = "round_robin"
+    DB_REPLICA_MAX_LAG_SECONDS: float = 5.0
+    DB_REPLICA_HEALTHCHECK_SECONDS: float = 10.0
+    # Una réplica que no contesta en este tiempo se da por caída
+    DB_REPLICA_HEALTHCHECK_TIMEOUT_SECONDS: float = 2.0
+    # Vida de la cookie de leer-lo-propio y espera antes de repetir una invalidación de caché;
+    # debe cubrir el retraso admitido (DB_REPLICA_MAX_LAG_SECONDS) más el intervalo entre comprobaciones
+    DB_REPLICA_READ_YOUR_WRITES_SECONDS: float = 15.0
+
+    PORT_CACHE_MAX_ENTRIES: int = 10000
+    PORT_CACHE_TTL_SECONDS: float = 300.0
+    PORT_CACHE_MAX_LIST_SIZE: int = 100000
+
+    PORT_TILE_CACHE_MAX_ENTRIES: int = 4096
+    PORT_TILE_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    PORT_TILE_CACHE_TTL_SECONDS: float = 300.0
+
+    PORT_SEARCH_PREFIX_INDEX_ENABLED: bool = True
+    PORT_SEARCH_PREFIX_INDEX_TTL_SECONDS: float = 300.0
+
+    PORT_CHANGES_LISTENER_ENABLED: bool = True
+
+    PORT_READ_COALESCING_ENABLED: bool = True
+
+    # Índices puerto -> celdas de la ingesta de rejillas, reutilizados entre ejecuciones
+    FORECAST_GRID_INDEX_DIR: str = ".cache/port_cell_index"
 
     @property
     def database_url(self) -> str:
@@ -18,6 +63,11 @@ class Settings(BaseSettings):
             f"{self.POSTGRES_SERVER}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
         )
 
+    @property
+    def asyncpg_dsn(self) -> str:
+        # asyncpg.connect no entiende el prefijo "+asyncpg" de SQLAlchemy
+        return self.database_url.replace("+asyncpg", "")
+
     model_config = ConfigDict(env_file=Path(__file__).resolve().parents[3] / ".env")
 
 
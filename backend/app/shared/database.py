@@ -1,5 +1,103 @@
-from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
-from app.shared.config import settings
+import time
+from dataclasses import dataclass
+from typing import Any, Dict
 
-engine = create_async_engine(settings.database_url, echo=True)
+from sqlalchemy import exc
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine, async_sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from app.shared.config import Settings, settings
+from app.shared.replicas import ReplicaSet, RoutingSession
+
+
+@dataclass
+class PoolWaitStats:
+    acquisitions: int = 0
+    waiting: int = 0
+    timeouts: int = 0
+    total_wait_seconds: float = 0.0
+    max_wait_seconds: float = 0.0
+
+
+class PoolWaitStatsMixin:
+    # Mide cuánto espera cada petición para obtener una conexión del pool
+    def __init__(self, *args, max_overflow: int = 10, **kwargs):
+        super().__init__(*args, max_overflow=max_overflow, **kwargs)
+        # El valor configurado (engine_options), para no leer el atributo privado del pool
+        self.max_overflow = max_overflow
+        self.wait_stats = PoolWaitStats()
+
+    def connect(self):
+        stats = self.wait_stats
+        stats.waiting += 1
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            # Los timeouts no son adquisiciones ni entran en la media de espera
+            stats.timeouts += 1
+            raise
+        finally:
+            stats.waiting -= 1
+        elapsed = time.perf_counter() - start
+        stats.acquisitions += 1
+        stats.total_wait_seconds += elapsed
+        stats.max_wait_seconds = max(stats.max_wait_seconds, elapsed)
+        return connection
+
+
+class InstrumentedAsyncQueuePool(PoolWaitStatsMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def engine_options(config: Settings) -> Dict[str, Any]:
+    return {
+        "echo": config.DB_ECHO,
+        "poolclass": InstrumentedAsyncQueuePool,
+        "pool_size": config.DB_POOL_SIZE,
+        "max_overflow": config.DB_MAX_OVERFLOW,
+        "pool_timeout": config.DB_POOL_TIMEOUT,
+        "pool_recycle": config.DB_POOL_RECYCLE,
+        "pool_pre_ping": config.DB_POOL_PRE_PING,
+        "connect_args": {"prepared_statement_cache_size": config.DB_STATEMENT_CACHE_SIZE},
+    }
+
+
+def pool_stats(engine: AsyncEngine) -> Dict[str, Any]:
+    pool = engine.pool
+    stats: Dict[str, Any] = {}
+    if isinstance(pool, QueuePool):
+        stats.update(
+            size=pool.size(),
+            checked_out=pool.checkedout(),
+            checked_in=pool.checkedin(),
+            overflow=max(pool.overflow(), 0),
+        )
+    wait_stats = getattr(pool, "wait_stats", None)
+    if wait_stats is not None:
+        stats["max_overflow"] = pool.max_overflow
+        acquisitions = wait_stats.acquisitions
+        stats.update(
+            acquisitions=acquisitions,
+            waiting=wait_stats.waiting,
+            timeouts=wait_stats.timeouts,
+            avg_wait_ms=(wait_stats.total_wait_seconds / acquisitions * 1000.0) if acquisitions else 0.0,
+            max_wait_ms=wait_stats.max_wait_seconds * 1000.0,
+        )
+    return stats
+
+
+engine = create_async_engine(settings.database_url, **engine_options(settings))
 async_session_factory = async_sessionmaker(engine, expire_on_commit=False)
+
+# Réplicas de solo lectura; sin DB_REPLICA_URLS todo va al primario
+replica_set = ReplicaSet(
+    [create_async_engine(url, **engine_options(settings)) for url in settings.DB_REPLICA_URLS],
+    settings.DB_REPLICA_STRATEGY,
+)
+routing_session_factory = async_sessionmaker(
+    engine,
+    expire_on_commit=False,
+    sync_session_class=RoutingSession,
+    primary=engine,
+    replicas=replica_set,
+)
@@ -2,9 +2,14 @@ from typing import AsyncGenerator
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import Depends
 
-from app.shared.database import async_session_factory
+from app.shared.database import async_session_factory, routing_session_factory
 
 # Esta función genera una sesión de base de datos que se inyectará en los endpoints
 async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
     async with async_session_factory() as session:
-        yield session
\ No newline at end of file
+        yield session
+
+# Igual que get_db_session, pero las lecturas van a las réplicas hasta la primera escritura
+async def get_routing_db_session() -> AsyncGenerator[AsyncSession, None]:
+    async with routing_session_factory() as session:
+        yield session
@@ -0,0 +1,25 @@
+from typing import Any, Dict, List
+
+from fastapi import APIRouter
+
+from app.shared.database import engine, pool_stats, replica_set
+
+router = APIRouter(prefix="/metrics", tags=["metrics"])
+
+
+@router.get("/db-pool", response_model=Dict[str, Any])
+async def db_pool_metrics():
+    return pool_stats(engine)
+
+
+@router.get("/db-replicas", response_model=List[Dict[str, Any]])
+async def db_replica_metrics():
+    return [
+        {
+            "index": index,
+            "healthy": replica in replica_set.healthy,
+            "lag_seconds": replica_set.lag_seconds.get(index),
+            **pool_stats(replica),
+        }
+        for index, replica in enumerate(replica_set.engines)
+    ]
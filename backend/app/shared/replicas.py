@@ -0,0 +1,199 @@
+import asyncio
+import itertools
+import logging
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import Select, TextClause, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.orm import Session
+from starlette.middleware.base import BaseHTTPMiddleware
+
+logger = logging.getLogger(__name__)
+
+ROUND_ROBIN = "round_robin"
+LEAST_CONNECTIONS = "least_connections"
+
+# Opción de ejecución para text(): la sentencia es una lectura y puede ir a una réplica
+REPLICA_READ = "replica_read"
+
+# Cookie con la posición del WAL (LSN como entero) de la última escritura del cliente
+READ_AFTER_LSN_COOKIE = "db_lsn"
+
+# Segundos de retraso de la réplica (0 si ya ha aplicado todo lo recibido) y LSN aplicado
+REPLICA_STATUS_SQL = text(
+    """
+    SELECT CASE
+               WHEN NOT pg_is_in_recovery() THEN 0
+               WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+               ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+           END AS lag,
+           CASE
+               WHEN pg_is_in_recovery() THEN pg_last_wal_replay_lsn() - '0/0'::pg_lsn
+               ELSE pg_current_wal_lsn() - '0/0'::pg_lsn
+           END AS replay_lsn
+    """
+)
+
+# Posición del WAL en el primario; tras un commit incluye ya esa transacción
+CURRENT_LSN_SQL = text("SELECT pg_current_wal_lsn() - '0/0'::pg_lsn")
+
+
+@dataclass
+class ReadPosition:
+    # min_lsn: lo que el cliente ya ha escrito (cookie); written_lsn: lo escrito en esta petición
+    min_lsn: int = 0
+    written_lsn: Optional[int] = None
+
+
+read_position: ContextVar[Optional[ReadPosition]] = ContextVar("read_position", default=None)
+
+
+def parse_lsn(value: Optional[str]) -> int:
+    try:
+        return max(int(value), 0) if value else 0
+    except ValueError:
+        return 0
+
+
+class ReplicaSet:
+    def __init__(self, engines: List[AsyncEngine], strategy: str = ROUND_ROBIN):
+        if strategy not in (ROUND_ROBIN, LEAST_CONNECTIONS):
+            raise ValueError(f"Unknown replica strategy: {strategy}")
+        self.engines = engines
+        self.strategy = strategy
+        self.healthy: List[AsyncEngine] = list(engines)
+        self.lag_seconds: Dict[int, Optional[float]] = {}
+        # LSN aplicado por cada réplica en la última comprobación
+        self.replay_lsn: Dict[AsyncEngine, int] = {}
+        self._counter = itertools.count()
+        self._task: Optional[asyncio.Task] = None
+
+    def choose(self, min_lsn: int = 0) -> Optional[AsyncEngine]:
+        candidates = self.healthy
+        if min_lsn:
+            # Leer lo propio: solo réplicas que ya han aplicado la última escritura del cliente.
+            # El LSN es el de la última comprobación, así que el filtro peca de prudente
+            candidates = [engine for engine in candidates if self.replay_lsn.get(engine, 0) >= min_lsn]
+        if not candidates:
+            return None
+        if self.strategy == LEAST_CONNECTIONS:
+            return min(candidates, key=lambda engine: engine.pool.checkedout())
+        return candidates[next(self._counter) % len(candidates)]
+
+    async def check_health(self, max_lag_seconds: float, timeout_seconds: float) -> None:
+        # Todas a la vez y con límite de tiempo: una réplica colgada no retrasa la comprobación
+        # del resto, y la que no responde a tiempo sale de la rotación
+        results = await asyncio.gather(
+            *(asyncio.wait_for(self._probe(engine), timeout_seconds) for engine in self.engines),
+            return_exceptions=True,
+        )
+        healthy = []
+        for index, (engine, result) in enumerate(zip(self.engines, results)):
+            lag = None
+            if isinstance(result, asyncio.TimeoutError):
+                logger.warning("Replica %d did not answer within %.1fs", index, timeout_seconds)
+            elif isinstance(result, Exception):
+                logger.warning("Replica %d unreachable: %s", index, result)
+            else:
+                lag, self.replay_lsn[engine] = result
+            self.lag_seconds[index] = lag
+            if lag is not None and lag <= max_lag_seconds:
+                healthy.append(engine)
+            elif lag is not None:
+                logger.warning("Replica %d lagging %.1fs, removed from rotation", index, lag)
+        self.healthy = healthy
+
+    @staticmethod
+    async def _probe(engine: AsyncEngine) -> Tuple[float, int]:
+        async with engine.connect() as connection:
+            status = (await connection.execute(REPLICA_STATUS_SQL)).one()
+        return float(status.lag), int(status.replay_lsn or 0)
+
+    async def start(self, interval_seconds: float, max_lag_seconds: float, timeout_seconds: float) -> None:
+        if self._task is None and self.engines:
+            self._task = asyncio.create_task(self._run(interval_seconds, max_lag_seconds, timeout_seconds))
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self, interval_seconds: float, max_lag_seconds: float, timeout_seconds: float) -> None:
+        while True:
+            await self.check_health(max_lag_seconds, timeout_seconds)
+            await asyncio.sleep(interval_seconds)
+
+
+def is_replica_read(clause) -> bool:
+    if isinstance(clause, Select):
+        return clause._for_update_arg is None
+    # Un text() puede escribir (p. ej. WITH ... DELETE): solo va a réplica si se marca como lectura
+    if isinstance(clause, TextClause):
+        return bool(clause.get_execution_options().get(REPLICA_READ, False))
+    return False
+
+
+class RoutingSession(Session):
+    # SELECTs a una réplica; cualquier escritura (o sentencia que no sea SELECT)
+    # fija la sesión al primario para que la petición lea lo que acaba de escribir
+    def __init__(self, *args, primary: AsyncEngine, replicas: ReplicaSet, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.primary = primary
+        self.replicas = replicas
+        self.pinned_to_primary = False
+        self._replica: Optional[AsyncEngine] = None
+        self._routed = False
+
+    def get_bind(self, mapper=None, *, clause=None, **kwargs):
+        if not self.pinned_to_primary and not self._flushing:
+            if is_replica_read(clause):
+                # Se elige una sola vez por sesión (réplica o primario): todas las lecturas
+                # ven la misma instantánea
+                if not self._routed:
+                    position = read_position.get()
+                    self._replica = self.replicas.choose(position.min_lsn if position else 0)
+                    self._routed = True
+                if self._replica is not None:
+                    return self._replica.sync_engine
+                return self.primary.sync_engine
+        self.pinned_to_primary = True
+        return self.primary.sync_engine
+
+    def commit(self) -> None:
+        super().commit()
+        position = read_position.get()
+        if self.pinned_to_primary and position is not None:
+            # Va en la cookie de la respuesta: las siguientes lecturas de este cliente
+            # esperan (en el primario) a que alguna réplica haya aplicado este commit
+            position.written_lsn = int(self.scalar(CURRENT_LSN_SQL))
+
+
+class ReadYourWritesMiddleware(BaseHTTPMiddleware):
+    # Lee lo propio por cliente en lugar de mandar todo el worker al primario tras cada escritura
+    def __init__(self, app, max_age_seconds: float):
+        super().__init__(app)
+        self.max_age_seconds = max_age_seconds
+
+    async def dispatch(self, request, call_next):
+        position = ReadPosition(min_lsn=parse_lsn(request.cookies.get(READ_AFTER_LSN_COOKIE)))
+        token = read_position.set(position)
+        try:
+            response = await call_next(request)
+        finally:
+            read_position.reset(token)
+        if position.written_lsn is not None:
+            response.set_cookie(
+                READ_AFTER_LSN_COOKIE,
+                str(max(position.written_lsn, position.min_lsn)),
+                max_age=int(self.max_age_seconds),
+                httponly=True,
+                samesite="lax",
+            )
+        return response
@@ -0,0 +1,20 @@
+from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.shared.config import settings
+from app.shared.dependencies import get_db_session
+from app.users.application.principal_cache import CachingUserRepository, PrincipalCache
+from app.users.application.repositories import UserRepositoryABC
+from app.users.infrastructure.repositories import UserRepository
+
+# Compartida por todas las peticiones del worker
+principal_cache = PrincipalCache(
+    max_entries=settings.PRINCIPAL_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+)
+
+
+def get_user_repository(
+    db: AsyncSession = Depends(get_db_session),
+) -> UserRepositoryABC:
+    return CachingUserRepository(UserRepository(db), principal_cache)
@@ -0,0 +1,89 @@
+import dataclasses
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, List, Optional, Tuple
+
+from app.shared.singleflight import SingleFlight
+from app.users.application.repositories import UserRepositoryABC
+from app.users.domain.models import User
+
+
+class PrincipalCache:
+    # Usuarios ya resueltos para get_current_user; TTL corto porque otros workers no la invalidan
+    def __init__(self, max_entries: int, ttl_seconds: float, clock: Callable[[], float] = time.monotonic):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: "OrderedDict[int, Tuple[float, User]]" = OrderedDict()
+        self._flight = SingleFlight()
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    async def get_or_load(
+        self, user_id: int, loader: Callable[[int], Awaitable[Optional[User]]]
+    ) -> Optional[User]:
+        entry = self._entries.get(user_id)
+        if entry is not None and entry[0] > self._clock():
+            self._entries.move_to_end(user_id)
+            self.hits += 1
+            return dataclasses.replace(entry[1])
+        self.misses += 1
+
+        async def load() -> Optional[User]:
+            generation = self.generation
+            user = await loader(user_id)
+            if user is not None and generation == self.generation:
+                self._store(user)
+            return user
+
+        user = await self._flight.do(user_id, load)
+        # Copia: los casos de uso modifican el usuario (p. ej. ChangePasswordUseCase)
+        return dataclasses.replace(user) if user is not None else None
+
+    def invalidate(self, user_id: int) -> None:
+        self.generation += 1
+        self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        self.generation += 1
+        self._entries.clear()
+
+    def _store(self, user: User) -> None:
+        self._entries[user.id] = (self._clock() + self.ttl_seconds, user)
+        self._entries.move_to_end(user.id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+class CachingUserRepository(UserRepositoryABC):
+    # Las escrituras de UpdateUser, ChangePassword y DeleteUser pasan por aquí e invalidan
+    def __init__(self, inner: UserRepositoryABC, cache: PrincipalCache):
+        self.inner = inner
+        self.cache = cache
+
+    async def create_user(self, user: User) -> User:
+        return await self.inner.create_user(user)
+
+    async def get_user_by_id(self, user_id: int) -> Optional[User]:
+        return await self.cache.get_or_load(user_id, self.inner.get_user_by_id)
+
+    async def get_user_by_username(self, username: str) -> Optional[User]:
+        return await self.inner.get_user_by_username(username)
+
+    async def update_user(self, user: User) -> User:
+        self.cache.invalidate(user.id)
+        try:
+            return await self.inner.update_user(user)
+        finally:
+            self.cache.invalidate(user.id)
+
+    async def delete_user(self, user_id: int) -> None:
+        self.cache.invalidate(user_id)
+        try:
+            await self.inner.delete_user(user_id)
+        finally:
+            self.cache.invalidate(user_id)
+
+    async def list_users(self, after_id: Optional[int] = None, limit: int = 100) -> List[User]:
+        return await self.inner.list_users(after_id=after_id, limit=limit)
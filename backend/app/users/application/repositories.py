@@ -24,5 +24,5 @@ class UserRepositoryABC(ABC):
         ...
 
     @abstractmethod
-    async def list_users(self) -> List[User]:
+    async def list_users(self, after_id: Optional[int] = None, limit: int = 100) -> List[User]:
         ...
\ No newline at end of file
@@ -1,9 +1,13 @@
+from typing import Callable, Optional
+
 from app.users.application.repositories import UserRepositoryABC
 from app.users.domain.models import User
 
 class ChangePasswordUseCase:
-    def __init__(self, user_repo: UserRepositoryABC):
+    def __init__(self, user_repo: UserRepositoryABC, revoke_tokens: Optional[Callable[[str], None]] = None):
         self.user_repo = user_repo
+        # Invalida los tokens ya emitidos para el usuario (JWTService.revoke_subject)
+        self.revoke_tokens = revoke_tokens
 
     async def execute(self, user_id: int, new_password_hash: str, requester: User) -> User:
         if not requester.is_admin and requester.id != user_id:
@@ -14,4 +18,7 @@ class ChangePasswordUseCase:
             raise ValueError("Usuario no encontrado")
         
         user.hashed_password = new_password_hash
-        return await self.user_repo.update_user(user)
\ No newline at end of file
+        updated = await self.user_repo.update_user(user)
+        if self.revoke_tokens is not None:
+            self.revoke_tokens(str(user_id))
+        return updated
\ No newline at end of file
@@ -1,11 +1,17 @@
+from typing import Callable, Optional
+
 from app.users.application.repositories import UserRepositoryABC
 from app.users.domain.models import User
 
 class DeleteUserUseCase:
-    def __init__(self, user_repo: UserRepositoryABC):
+    def __init__(self, user_repo: UserRepositoryABC, revoke_tokens: Optional[Callable[[str], None]] = None):
         self.user_repo = user_repo
+        # Invalida los tokens ya emitidos para el usuario (JWTService.revoke_subject)
+        self.revoke_tokens = revoke_tokens
 
     async def execute(self, user_id: int, requester: User) -> None:
         if not requester.is_admin:
             raise PermissionError("Solo admin puede borrar usuarios")
-        await self.user_repo.delete_user(user_id)
\ No newline at end of file
+        await self.user_repo.delete_user(user_id)
+        if self.revoke_tokens is not None:
+            self.revoke_tokens(str(user_id))
\ No newline at end of file
@@ -1,4 +1,4 @@
-from typing import List
+from typing import List, Optional
 from app.users.application.repositories import UserRepositoryABC
 from app.users.domain.models import User
 
@@ -6,7 +6,7 @@ class ListUsersUseCase:
     def __init__(self, user_repo: UserRepositoryABC):
         self.user_repo = user_repo
 
-    async def execute(self, requester: User) -> List[User]:
+    async def execute(self, requester: User, after_id: Optional[int] = None, limit: int = 100) -> List[User]:
         if not requester.is_admin:
             raise PermissionError("Solo admin puede listar usuarios")
-        return await self.user_repo.list_users()
\ No newline at end of file
+        return await self.user_repo.list_users(after_id=after_id, limit=limit)
\ No newline at end of file
@@ -0,0 +1,38 @@
+from sqlalchemy import Boolean, Column, Index, Integer, String
+from app.ports.infrastructure.base import Base
+from app.users.domain.models import User
+
+class UserORM(Base):
+    __tablename__ = "users"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    username = Column(String, nullable=False)
+    email = Column(String, nullable=False)
+    hashed_password = Column(String, nullable=False)
+    is_admin = Column(Boolean, nullable=False, default=False)
+    is_employee = Column(Boolean, nullable=False, default=False)
+
+    # Índices únicos: el login busca por username con una sola lectura de índice
+    __table_args__ = (
+        Index("ix_users_username", "username", unique=True),
+        Index("ix_users_email", "email", unique=True),
+    )
+
+USER_COLUMNS = (
+    UserORM.id,
+    UserORM.username,
+    UserORM.email,
+    UserORM.hashed_password,
+    UserORM.is_admin,
+    UserORM.is_employee,
+)
+
+def row_to_domain(row) -> User:
+    return User(
+        id=row.id,
+        username=row.username,
+        email=row.email,
+        hashed_password=row.hashed_password,
+        is_admin=row.is_admin,
+        is_employee=row.is_employee,
+    )
@@ -0,0 +1,82 @@
+from typing import List, Optional
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.users.application.repositories import UserRepositoryABC
+from app.users.domain.models import User
+from app.users.infrastructure.models import USER_COLUMNS, UserORM, row_to_domain
+
+class UserRepository(UserRepositoryABC):
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def create_user(self, user: User) -> User:
+        # El id lo genera la base; el del usuario de entrada se ignora
+        stmt = (
+            insert(UserORM)
+            .values(
+                username=user.username,
+                email=user.email,
+                hashed_password=user.hashed_password,
+                is_admin=user.is_admin,
+                is_employee=user.is_employee,
+            )
+            .returning(*USER_COLUMNS)
+        )
+        try:
+            result = await self.session.execute(stmt)
+            row = result.one()
+            await self.session.commit()
+        except IntegrityError as e:
+            await self.session.rollback()
+            raise ValueError("El nombre de usuario o el email ya existen") from e
+        return row_to_domain(row)
+
+    async def get_user_by_id(self, user_id: int) -> Optional[User]:
+        result = await self.session.execute(select(*USER_COLUMNS).where(UserORM.id == user_id))
+        row = result.first()
+        return row_to_domain(row) if row else None
+
+    async def get_user_by_username(self, username: str) -> Optional[User]:
+        result = await self.session.execute(select(*USER_COLUMNS).where(UserORM.username == username))
+        row = result.first()
+        return row_to_domain(row) if row else None
+
+    async def update_user(self, user: User) -> User:
+        stmt = (
+            update(UserORM)
+            .where(UserORM.id == user.id)
+            .values(
+                username=user.username,
+                email=user.email,
+                hashed_password=user.hashed_password,
+                is_admin=user.is_admin,
+                is_employee=user.is_employee,
+            )
+            .returning(*USER_COLUMNS)
+            .execution_options(synchronize_session=False)
+        )
+        try:
+            result = await self.session.execute(stmt)
+            row = result.first()
+            await self.session.commit()
+        except IntegrityError as e:
+            await self.session.rollback()
+            raise ValueError("El nombre de usuario o el email ya existen") from e
+        if row is None:
+            raise ValueError("Usuario no encontrado")
+        return row_to_domain(row)
+
+    async def delete_user(self, user_id: int) -> None:
+        stmt = delete(UserORM).where(UserORM.id == user_id).execution_options(synchronize_session=False)
+        await self.session.execute(stmt)
+        await self.session.commit()
+
+    async def list_users(self, after_id: Optional[int] = None, limit: int = 100) -> List[User]:
+        # Paginación por clave sobre la PK
+        stmt = select(*USER_COLUMNS).order_by(UserORM.id).limit(limit)
+        if after_id is not None:
+            stmt = stmt.where(UserORM.id > after_id)
+        result = await self.session.execute(stmt)
+        return [row_to_domain(row) for row in result]
@@ -0,0 +1,64 @@
+# Uso: python -m benchmarks.bench_distance_matrix [origenes] [destinos]
+import math
+import random
+import sys
+import time
+from typing import List
+
+from app.ports.application.distances import (
+    EARTH_RADIUS_KM,
+    build_coordinates,
+    haversine_matrix,
+    vincenty_matrix,
+)
+from app.ports.domain.models import Port
+
+
+def make_ports(count: int) -> List[Port]:
+    rng = random.Random(42)
+    ports = []
+    for i in range(count):
+        port = Port(name=f"Port {i}", country="Country", latitude=rng.uniform(-70, 70), longitude=rng.uniform(-180, 180))
+        port.id = i + 1
+        ports.append(port)
+    return ports
+
+
+def python_haversine(origins: List[Port], destinations: List[Port]) -> List[List[float]]:
+    # Camino anterior: bucle por pares sobre los dataclass Port
+    rows = []
+    for a in origins:
+        lat1, lon1 = math.radians(a.latitude), math.radians(a.longitude)
+        row = []
+        for b in destinations:
+            lat2, lon2 = math.radians(b.latitude), math.radians(b.longitude)
+            h = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+            row.append(2 * EARTH_RADIUS_KM * math.asin(math.sqrt(h)))
+        rows.append(row)
+    return rows
+
+
+def timed(fn, *args, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000.0
+
+
+def main(origins: int = 1000, destinations: int = 1000) -> None:
+    ports = make_ports(max(origins, destinations))
+    coordinates = build_coordinates(ports, version=0, expires_at=float("inf"))
+    a = coordinates.radians[:origins]
+    b = coordinates.radians[:destinations]
+
+    print(f"{origins}x{destinations} pares")
+    print(f"  bucle Python:       {timed(python_haversine, ports[:origins], ports[:destinations], repeat=1):9.2f} ms")
+    print(f"  haversine NumPy:    {timed(haversine_matrix, a, b):9.2f} ms")
+    print(f"  Vincenty NumPy:     {timed(vincenty_matrix, a, b):9.2f} ms")
+
+
+if __name__ == "__main__":
+    args = [int(value) for value in sys.argv[1:3]]
+    main(*args)
@@ -0,0 +1,30 @@
+# Uso: python -m benchmarks.bench_jwt_decode [iteraciones]
+import sys
+import time
+
+from app.shared.auth.jwt_service import JWTService
+
+
+def bench(service: JWTService, token: str, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        service.decode_token(token)
+    return iterations / (time.perf_counter() - start)
+
+
+def main(iterations: int = 20000) -> None:
+    uncached = JWTService(secret_key="bench-secret", cache_size=0)
+    cached = JWTService(secret_key="bench-secret")
+    token = uncached.create_access_token("42", {"role": "admin"})
+
+    results = {
+        "sin caché": bench(uncached, token, iterations),
+        "con caché": bench(cached, token, iterations),
+    }
+    for label, ops in results.items():
+        print(f"{label:>10}: {ops:12,.0f} decodes/s")
+    print(f"{'speedup':>10}: {results['con caché'] / results['sin caché']:12.1f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
@@ -0,0 +1,56 @@
+# Uso: python -m benchmarks.bench_port_serialization [puertos]
+import json
+import sys
+import time
+from typing import List
+
+from pydantic import TypeAdapter
+
+from app.ports.api.schemas import PortRead
+from app.ports.api.serialization import ports_to_json
+from app.ports.domain.models import Port
+
+
+def make_ports(count: int) -> List[Port]:
+    ports = []
+    for i in range(count):
+        port = Port(name=f"Port {i}", country="Spain", latitude=40.0 + i * 1e-4, longitude=-3.0 - i * 1e-4)
+        port.id = i + 1
+        ports.append(port)
+    return ports
+
+
+def before(ports: List[Port], adapter: TypeAdapter) -> bytes:
+    # Camino anterior: PortRead por fila, volcado a tipos JSON y json.dumps
+    models = adapter.validate_python(ports, from_attributes=True)
+    return json.dumps(adapter.dump_python(models, mode="json")).encode("utf-8")
+
+
+def after(ports: List[Port], adapter: TypeAdapter) -> bytes:
+    return ports_to_json(ports)
+
+
+def timed(fn, ports, adapter, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(ports, adapter)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000.0
+
+
+def main(count: int = 10000) -> None:
+    ports = make_ports(count)
+    adapter = TypeAdapter(List[PortRead])
+    assert json.loads(before(ports, adapter)) == json.loads(after(ports, adapter))
+
+    before_ms = timed(before, ports, adapter)
+    after_ms = timed(after, ports, adapter)
+    print(f"{count} puertos")
+    print(f"  PortRead + json: {before_ms:8.2f} ms")
+    print(f"  orjson directo:  {after_ms:8.2f} ms")
+    print(f"  speedup:         {before_ms / after_ms:8.1f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
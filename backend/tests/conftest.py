@@ -1,5 +1,9 @@
+import asyncio
+
+import pytest
 import pytest_asyncio
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from app.ports.domain.models import Port, PortTile
 from app.shared.config import settings
 
 @pytest_asyncio.fixture  # function-scoped por defecto
@@ -15,4 +19,116 @@ async def engine():
 async def session(engine):
     async_session = async_sessionmaker(engine, expire_on_commit=False)
     async with async_session() as session:
-        yield session
\ No newline at end of file
+        yield session
+
+
+class FakeClock:
+    # Reloj manual para las cachés con TTL: el test avanza `now`
+    def __init__(self, now=0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def build_port(port_id, name=None, country="Country", latitude=1.0, longitude=2.0):
+    port = Port(name=name or f"Port {port_id}", country=country, latitude=latitude, longitude=longitude)
+    port.id = port_id
+    return port
+
+
+class FakePortService:
+    # PortService en memoria que anota las lecturas en `calls`. Con delay, cada lectura
+    # espera después de tomar sus datos para que las peticiones concurrentes se solapen.
+    def __init__(self, ports=(), delay=0.0):
+        self.ports = {p.id: p for p in ports}
+        self.delay = delay
+        self.calls = []
+        # Lo que devuelve search_ports (los trigramas de la base), sea cual sea la consulta
+        self.search_results = []
+        self.batches = []
+
+    async def _read(self, call, result):
+        self.calls.append(call)
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        return result
+
+    async def get_port_by_id(self, port_id):
+        return await self._read(("get", port_id), self.ports.get(port_id))
+
+    async def get_ports_by_ids(self, port_ids):
+        return await self._read(("batch", list(port_ids)), [self.ports.get(port_id) for port_id in port_ids])
+
+    async def list_ports(self):
+        return await self._read(("list",), list(self.ports.values()))
+
+    async def search_ports(self, query, limit):
+        return await self._read(("search", query), self.search_results[:limit])
+
+    async def get_port_tile(self, z, x, y):
+        return await self._read(("tile", z, x, y), PortTile(data=b"tile-%d-%d-%d" % (z, x, y), port_ids=[1]))
+
+    async def list_port_changes(self, after_version, after_id, limit):
+        return await self._read(("changes", after_version, after_id, limit), ([], after_version))
+
+    async def create_port(self, name, country, latitude, longitude):
+        port = build_port(max(self.ports, default=0) + 1, name, country, latitude, longitude)
+        self.ports[port.id] = port
+        return port
+
+    async def update_port(self, port_id, name=None, country=None, latitude=None, longitude=None):
+        port = self.ports.get(port_id)
+        if port is None:
+            return None
+        port = build_port(
+            port_id,
+            name or port.name,
+            country or port.country,
+            port.latitude if latitude is None else latitude,
+            port.longitude if longitude is None else longitude,
+        )
+        self.ports[port_id] = port
+        return port
+
+    async def delete_port(self, port_id):
+        self.calls.append(("delete", port_id))
+        return self.ports.pop(port_id, None) is not None
+
+    async def upsert_ports(self, ports):
+        results = []
+        for port in ports:
+            current = next((p for p in self.ports.values() if p.name == port.name), None)
+            if current and current.latitude == port.latitude:
+                results.append((current, "unchanged"))
+                continue
+            port_id = current.id if current else max(self.ports, default=0) + 1
+            saved = build_port(port_id, port.name, port.country, port.latitude, port.longitude)
+            self.ports[saved.id] = saved
+            results.append((saved, "updated" if current else "created"))
+        return results
+
+    async def bulk_create_ports(self, rows):
+        # Como la restricción única de la tabla: se rechaza la línea si el nombre ya existe
+        self.batches.append(list(rows))
+        rejected = []
+        for line_no, port in rows:
+            if any(p.name == port.name for p in self.ports.values()):
+                rejected.append(line_no)
+                continue
+            port_id = max(self.ports, default=0) + 1
+            self.ports[port_id] = build_port(port_id, port.name, port.country, port.latitude, port.longitude)
+        return rejected
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+@pytest.fixture
+def make_port():
+    return build_port
+
+@pytest.fixture
+def fake_port_service():
+    return FakePortService
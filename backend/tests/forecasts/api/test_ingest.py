@@ -0,0 +1,37 @@
+import pytest
+from app.forecasts.api.ingest import import_forecasts
+
+
+async def chunked(data, size=16):
+    for i in range(0, len(data), size):
+        yield data[i:i + size]
+
+
+class FakeForecastService:
+    def __init__(self, known_ports):
+        self.known_ports = known_ports
+        self.batches = []
+
+    async def ingest_forecasts(self, rows):
+        self.batches.append([line_no for line_no, _ in rows])
+        return [line_no for line_no, forecast in rows if forecast.port_id not in self.known_ports]
+
+
+@pytest.mark.asyncio
+async def test_import_forecasts_batches_and_rejects():
+    body = (
+        b'{"port_id": 1, "valid_time": "2026-10-18T00:00:00Z", "issued_at": "2026-10-17T12:00:00Z", "wave_height": 1.5}\n'
+        b'{"port_id": 1, "valid_time": "2026-10-18T01:00:00"}\n'
+        b'\n'
+        b'{"port_id": 9, "valid_time": "2026-10-18T00:00:00Z", "issued_at": "2026-10-17T12:00:00Z"}\n'
+        b'{"port_id": 1, "valid_time": "2026-10-18T02:00:00Z", "issued_at": "2026-10-17T12:00:00Z", "swell": 2}\n'
+        b'{"port_id": 1, "valid_time": "2026-10-18T03:00:00Z", "issued_at": "2026-10-17T12:00:00Z"}\n'
+    )
+    service = FakeForecastService(known_ports={1})
+
+    result = await import_forecasts(chunked(body), service, batch_size=2)
+
+    # Sin zona horaria, sin issued_at o con columnas desconocidas la fila se rechaza sin llegar a la base
+    assert service.batches == [[1, 4], [6]]
+    assert result.accepted == 2
+    assert result.rejected_lines == [2, 4, 5]
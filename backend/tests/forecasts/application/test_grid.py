@@ -0,0 +1,153 @@
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+from app.forecasts.application.grid import (
+    GridSpec,
+    PortCellIndexCache,
+    build_cell_index,
+    coordinate_hash,
+    open_grid,
+    sample_grid,
+)
+from app.forecasts.application.grid_ingest import GridIngestion
+
+# Rejilla de 1 grado con lon 0..359: global en longitud
+SPEC = GridSpec(lat0=-90.0, lon0=0.0, dlat=1.0, dlon=1.0, nlat=181, nlon=360)
+
+
+def linear_field(steps):
+    # Valor lineal en lat/lon: la interpolación bilineal lo reproduce exactamente
+    t, y, x = np.meshgrid(np.arange(steps), np.arange(SPEC.nlat), np.arange(SPEC.nlon), indexing="ij")
+    return (t * 1000.0 + y * 2.0 + x * 0.5).astype(np.float32)
+
+
+def test_open_grid_memory_maps_npy_and_raw(tmp_path):
+    field = linear_field(3)
+    np.save(tmp_path / "field.npy", field)
+    field.tofile(tmp_path / "field.f32")
+
+    npy = open_grid(str(tmp_path / "field.npy"), SPEC)
+    raw = open_grid(str(tmp_path / "field.f32"), SPEC)
+    assert isinstance(npy, np.memmap)
+    assert isinstance(raw, np.memmap)
+    assert raw.shape == (3, 181, 360)
+    assert np.array_equal(npy, raw)
+
+    with pytest.raises(ValueError):
+        open_grid(str(tmp_path / "field.npy"), GridSpec(-90.0, 0.0, 1.0, 1.0, 10, 10))
+
+def test_open_grid_rejects_truncated_raw_files(tmp_path):
+    data = linear_field(2).tobytes()
+    (tmp_path / "field.f32").write_bytes(data[:-4])
+
+    with pytest.raises(ValueError, match="trailing bytes"):
+        open_grid(str(tmp_path / "field.f32"), SPEC)
+
+def test_bilinear_sampling_for_all_ports_and_steps(make_port):
+    ports = [make_port(1, latitude=10.5, longitude=20.25), make_port(2, latitude=-45.0, longitude=100.75)]
+    index = build_cell_index(ports, SPEC)
+
+    sampled = sample_grid(linear_field(2), index)
+    expected = [(lat + 90) * 2.0 + lon * 0.5 for lat, lon in ((10.5, 20.25), (-45.0, 100.75))]
+    assert sampled.shape == (2, 2)
+    assert np.allclose(sampled[0], expected)
+    assert np.allclose(sampled[1], np.array(expected) + 1000.0)
+
+def test_cells_wrap_around_a_global_grid_and_skip_outside_ports(make_port):
+    regional = GridSpec(lat0=30.0, lon0=-10.0, dlat=0.5, dlon=0.5, nlat=21, nlon=21)
+    index = build_cell_index([make_port(1, latitude=35.0, longitude=-5.0), make_port(2, latitude=50.0, longitude=0.0)], regional)
+    assert index.port_ids.tolist() == [1]
+    assert index.outside_ids == (2,)
+
+    wrapped = build_cell_index([make_port(3, latitude=0.0, longitude=-0.5)], SPEC)
+    assert set(wrapped.cells[0] % SPEC.nlon) == {359, 0}
+    assert np.allclose(wrapped.weights.sum(axis=1), 1.0)
+
+def test_tiny_negative_longitude_wraps_to_first_column(make_port):
+    # np.mod(-1e-14 / 0.25, 1440) == 1440.0: sin volver a envolver, x0 se sale de la fila
+    spec = GridSpec(lat0=-90.0, lon0=0.0, dlat=0.25, dlon=0.25, nlat=721, nlon=1440)
+    index = build_cell_index([make_port(1, latitude=90.0, longitude=-1e-14), make_port(2, latitude=0.0, longitude=-1e-14)], spec)
+
+    assert index.cells.max() < spec.nlat * spec.nlon
+    # Cada puerto lee solo de su propia fila (o la siguiente), nunca de la fila de al lado por desborde
+    assert set((index.cells[1] // spec.nlon).tolist()) <= {360, 361}
+    assert np.allclose(index.weights.sum(axis=1), 1.0)
+    field = np.ones((1, spec.nlat, spec.nlon), dtype=np.float32)
+    assert np.allclose(sample_grid(field, index), 1.0)
+
+def test_missing_cells_are_ignored_and_weights_renormalized(make_port):
+    field = np.ones((1, SPEC.nlat, SPEC.nlon), dtype=np.float32)
+    field[0, 100, 20] = np.nan
+    index = build_cell_index([make_port(1, latitude=10.5, longitude=20.5), make_port(2, latitude=-80.0, longitude=5.0)], SPEC)
+
+    assert np.allclose(sample_grid(field, index), [[1.0, 1.0]])
+
+    field[0, 100:102, 20:22] = np.nan
+    assert np.isnan(sample_grid(field, index)[0, 0])
+
+def test_index_cache_rebuilds_only_when_ports_move_or_are_added(make_port):
+    cache = PortCellIndexCache()
+    ports = [make_port(1, latitude=10.0, longitude=20.0)]
+
+    first = cache.get(ports, SPEC)
+    assert cache.get([make_port(1, latitude=10.0, longitude=20.0)], SPEC) is first
+    assert cache.builds == 1
+
+    cache.get([make_port(1, latitude=10.0, longitude=21.0)], SPEC)
+    cache.get(ports + [make_port(2, latitude=0.0, longitude=0.0)], SPEC)
+    assert cache.builds == 3
+    assert coordinate_hash(ports) != coordinate_hash([make_port(1, latitude=10.0, longitude=21.0)])
+
+def test_index_cache_persists_across_runs(tmp_path, make_port):
+    ports = [make_port(1, latitude=10.5, longitude=20.25), make_port(2, latitude=95.0, longitude=0.0)]
+    first = PortCellIndexCache(directory=str(tmp_path))
+    built = first.get(ports, SPEC)
+
+    # Una ejecución nueva (caché en memoria vacía) lee el índice del disco
+    second = PortCellIndexCache(directory=str(tmp_path))
+    loaded = second.get(ports, SPEC)
+    assert (second.builds, second.loads) == (0, 1)
+    assert np.array_equal(loaded.cells, built.cells)
+    assert np.array_equal(loaded.weights, built.weights)
+    assert loaded.outside_ids == built.outside_ids == (2,)
+
+    second.get([make_port(1, latitude=10.5, longitude=21.0)], SPEC)
+    assert second.builds == 1
+
+
+class FakeForecastService:
+    def __init__(self):
+        self.calls = []
+
+    async def ingest_forecast_grid(self, port_ids, valid_times, issued_at, values):
+        self.calls.append((port_ids, list(valid_times), values))
+        return len(port_ids) * len(valid_times)
+
+
+@pytest.mark.asyncio
+async def test_grid_ingestion_sends_time_chunks_in_bulk(make_port):
+    service = FakeForecastService()
+    field = linear_field(5)
+    field[:, 100, :] = np.nan
+    start = datetime(2026, 10, 18, tzinfo=timezone.utc)
+    valid_times = [start + timedelta(hours=h) for h in range(5)]
+    ports = [make_port(1, latitude=10.0, longitude=20.0), make_port(2, latitude=45.0, longitude=10.0)]
+
+    ingestion = GridIngestion(service, PortCellIndexCache(), time_chunk=2)
+    result = await ingestion.run(ports, SPEC, {"wave_height": field}, valid_times, start)
+
+    assert result.rows == 10
+    assert [len(times) for _, times, _ in service.calls] == [2, 2, 1]
+    port_ids, _, values = service.calls[0]
+    assert port_ids == [1, 2]
+    # Puerto 1 cae en una fila sin dato: NULL en la base
+    assert values["wave_height"][0][0] is None
+    assert values["wave_height"][1][1] == pytest.approx(1000.0 + 135 * 2.0 + 10 * 0.5)
+
+@pytest.mark.asyncio
+async def test_grid_ingestion_rejects_unknown_variables():
+    ingestion = GridIngestion(FakeForecastService(), PortCellIndexCache())
+
+    with pytest.raises(ValueError):
+        await ingestion.run([], SPEC, {"swell": linear_field(1)}, [datetime.now(timezone.utc)], datetime.now(timezone.utc))
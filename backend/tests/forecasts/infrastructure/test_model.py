@@ -0,0 +1,60 @@
+from datetime import datetime, timedelta, timezone
+
+from app.forecasts.domain.models import FORECAST_VARIABLES
+from app.forecasts.infrastructure.models import ForecastORM
+from app.forecasts.infrastructure.repositories import partition_bounds, partition_name
+
+
+def test_table_is_range_partitioned_by_valid_time():
+    table = ForecastORM.__table__
+
+    assert table.name == 'port_forecasts'
+    assert table.dialect_options['postgresql']['partition_by'] == 'RANGE (valid_time)'
+    assert [col.name for col in table.primary_key.columns] == ['port_id', 'valid_time']
+
+def test_port_id_references_ports():
+    fk = next(iter(ForecastORM.__table__.c.port_id.foreign_keys))
+
+    assert fk.target_fullname == 'ports.id'
+    assert fk.ondelete == 'CASCADE'
+
+def test_variables_are_columns_and_valid_time_has_brin_index():
+    columns = ForecastORM.__table__.c
+    for variable in FORECAST_VARIABLES:
+        assert variable in columns
+
+    indexes = {index.name: index for index in ForecastORM.__table__.indexes}
+    assert indexes['ix_port_forecasts_valid_time_brin'].dialect_options['postgresql']['using'] == 'brin'
+
+def test_partition_bounds_are_utc_weeks_starting_monday():
+    # 2026-10-18 es domingo
+    start, end = partition_bounds(datetime(2026, 10, 18, 23, 30, tzinfo=timezone.utc))
+
+    assert start == datetime(2026, 10, 12, tzinfo=timezone.utc)
+    assert end - start == timedelta(days=7)
+    assert partition_name(start) == 'port_forecasts_p20261012'
+
+    # Misma hora en otra zona: cuenta la hora UTC
+    madrid = timezone(timedelta(hours=2))
+    assert partition_bounds(datetime(2026, 10, 19, 1, 0, tzinfo=madrid))[0] == start
+
+def test_rollup_tables_have_min_max_sum_count_per_variable():
+    from app.forecasts.infrastructure.models import forecast_daily, forecast_weekly
+
+    for table in (forecast_daily, forecast_weekly):
+        assert [col.name for col in table.primary_key.columns] == ['port_id', 'bucket_start']
+        for variable in FORECAST_VARIABLES:
+            for aggregate in ('min', 'max', 'sum', 'count'):
+                assert f'{variable}_{aggregate}' in table.c
+            # La media no se guarda: la semana se combina exacta desde los días
+            assert f'{variable}_mean' not in table.c
+
+def test_weekly_rollup_is_built_from_daily_rollup():
+    from sqlalchemy.dialects import postgresql
+
+    from app.forecasts.infrastructure.repositories import _REFRESH_ROLLUPS, _REFRESH_WEEKLY_ROLLUP
+
+    assert _REFRESH_ROLLUPS[-1] is _REFRESH_WEEKLY_ROLLUP
+    sql = str(_REFRESH_WEEKLY_ROLLUP.compile(dialect=postgresql.dialect()))
+    assert 'JOIN port_forecast_daily' in sql
+    assert 'port_forecasts f' not in sql
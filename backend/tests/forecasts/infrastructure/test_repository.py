@@ -0,0 +1,83 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from app.forecasts.domain.models import Forecast
+from app.forecasts.infrastructure.repositories import ForecastRepository
+from app.ports.infrastructure.infrastructure import PortRepository
+
+BASE = datetime(2026, 10, 18, tzinfo=timezone.utc)
+
+
+@pytest.mark.asyncio
+async def test_ingest_and_read_forecast_range(session):
+    port = await PortRepository(session).create_port("Forecast Port", "Country F", 43.0, -8.0)
+    repo = ForecastRepository(session)
+    issued = BASE - timedelta(hours=6)
+
+    rows = [
+        (i + 1, Forecast(port_id=port.id, valid_time=BASE + timedelta(hours=i), issued_at=issued, wave_height=float(i)))
+        for i in range(48)
+    ]
+    rows.append((49, Forecast(port_id=-1, valid_time=BASE, issued_at=issued)))
+    assert await repo.ingest_forecasts(rows) == [49]
+
+    series = await repo.get_forecast(port.id, BASE + timedelta(hours=10), BASE + timedelta(hours=13), ["wave_height"])
+    assert series.valid_times == [BASE + timedelta(hours=h) for h in (10, 11, 12)]
+    assert series.values == {"wave_height": [10.0, 11.0, 12.0]}
+
+@pytest.mark.asyncio
+async def test_newer_issue_replaces_older_forecast(session):
+    port = await PortRepository(session).create_port("Forecast Issue Port", "Country F", 43.0, -8.0)
+    repo = ForecastRepository(session)
+
+    await repo.ingest_forecasts([(1, Forecast(port.id, BASE, BASE - timedelta(hours=12), wind_speed=5.0))])
+    await repo.ingest_forecasts([(1, Forecast(port.id, BASE, BASE - timedelta(hours=6), wind_speed=7.0))])
+    await repo.ingest_forecasts([(1, Forecast(port.id, BASE, BASE - timedelta(hours=18), wind_speed=1.0))])
+
+    series = await repo.get_forecast(port.id, BASE, BASE + timedelta(hours=1), ["wind_speed"])
+    assert series.values == {"wind_speed": [7.0]}
+
+@pytest.mark.asyncio
+async def test_get_forecast_for_missing_port(session):
+    repo = ForecastRepository(session)
+
+    assert await repo.get_forecast(-1, BASE, BASE + timedelta(days=1), ["wave_height"]) is None
+
+@pytest.mark.asyncio
+async def test_rollups_follow_ingested_batches(session):
+    port = await PortRepository(session).create_port("Forecast Rollup Port", "Country F", 43.0, -8.0)
+    repo = ForecastRepository(session)
+    issued = BASE - timedelta(hours=6)
+
+    await repo.ingest_forecasts([
+        (h + 1, Forecast(port.id, BASE + timedelta(hours=h), issued, wave_height=float(h))) for h in range(48)
+    ])
+    # Una nueva emisión cambia una hora del primer día: solo se recalcula ese día
+    await repo.ingest_forecasts([(1, Forecast(port.id, BASE + timedelta(hours=3), BASE, wave_height=100.0))])
+
+    buckets = await repo.get_forecast_summary(port.id, BASE, BASE + timedelta(days=2), "day", ["wave_height"])
+    assert [b.partial for b in buckets] == [False, False]
+    assert buckets[0].values["wave_height"].max == 100.0
+    assert buckets[1].values["wave_height"].min == 24.0
+    assert buckets[1].hours == 24
+
+@pytest.mark.asyncio
+async def test_concurrent_partition_creation_does_not_fail(engine):
+    import asyncio
+
+    from sqlalchemy.ext.asyncio import async_sessionmaker
+
+    from app.forecasts.infrastructure import repositories
+
+    valid_time = datetime(2031, 3, 5, tzinfo=timezone.utc)
+    name = repositories.partition_name(repositories.partition_bounds(valid_time)[0])
+    factory = async_sessionmaker(engine, expire_on_commit=False)
+
+    async def create():
+        async with factory() as session:
+            # Cada sesión hace de un worker distinto, sin la caché compartida del proceso
+            repositories._known_partitions.discard(name)
+            await ForecastRepository(session).ensure_partitions([valid_time])
+
+    await asyncio.gather(create(), create())
+    assert name in repositories._known_partitions
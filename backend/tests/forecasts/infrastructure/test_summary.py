@@ -0,0 +1,58 @@
+from datetime import datetime, timezone
+
+import pytest
+from app.forecasts.domain.models import ROLLUP_DAY, ROLLUP_WEEK, ForecastSummaryBucket
+from app.forecasts.infrastructure.repositories import ForecastRepository, bucket_floor
+
+
+def at(day, hour=0):
+    return datetime(2026, 10, day, hour, tzinfo=timezone.utc)
+
+
+class RecordingRepository(ForecastRepository):
+    # Registra qué tramos se leen de los rollups y cuáles de las filas horarias
+    def __init__(self):
+        super().__init__(session=None)
+        self.calls = []
+
+    async def _read_rollup(self, table, port_id, start, end, variables):
+        self.calls.append((table.name, start, end))
+        return [ForecastSummaryBucket(bucket_start=start, hours=24, values={})]
+
+    async def _summarize_raw(self, port_id, start, end, variables):
+        self.calls.append(("raw", start, end))
+        return [ForecastSummaryBucket(bucket_start=start, hours=1, values={}, partial=True)]
+
+
+def test_bucket_floor():
+    assert bucket_floor(at(18, 13), ROLLUP_DAY) == at(18)
+    # 2026-10-18 es domingo: la semana empieza el lunes 12
+    assert bucket_floor(at(18, 13), ROLLUP_WEEK) == at(12)
+
+@pytest.mark.asyncio
+async def test_summary_reads_raw_rows_only_for_partial_edges():
+    repo = RecordingRepository()
+
+    await repo.get_forecast_summary(1, at(18, 6), at(21, 12), ROLLUP_DAY, ["wave_height"])
+
+    assert repo.calls == [
+        ("raw", at(18, 6), at(19)),
+        ("port_forecast_daily", at(19), at(21)),
+        ("raw", at(21), at(21, 12)),
+    ]
+
+@pytest.mark.asyncio
+async def test_summary_of_aligned_range_uses_only_rollups():
+    repo = RecordingRepository()
+
+    await repo.get_forecast_summary(1, at(12), at(26), ROLLUP_WEEK, ["wave_height"])
+
+    assert repo.calls == [("port_forecast_weekly", at(12), at(26))]
+
+@pytest.mark.asyncio
+async def test_summary_inside_one_bucket_is_raw():
+    repo = RecordingRepository()
+
+    await repo.get_forecast_summary(1, at(18, 6), at(18, 12), ROLLUP_DAY, ["wave_height"])
+
+    assert repo.calls == [("raw", at(18, 6), at(18, 12))]
@@ -0,0 +1,18 @@
+import numpy as np
+import pytest
+from app.forecasts.ingest_grid import main
+
+
+@pytest.mark.asyncio
+async def test_fields_with_different_lengths_are_rejected(tmp_path):
+    np.save(tmp_path / "hs.npy", np.zeros((3, 2, 2), dtype=np.float32))
+    np.save(tmp_path / "ws.npy", np.zeros((2, 2, 2), dtype=np.float32))
+
+    # Falla antes de abrir sesión: no se trunca en silencio al campo más corto
+    with pytest.raises(ValueError, match="different numbers of steps"):
+        await main([
+            "--lat0", "0", "--lon0", "0", "--dlat", "1", "--dlon", "1", "--nlat", "2", "--nlon", "2",
+            "--start", "2026-10-18T00:00Z", "--issued-at", "2026-10-17T18:00Z",
+            "--index-dir", str(tmp_path / "index"),
+            f"wave_height={tmp_path / 'hs.npy'}", f"wind_speed={tmp_path / 'ws.npy'}",
+        ])
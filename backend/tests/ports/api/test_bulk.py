@@ -0,0 +1,62 @@
+import pytest
+from app.ports.api.bulk import bulk_format, import_ports, iter_lines
+
+
+async def chunks_of(data: bytes, size: int):
+    for i in range(0, len(data), size):
+        yield data[i:i + size]
+
+
+def test_bulk_format_from_content_type():
+    assert bulk_format("text/csv; charset=utf-8") == "csv"
+    assert bulk_format("application/x-ndjson") == "ndjson"
+    assert bulk_format("application/json") is None
+    assert bulk_format(None) is None
+
+@pytest.mark.asyncio
+async def test_iter_lines_handles_split_chunks():
+    data = "a,ñ\r\nb\nc".encode("utf-8")
+    # Chunks de 1 byte: la ñ queda partida entre dos chunks
+    lines = [line async for line in iter_lines(chunks_of(data, 1))]
+    assert lines == [(1, "a,ñ"), (2, "b"), (3, "c")]
+
+@pytest.mark.asyncio
+async def test_import_csv_reports_rejected_lines(fake_port_service):
+    data = (
+        b"name,country,latitude,longitude\n"
+        b"Port A,Spain,43.3,-8.4\n"
+        b"Port B,Spain,not-a-number,-8.4\n"
+        b"Port C,France,48.3\n"
+        b"Port A,Spain,43.3,-8.4\n"
+        b"Port D,France,48.3,-4.5\n"
+    )
+    service = fake_port_service()
+
+    result = await import_ports(chunks_of(data, 7), "csv", service, batch_size=2)
+
+    assert result.inserted == 2
+    assert result.rejected == 3
+    assert result.rejected_lines == [3, 4, 5]
+    assert [len(batch) for batch in service.batches] == [2, 1]
+
+@pytest.mark.asyncio
+async def test_import_ndjson(fake_port_service, make_port):
+    data = (
+        b'{"name": "Port A", "country": "Spain", "latitude": 43.3, "longitude": -8.4}\n'
+        b'\n'
+        b'{"name": "Port B"}\n'
+        b'not json\n'
+        b'{"name": "Port C", "country": "Spain", "latitude": 36.1, "longitude": -5.3}'
+    )
+    service = fake_port_service([make_port(1, "Port C")])
+
+    result = await import_ports(chunks_of(data, 16), "ndjson", service, batch_size=100)
+
+    assert result.inserted == 1
+    assert result.rejected_lines == [3, 4, 5]
+
+@pytest.mark.asyncio
+async def test_import_csv_with_bad_header(fake_port_service):
+    service = fake_port_service()
+    with pytest.raises(ValueError):
+        await import_ports(chunks_of(b"foo,bar\n", 64), "csv", service, batch_size=10)
@@ -0,0 +1,87 @@
+import gzip
+
+from app.ports.api.catalogue import PortCatalogue, accepts_gzip, body_etag, etag_matches, gzip_etag
+from app.ports.application.cache import PortCache
+
+
+def make_catalogue(now):
+    cache = PortCache(max_entries=10, ttl_seconds=60, max_list_size=100, clock=lambda: now[0])
+    return PortCatalogue(cache, clock=lambda: now[0]), cache
+
+
+def test_etag_matches():
+    etag = body_etag(b"[]")
+
+    assert etag_matches(etag, etag)
+    assert etag_matches(f'"other", W/{etag}', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches(None, etag)
+    assert not etag_matches('"other"', etag)
+
+def test_gzip_representation_has_its_own_etag():
+    etag = body_etag(b"[]")
+
+    assert gzip_etag(etag) != etag
+    assert gzip_etag(etag).startswith('"') and gzip_etag(etag).endswith('-gz"')
+    # Un cliente puede revalidar con el ETag de cualquiera de las dos codificaciones
+    assert etag_matches(gzip_etag(etag), etag)
+    assert etag_matches(f"W/{gzip_etag(etag)}", etag)
+    assert not etag_matches(gzip_etag(body_etag(b"[1]")), etag)
+
+def test_accepts_gzip():
+    assert accepts_gzip("gzip, deflate, br")
+    assert accepts_gzip("br;q=1.0, gzip;q=0.5")
+    assert not accepts_gzip("gzip;q=0")
+    assert not accepts_gzip("identity")
+    assert not accepts_gzip(None)
+
+def test_snapshot_is_reused_until_the_version_changes(make_port):
+    now = [0.0]
+    catalogue, cache = make_catalogue(now)
+    assert catalogue.current() is None
+
+    snapshot = catalogue.build([make_port(1)], catalogue.version)
+    assert catalogue.current() is snapshot
+    assert gzip.decompress(snapshot.gzip_body) == snapshot.body
+    assert snapshot.etag == body_etag(snapshot.body)
+
+    cache.invalidate(1)
+    assert catalogue.current() is None
+
+def test_snapshot_expires_with_the_cache_ttl(make_port):
+    now = [0.0]
+    catalogue, _ = make_catalogue(now)
+    catalogue.build([make_port(1)], catalogue.version)
+
+    now[0] = 61.0
+    assert catalogue.current() is None
+
+def test_snapshot_built_across_a_write_is_not_kept(make_port):
+    now = [0.0]
+    catalogue, cache = make_catalogue(now)
+    version = catalogue.version
+    cache.invalidate_list()
+
+    snapshot = catalogue.build([make_port(1)], version)
+
+    assert snapshot.body
+    assert catalogue.current() is None
+
+def test_snapshot_above_max_list_size_is_not_kept(make_port):
+    now = [0.0]
+    cache = PortCache(max_entries=10, ttl_seconds=60, max_list_size=1, clock=lambda: now[0])
+    catalogue = PortCatalogue(cache, clock=lambda: now[0])
+
+    snapshot = catalogue.build([make_port(1), make_port(2)], catalogue.version)
+
+    assert snapshot.body
+    assert catalogue.current() is None
+
+def test_etag_depends_only_on_content(make_port):
+    now = [0.0]
+    first, _ = make_catalogue(now)
+    second, cache = make_catalogue(now)
+    cache.clear()
+
+    ports = [make_port(1), make_port(2, "Bilbao")]
+    assert first.build(ports, first.version).etag == second.build(ports, second.version).etag
@@ -0,0 +1,20 @@
+import pytest
+from pydantic import ValidationError
+
+from app.ports.api.schemas import PortCreate, PortUpdate, PortUpsert
+
+
+@pytest.mark.parametrize("latitude, longitude", [(90.5, 0.0), (-91.0, 0.0), (0.0, 180.5), (0.0, -181.0)])
+def test_out_of_range_coordinates_are_rejected(latitude, longitude):
+    with pytest.raises(ValidationError):
+        PortCreate(name="Vigo", country="Spain", latitude=latitude, longitude=longitude)
+    with pytest.raises(ValidationError):
+        PortUpsert(country="Spain", latitude=latitude, longitude=longitude)
+    with pytest.raises(ValidationError):
+        PortUpdate(latitude=latitude, longitude=longitude)
+
+def test_bounds_are_inclusive_and_update_fields_stay_optional():
+    port = PortCreate(name="Edge", country="Nowhere", latitude=-90, longitude=180)
+
+    assert (port.latitude, port.longitude) == (-90, 180)
+    assert PortUpdate(name="Vigo").latitude is None
@@ -0,0 +1,27 @@
+import pytest
+from fastapi import HTTPException
+
+from app.ports.api.router import search_ports
+
+
+@pytest.fixture
+def service(fake_port_service, make_port):
+    service = fake_port_service()
+    service.search_results = [(make_port(1, "Vigo"), 1.0)]
+    return service
+
+
+@pytest.mark.asyncio
+async def test_blank_query_is_rejected_before_the_search(service):
+    with pytest.raises(HTTPException) as error:
+        await search_ports(q="   ", limit=10, service=service)
+
+    assert error.value.status_code == 422
+    assert service.calls == []
+
+@pytest.mark.asyncio
+async def test_query_is_stripped(service):
+    results = await search_ports(q="  vig ", limit=10, service=service)
+
+    assert service.calls == [("search", "vig")]
+    assert [r.id for r in results] == [1]
@@ -0,0 +1,44 @@
+import json
+
+import numpy as np
+import pytest
+from app.ports.api.schemas import PortPageRead, PortRead
+from app.ports.api.serialization import (
+    iter_distance_matrix_json,
+    port_to_ndjson_line,
+    ports_page_to_json,
+    ports_to_json,
+)
+
+
+def test_ports_to_json_matches_port_read(make_port):
+    ports = [make_port(1), make_port(2)]
+
+    expected = [PortRead.model_validate(p).model_dump() for p in ports]
+    assert json.loads(ports_to_json(ports)) == expected
+
+def test_ports_page_to_json_carries_next_cursor(make_port):
+    ports = [make_port(1), make_port(2)]
+
+    page = PortPageRead.model_validate_json(ports_page_to_json(ports, 2))
+    assert page.next_cursor == 2
+    assert [p.id for p in page.items] == [1, 2]
+    # Última página: el cursor va como null
+    assert json.loads(ports_page_to_json(ports, None))["next_cursor"] is None
+
+def test_port_to_ndjson_line(make_port):
+    line = port_to_ndjson_line(make_port(7))
+
+    assert line.endswith(b"\n")
+    assert json.loads(line)["id"] == 7
+
+@pytest.mark.asyncio
+async def test_distance_matrix_json_is_built_by_blocks():
+    async def blocks():
+        yield np.array([[0.0, 1.5]])
+        yield np.array([[2.5, 0.0], [3.0, 4.0]])
+
+    header = {"method": "haversine", "unit": "km", "origin_ids": [1, 2, 3], "destination_ids": [1, 2]}
+    body = b"".join([chunk async for chunk in iter_distance_matrix_json(header, blocks())])
+
+    assert json.loads(body) == {**header, "distances": [[0.0, 1.5], [2.5, 0.0], [3.0, 4.0]]}
@@ -144,4 +144,26 @@ def test_delete_port_method_signature():
     expected_params = ['self', 'port_id']
     actual_params = [param.name for param in params]
 
-    assert actual_params == expected_params, f"Expected parameters {expected_params} but got {actual_params}"    
\ No newline at end of file
+    assert actual_params == expected_params, f"Expected parameters {expected_params} but got {actual_params}"
+
+
+
+def test_find_nearest_ports_abstract_method():
+    method = getattr(PortService, "find_nearest_ports", None)
+    assert method is not None
+    assert getattr(method, "__isabstractmethod__", False) is True
+
+def test_find_nearest_ports_method_signature():
+    sig = inspect.signature(PortService.find_nearest_ports)
+    actual_params = [param.name for param in sig.parameters.values()]
+    assert actual_params == ['self', 'latitude', 'longitude', 'k']
+
+def test_find_ports_within_abstract_method():
+    method = getattr(PortService, "find_ports_within", None)
+    assert method is not None
+    assert getattr(method, "__isabstractmethod__", False) is True
+
+def test_find_ports_within_method_signature():
+    sig = inspect.signature(PortService.find_ports_within)
+    actual_params = [param.name for param in sig.parameters.values()]
+    assert actual_params == ['self', 'latitude', 'longitude', 'radius_km', 'limit']
@@ -0,0 +1,162 @@
+import pytest
+from app.ports.application.cache import CachingPortService, PortCache
+from app.ports.domain.models import Port
+
+
+@pytest.fixture
+def make_service(fake_port_service, clock):
+    def make(ports, max_entries=10, ttl=60.0, max_list_size=100):
+        cache = PortCache(max_entries=max_entries, ttl_seconds=ttl, max_list_size=max_list_size, clock=clock)
+        inner = fake_port_service(ports)
+        return CachingPortService(inner, cache), inner, cache, clock
+    return make
+
+
+@pytest.mark.asyncio
+async def test_get_port_by_id_is_cached(make_service, make_port):
+    service, inner, cache, _ = make_service([make_port(1)])
+
+    await service.get_port_by_id(1)
+    await service.get_port_by_id(1)
+
+    assert inner.calls == [("get", 1)]
+    assert cache.stats.hits == 1
+    assert cache.stats.misses == 1
+
+@pytest.mark.asyncio
+async def test_entries_expire_after_ttl(make_service, make_port):
+    service, inner, _, clock = make_service([make_port(1)], ttl=10.0)
+
+    await service.get_port_by_id(1)
+    clock.now = 11.0
+    await service.get_port_by_id(1)
+
+    assert inner.calls == [("get", 1), ("get", 1)]
+
+@pytest.mark.asyncio
+async def test_lru_evicts_least_recently_used(make_service, make_port):
+    service, inner, cache, _ = make_service([make_port(i) for i in (1, 2, 3)], max_entries=2)
+
+    await service.get_port_by_id(1)
+    await service.get_port_by_id(2)
+    await service.get_port_by_id(1)  # 1 pasa a ser el más reciente
+    await service.get_port_by_id(3)  # expulsa al 2
+
+    assert cache.stats.evictions == 1
+    inner.calls.clear()
+    await service.get_port_by_id(1)
+    await service.get_port_by_id(2)
+    assert inner.calls == [("get", 2)]
+
+@pytest.mark.asyncio
+async def test_list_snapshot_invalidated_by_writes(make_service, make_port):
+    service, inner, cache, _ = make_service([make_port(1)])
+
+    await service.list_ports()
+    await service.list_ports()
+    assert inner.calls.count(("list",)) == 1
+
+    created = await service.create_port("New", "Country", 0.0, 0.0)
+    ports = await service.list_ports()
+    assert created.id in {p.id for p in ports}
+    assert inner.calls.count(("list",)) == 2
+    assert cache.stats.list_hits == 1
+
+@pytest.mark.asyncio
+async def test_update_and_delete_invalidate_entry(make_service, make_port):
+    service, inner, _, _ = make_service([make_port(1, "Old")])
+
+    await service.get_port_by_id(1)
+    await service.update_port(1, name="New")
+    assert (await service.get_port_by_id(1)).name == "New"
+
+    await service.delete_port(1)
+    assert await service.get_port_by_id(1) is None
+
+@pytest.mark.asyncio
+async def test_list_snapshot_respects_size_bound(make_service, make_port):
+    service, inner, _, _ = make_service([make_port(i) for i in (1, 2, 3)], max_list_size=2)
+
+    await service.list_ports()
+    await service.list_ports()
+
+    assert inner.calls.count(("list",)) == 2
+
+def test_stale_read_is_not_stored_after_invalidation(make_port):
+    cache = PortCache(max_entries=10, ttl_seconds=60.0, max_list_size=100)
+    generation = cache.generation
+
+    # Una escritura llega mientras la lectura estaba en curso
+    cache.invalidate(1)
+    cache.put(make_port(1), generation)
+
+    assert cache.get(1) is None
+
+@pytest.mark.asyncio
+async def test_upsert_invalidates_only_changed_ports(make_service, make_port):
+    service, inner, _, _ = make_service([make_port(1, "A"), make_port(2, "B")])
+
+    await service.get_port_by_id(1)
+    await service.get_port_by_id(2)
+    inner.calls.clear()
+
+    changed = Port(name="A", country="Country", latitude=9.0, longitude=2.0)
+    same = Port(name="B", country="Country", latitude=1.0, longitude=2.0)
+    await service.upsert_ports([changed, same])
+
+    assert (await service.get_port_by_id(1)).latitude == 9.0
+    await service.get_port_by_id(2)
+    assert inner.calls == [("get", 1)]
+
+@pytest.mark.asyncio
+async def test_get_ports_by_ids_fetches_only_misses(make_service, make_port):
+    service, inner, _, _ = make_service([make_port(i) for i in (1, 2, 3)])
+
+    await service.get_port_by_id(2)
+    inner.calls.clear()
+
+    ports = await service.get_ports_by_ids([3, 2, 99, 1, 3])
+
+    assert [p.id if p else None for p in ports] == [3, 2, None, 1, 3]
+    assert inner.calls == [("batch", [3, 99, 1])]
+
+    # Ya están todos en caché salvo el que no existe
+    inner.calls.clear()
+    await service.get_ports_by_ids([1, 2, 3])
+    assert inner.calls == []
+
+@pytest.mark.asyncio
+async def test_get_ports_by_ids_counts_repeated_ids_once(make_service, make_port):
+    service, _, cache, _ = make_service([make_port(1), make_port(2)])
+
+    await service.get_ports_by_ids([1, 1, 1, 2])
+    assert cache.stats.misses == 2
+
+    await service.get_ports_by_ids([2, 2])
+    assert cache.stats.hits == 1
+
+@pytest.mark.asyncio
+async def test_list_port_changes_bypasses_cache(make_service, make_port):
+    service, inner, _, _ = make_service([make_port(1)])
+
+    await service.list_port_changes(5, 0, 10)
+    await service.list_port_changes(5, 0, 10)
+
+    assert inner.calls == [("changes", 5, 0, 10), ("changes", 5, 0, 10)]
+
+def test_etags_follow_port_invalidation(clock):
+    cache = PortCache(max_entries=2, ttl_seconds=60.0, max_list_size=100, clock=clock)
+
+    cache.put_etag(1, '"a"')
+    assert cache.get_etag(1) == '"a"'
+
+    # Una escritura durante la lectura impide guardar un ETag viejo
+    generation = cache.generation
+    cache.invalidate(1)
+    assert cache.get_etag(1) is None
+    cache.put_etag(1, '"a"', generation)
+    assert cache.get_etag(1) is None
+
+    cache.put_etag(1, '"b"')
+    clock.now = 61.0
+    assert cache.get_etag(1) is None
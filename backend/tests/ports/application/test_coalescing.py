@@ -0,0 +1,59 @@
+import asyncio
+
+import pytest
+from app.ports.application.cache import CachingPortService, PortCache
+from app.ports.application.coalescing import CoalescingPortService
+from app.shared.singleflight import SingleFlight
+
+
+@pytest.fixture
+def slow_port_service(fake_port_service):
+    # Cada lectura tarda lo suficiente para que las peticiones concurrentes se solapen
+    return lambda ports: fake_port_service(ports, delay=0.01)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_reads_share_one_query(slow_port_service, make_port):
+    inner = slow_port_service([make_port(1), make_port(2)])
+    flight = SingleFlight()
+    service = CoalescingPortService(inner, flight)
+
+    results = await asyncio.gather(
+        *(service.get_port_by_id(1) for _ in range(10)),
+        *(service.list_ports() for _ in range(10)),
+    )
+
+    assert all(port.id == 1 for port in results[:10])
+    assert all(len(ports) == 2 for ports in results[10:])
+    assert inner.calls == [("get", 1), ("list",)]
+    assert flight.executions == 2
+    assert flight.coalesced == 18
+
+@pytest.mark.asyncio
+async def test_different_arguments_are_not_coalesced(slow_port_service, make_port):
+    inner = slow_port_service([make_port(1), make_port(2)])
+    service = CoalescingPortService(inner, SingleFlight())
+
+    await asyncio.gather(service.get_port_by_id(1), service.get_port_by_id(2))
+
+    assert sorted(inner.calls) == [("get", 1), ("get", 2)]
+
+@pytest.mark.asyncio
+async def test_reads_started_before_a_write_are_not_shared_after_it(slow_port_service, make_port):
+    inner = slow_port_service([make_port(1)])
+    cache = PortCache(max_entries=10, ttl_seconds=60.0, max_list_size=100)
+    flight = SingleFlight()
+
+    def request_service():
+        # Como en get_port_service: una instancia por petición sobre estado compartido del worker
+        return CachingPortService(CoalescingPortService(inner, flight, lambda: cache.generation), cache)
+
+    before = asyncio.ensure_future(request_service().get_port_by_id(1))
+    await asyncio.sleep(0)
+    await request_service().delete_port(1)
+    after = await request_service().get_port_by_id(1)
+
+    assert (await before).id == 1
+    assert after is None
+    assert inner.calls == [("get", 1), ("delete", 1), ("get", 1)]
+    assert flight.coalesced == 0
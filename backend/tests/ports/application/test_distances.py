@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+from app.ports.application.cache import PortCache
+from app.ports.application.distances import (
+    HAVERSINE,
+    VINCENTY,
+    PortCoordinateIndex,
+    build_coordinates,
+    distance_matrix_blocks,
+    haversine_matrix,
+    vincenty_matrix,
+)
+
+
+def test_haversine_matrix_shape_and_values():
+    madrid_barcelona = np.radians([[40.4168, -3.7038]]), np.radians([[41.3874, 2.1686], [40.4168, -3.7038]])
+
+    distances = haversine_matrix(*madrid_barcelona)
+    assert distances.shape == (1, 2)
+    assert distances[0, 0] == pytest.approx(505, abs=2)
+    assert distances[0, 1] == 0.0
+
+def test_vincenty_matches_reference_geodesic():
+    # Flinders Peak -> Buninyong, ejemplo clásico de Vincenty: 54972.271 m
+    origins = np.radians([[-37.95103341666667, 144.42486788888888]])
+    destinations = np.radians([[-37.65282113888889, 143.92649552777777]])
+
+    assert vincenty_matrix(origins, destinations)[0, 0] == pytest.approx(54.972271, abs=1e-6)
+
+def test_vincenty_falls_back_for_antipodal_points():
+    origins = np.radians([[0.0, 0.0]])
+    destinations = np.radians([[0.5, 179.7], [0.0, 0.0]])
+
+    distances = vincenty_matrix(origins, destinations)
+    assert np.isfinite(distances).all()
+    assert distances[0, 1] == 0.0
+
+def test_coordinates_positions_report_missing_ids(make_port):
+    coordinates = build_coordinates([make_port(5, latitude=1.0, longitude=2.0), make_port(2, latitude=3.0, longitude=4.0)], version=0, expires_at=10.0)
+
+    assert coordinates.radians.flags["C_CONTIGUOUS"]
+    positions, missing = coordinates.positions([5, 7, 2, 7])
+    assert missing == [7]
+    assert coordinates.ids[positions[0]] == 5
+    assert coordinates.ids[positions[2]] == 2
+
+def test_blocks_match_full_matrix(make_port):
+    ports = [make_port(i, latitude=i * 5.0, longitude=i * -7.0) for i in range(1, 8)]
+    coordinates = build_coordinates(ports, version=0, expires_at=10.0)
+    positions, _ = coordinates.positions([p.id for p in ports])
+
+    full = haversine_matrix(coordinates.radians, coordinates.radians)
+    blocks = [compute() for compute in distance_matrix_blocks(coordinates, positions, positions, HAVERSINE, 3)]
+    assert [len(block) for block in blocks] == [3, 3, 1]
+    assert np.allclose(np.vstack(blocks), full)
+
+    vincenty = [compute() for compute in distance_matrix_blocks(coordinates, positions, positions, VINCENTY, 7)]
+    assert np.allclose(vincenty[0], full, rtol=0.01)
+
+def test_coordinate_index_is_versioned_by_catalogue(make_port):
+    cache = PortCache(max_entries=10, ttl_seconds=60, max_list_size=100, clock=lambda: 0.0)
+    index = PortCoordinateIndex(cache, clock=lambda: 0.0)
+
+    coordinates = index.build([make_port(1, latitude=1.0, longitude=1.0)], index.version)
+    assert index.current() is coordinates
+
+    cache.invalidate(1)
+    assert index.current() is None
@@ -0,0 +1,84 @@
+import pytest
+from app.ports.application.cache import CachingPortService, PortCache
+from app.ports.application.search import PortPrefixIndex, normalize, similarity
+
+
+def test_normalize_matches_ilike():
+    # ILIKE solo ignora las mayúsculas
+    assert normalize("A Coruña") == "a coruña"
+
+def test_similarity_matches_pg_trgm():
+    assert similarity("word", "two words") == pytest.approx(4 / 11)
+    assert similarity("Vigo", "vigo") == 1.0
+    assert similarity("Vigo", "") == 0.0
+
+def test_prefix_search_matches_names_and_countries_like_sql(make_port):
+    index = PortPrefixIndex(ttl_seconds=60)
+    index.load([
+        make_port(1, "Santander"),
+        make_port(2, "Puerto de Santa María"),
+        make_port(3, "Rotterdam", "Netherlands"),
+        make_port(4, "Sanxenxo"),
+    ])
+
+    # Prefijos del nombre completo, ordenados por score y nombre; no palabras intermedias
+    assert [p.id for p, _ in index.search("san", 10)] == [4, 1]
+    assert [p.id for p, _ in index.search("NETH", 10)] == [3]
+    assert index.search("santa m", 10) == []
+    assert index.search("san", 1)[0][0].id == 4
+    # El score es el mismo que calcula pg_trgm
+    port, score = index.search("rotter", 1)[0]
+    assert score == pytest.approx(similarity("Rotterdam", "rotter"))
+    # Los acentos cuentan, como en ILIKE
+    assert index.search("maria", 10) == []
+
+def test_prefix_index_updates_incrementally(make_port):
+    index = PortPrefixIndex(ttl_seconds=60)
+    index.load([make_port(1, "Vigo")])
+
+    index.add(make_port(2, "Vilagarcía"))
+    assert {p.id for p, _ in index.search("vi", 10)} == {1, 2}
+
+    index.add(make_port(1, "Marín"))
+    assert [p.id for p, _ in index.search("vi", 10)] == [2]
+
+    index.remove(2)
+    assert index.search("vi", 10) == []
+    assert index.size == 1
+
+def test_load_after_concurrent_change_is_discarded(make_port):
+    index = PortPrefixIndex(ttl_seconds=60)
+    generation = index.generation
+    index.remove(1)
+
+    index.load([make_port(1, "Vigo")], generation)
+    assert not index.is_fresh()
+
+def test_index_expires_after_ttl(clock):
+    index = PortPrefixIndex(ttl_seconds=60, clock=clock)
+    index.load([])
+    assert index.is_fresh()
+
+    clock.now = 61.0
+    assert not index.is_fresh()
+
+@pytest.mark.asyncio
+async def test_caching_service_answers_prefixes_from_memory(make_port, fake_port_service):
+    inner = fake_port_service([make_port(1, "Bilbao"), make_port(2, "Barcelona"), make_port(3, "Valencia")])
+    # Lo único que encuentran los trigramas de la base
+    inner.search_results = [(inner.ports[3], 0.4)]
+    service = CachingPortService(inner, PortCache(10, 60.0, 100), prefixes=PortPrefixIndex(ttl_seconds=60))
+
+    # Los prefijos llenan el límite: no se va a la base
+    results = await service.search_ports("b", 2)
+    assert [p.id for p, _ in results] == [1, 2]
+    assert inner.calls == [("list",)]
+
+    # Menos prefijos que el límite se completan con los trigramas de la base
+    results = await service.search_ports("bil", 5)
+    assert [(p.id, score) for p, score in results] == [(1, pytest.approx(similarity("Bilbao", "bil"))), (3, 0.4)]
+    assert inner.calls == [("list",), ("search", "bil")]
+
+    # Sin ningún prefijo, solo la búsqueda aproximada
+    results = await service.search_ports("valencai", 5)
+    assert [(p.id, score) for p, score in results] == [(3, 0.4)]
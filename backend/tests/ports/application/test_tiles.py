@@ -0,0 +1,88 @@
+import pytest
+from app.ports.application.cache import CachingPortService, PortCache
+from app.ports.application.tiles import PortTileCache, covering_tiles, tile_position
+from app.ports.domain.models import PortTile
+
+
+def make_tiles(max_entries=10, max_bytes=1000):
+    return PortTileCache(max_entries=max_entries, max_bytes=max_bytes, ttl_seconds=60.0)
+
+
+def test_tile_position():
+    assert tile_position(0.0, 0.0, 1) == pytest.approx((1.0, 1.0))
+    x, y = tile_position(43.36, -8.41, 10)
+    assert (int(x), int(y)) == (488, 374)
+
+def test_covering_tiles_includes_neighbours_near_the_edge():
+    assert covering_tiles(43.36, -8.41, 10) == {(10, 488, 374)}
+    # lon 0 cae en el borde entre las teselas x=0 y x=1 de z=1
+    assert {(1, 0, 0), (1, 1, 0)} <= covering_tiles(45.0, 0.0, 1)
+
+def test_tile_cache_is_bounded_by_entries_and_bytes():
+    tiles = make_tiles(max_entries=2, max_bytes=10)
+    tiles.put((1, 0, 0), PortTile(b"aaaa", [1]), 0)
+    tiles.put((1, 0, 1), PortTile(b"bbbb", [2]), 0)
+    tiles.put((1, 1, 0), PortTile(b"cccc", [3]), 0)
+
+    assert tiles.get((1, 0, 0), 0) is None
+    assert tiles.size_bytes == 8
+
+    tiles.put((1, 1, 1), PortTile(b"dddddddd", [4]), 0)
+    assert tiles.size_bytes <= 10
+    assert tiles.stats.evictions == 3
+
+def test_invalidate_port_drops_only_tiles_covering_it():
+    tiles = make_tiles()
+    old_key = (10, 488, 374)
+    tiles.put(old_key, PortTile(b"old", [1, 2]), 0)
+    tiles.put((10, 100, 100), PortTile(b"other", [3]), 0)
+    new_key = next(iter(covering_tiles(40.0, 0.0, 10)))
+    tiles.put(new_key, PortTile(b"target", [4]), 0)
+
+    # El puerto 1 se mueve: cae la tesela donde estaba y la de su nueva posición
+    tiles.invalidate_port(1, 40.0, 0.0)
+
+    assert tiles.get(old_key, 0) is None
+    assert tiles.get(new_key, 0) is None
+    assert tiles.get((10, 100, 100), 0) is not None
+
+def test_tiles_of_another_catalogue_version_are_not_served():
+    tiles = make_tiles()
+    tiles.put((0, 0, 0), PortTile(b"v1", [1]), 1)
+
+    # Sin invalidate_port (p. ej. un cambio masivo en otro worker): la versión basta
+    assert tiles.get((0, 0, 0), 2) is None
+    assert tiles.stats.misses == 1
+    assert tiles.size_bytes == 0
+
+@pytest.mark.asyncio
+async def test_caching_service_caches_tiles_and_invalidates_on_update(make_port, fake_port_service):
+    inner = fake_port_service([make_port(1)])
+    tiles = make_tiles()
+    service = CachingPortService(inner, PortCache(10, 60.0, 100), tiles)
+
+    await service.get_port_tile(3, 1, 2)
+    await service.get_port_tile(3, 1, 2)
+    assert inner.calls == [("tile", 3, 1, 2)]
+
+    await service.update_port(1, latitude=10.0, longitude=10.0)
+    await service.get_port_tile(3, 1, 2)
+    assert inner.calls == [("tile", 3, 1, 2), ("tile", 3, 1, 2)]
+
+@pytest.mark.asyncio
+async def test_tile_read_across_a_write_is_never_served(fake_port_service):
+    inner = fake_port_service()
+    cache = PortCache(10, 60.0, 100)
+    service = CachingPortService(inner, cache, make_tiles())
+
+    async def get_port_tile(z, x, y):
+        # Otro worker cambia un puerto mientras se lee la tesela; aquí solo llega por la caché
+        cache.invalidate(99)
+        return PortTile(data=b"stale", port_ids=[])
+
+    read_tile = inner.get_port_tile
+    inner.get_port_tile = get_port_tile
+    await service.get_port_tile(5, 1, 1)
+
+    inner.get_port_tile = read_tile
+    assert (await service.get_port_tile(5, 1, 1)).data == b"tile-5-1-1"
@@ -1,6 +1,6 @@
 import pytest
 from sqlalchemy import inspect
-from app.ports.infrastructure.models import PortORM
+from app.ports.infrastructure.models import PortORM, PortTombstoneORM
 
 
 def test_has_tablename():
@@ -41,4 +41,42 @@ def test_type_columns():
 
     lon_col = columns['longitude'].columns[0]
     assert str(lon_col.type) == 'FLOAT'
-    assert lon_col.nullable is False
\ No newline at end of file
+    assert lon_col.nullable is False
+
+def test_geog_column_is_generated():
+    mapper = inspect(PortORM)
+    columns = {col.key: col for col in mapper.attrs}
+
+    # geog la calcula PostGIS a partir de latitude/longitude
+    assert 'geog' in columns
+    geog_col = columns['geog'].columns[0]
+    assert str(geog_col.type) == 'geography(Point, 4326)'
+    assert geog_col.computed is not None
+
+def test_planar_viewport_index():
+    indexes = {index.name: index for index in PortORM.__table__.indexes}
+
+    assert 'ix_ports_geom' in indexes
+    assert indexes['ix_ports_geom'].dialect_options['postgresql']['using'] == 'gist'
+
+def test_trigram_search_indexes():
+    indexes = {index.name: index for index in PortORM.__table__.indexes}
+
+    for name, column in (('ix_ports_name_trgm', 'name'), ('ix_ports_country_trgm', 'country')):
+        options = indexes[name].dialect_options['postgresql']
+        assert options['using'] == 'gin'
+        assert options['ops'] == {column: 'gin_trgm_ops'}
+
+def test_change_version_columns_and_tombstones():
+    indexes = {index.name: index for index in PortORM.__table__.indexes}
+    columns = PortORM.__table__.c
+
+    # version y updated_at las fija el trigger de la base, no el ORM
+    assert str(columns['version'].type) == 'BIGINT'
+    assert columns['version'].server_default is not None
+    assert columns['updated_at'].nullable is False
+    assert [c.name for c in indexes['ix_ports_version'].columns] == ['version', 'id']
+
+    tombstone_indexes = {index.name for index in PortTombstoneORM.__table__.indexes}
+    assert PortTombstoneORM.__tablename__ == 'port_tombstones'
+    assert 'ix_port_tombstones_version' in tombstone_indexes
@@ -0,0 +1,59 @@
+import json
+import pytest
+from app.ports.domain.models import PortChange
+from app.ports.infrastructure.notifications import (
+    PORTS_CHANNEL,
+    PortChangeBroadcaster,
+    PortChangeListener,
+    parse_port_changes,
+)
+
+
+def test_parse_port_change():
+    payload = json.dumps({
+        "op": "UPDATE", "id": 7, "name": "Vigo", "country": "Spain",
+        "latitude": 42.24, "longitude": -8.72,
+    })
+    [change] = parse_port_changes(payload)
+    assert change == PortChange(op="UPDATE", id=7, name="Vigo", country="Spain", latitude=42.24, longitude=-8.72)
+
+def test_parse_statement_notifications():
+    payload = json.dumps({
+        "op": "INSERT",
+        "rows": [
+            {"id": 1, "name": "Vigo", "country": "Spain", "latitude": 42.24, "longitude": -8.72},
+            {"id": 2, "name": "Bilbao", "country": "Spain", "latitude": 43.26, "longitude": -2.93},
+        ],
+    })
+    assert [(c.op, c.id) for c in parse_port_changes(payload)] == [("INSERT", 1), ("INSERT", 2)]
+
+    # Un lote que no cabe en el payload llega como un único cambio sin id
+    [bulk] = parse_port_changes(json.dumps({"op": "INSERT", "count": 5000}))
+    assert bulk == PortChange(op="INSERT", id=None, count=5000)
+
+def test_listener_dispatches_notifications():
+    received = []
+    listener = PortChangeListener("postgresql://unused", on_change=received.append)
+
+    listener.handle_notification(None, 1, PORTS_CHANNEL, json.dumps({"op": "DELETE", "id": 3}))
+    listener.handle_notification(None, 1, PORTS_CHANNEL, json.dumps({"op": "DELETE", "rows": [{"id": 4}, {"id": 5}]}))
+    # Un payload mal formado se ignora sin romper el listener
+    listener.handle_notification(None, 1, PORTS_CHANNEL, "not json")
+
+    assert [c.id for c in received] == [3, 4, 5]
+    assert received[0].op == "DELETE"
+
+@pytest.mark.asyncio
+async def test_broadcaster_fans_out_and_drops_oldest():
+    broadcaster = PortChangeBroadcaster(queue_size=2)
+    first = broadcaster.subscribe()
+    second = broadcaster.subscribe()
+
+    for port_id in (1, 2, 3):
+        broadcaster.publish(PortChange(op="INSERT", id=port_id))
+
+    assert [first.get_nowait().id for _ in range(2)] == [2, 3]
+    assert [second.get_nowait().id for _ in range(2)] == [2, 3]
+
+    broadcaster.unsubscribe(first)
+    assert broadcaster.subscriber_count == 1
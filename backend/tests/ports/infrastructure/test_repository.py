@@ -1,4 +1,6 @@
 import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import async_sessionmaker
 from app.ports.infrastructure.infrastructure import PortRepository
 from app.ports.domain.models import Port
 
@@ -39,4 +41,256 @@ async def test_list_ports_returns_all(session):
     assert expected_ids.issubset(returned_ids)
 
     # Y que todos son instancias de Port
-    assert all(isinstance(p, Port) for p in all_ports)
\ No newline at end of file
+    assert all(isinstance(p, Port) for p in all_ports)
+
+@pytest.mark.asyncio
+async def test_find_nearest_ports_orders_by_distance(session):
+    repo = PortRepository(session)
+
+    near = await repo.create_port("Near Port", "Country N", 43.36, -8.40)
+    far = await repo.create_port("Far Port", "Country F", 36.14, -5.35)
+
+    results = await repo.find_nearest_ports(43.37, -8.39, 50)
+    ids = [p.id for p, _ in results]
+    assert ids.index(near.id) < ids.index(far.id)
+
+    distances = [d for _, d in results]
+    assert distances == sorted(distances)
+
+@pytest.mark.asyncio
+async def test_find_ports_within_radius(session):
+    repo = PortRepository(session)
+
+    inside = await repo.create_port("Inside Port", "Country I", 40.00, 0.00)
+    outside = await repo.create_port("Outside Port", "Country O", 41.00, 0.00)
+
+    # 1 grado de latitud son ~111 km
+    results = await repo.find_ports_within(40.10, 0.00, 50, 100)
+    ids = {p.id for p, _ in results}
+    assert inside.id in ids
+    assert outside.id not in ids
+    assert all(d <= 50 for _, d in results)
+
+@pytest.mark.asyncio
+async def test_list_ports_page_uses_keyset_cursor(session):
+    repo = PortRepository(session)
+
+    for name in ("Page A", "Page B", "Page C"):
+        await repo.create_port(name, "Country P", 1.0, 2.0)
+
+    first_page = await repo.list_ports_page(None, 2)
+    assert len(first_page) == 2
+    second_page = await repo.list_ports_page(first_page[-1].id, 2)
+
+    # Sin solapes y en orden de id
+    assert all(p.id > first_page[-1].id for p in second_page)
+    ids = [p.id for p in first_page + second_page]
+    assert ids == sorted(ids)
+
+@pytest.mark.asyncio
+async def test_stream_ports_yields_all_ports(session):
+    repo = PortRepository(session)
+
+    saved = await repo.create_port("Stream Port", "Country S", 1.0, 2.0)
+
+    streamed_ids = [p.id async for p in repo.stream_ports()]
+    assert saved.id in streamed_ids
+    assert streamed_ids == sorted(streamed_ids)
+
+@pytest.mark.asyncio
+async def test_stream_ports_honours_limit(session):
+    repo = PortRepository(session)
+
+    first = await repo.create_port("Stream Limit A", "Country S", 1.0, 2.0)
+    await repo.create_port("Stream Limit B", "Country S", 1.0, 2.0)
+
+    streamed_ids = [p.id async for p in repo.stream_ports(after_id=first.id - 1, limit=1)]
+    assert streamed_ids == [first.id]
+
+@pytest.mark.asyncio
+async def test_update_port_returns_updated_port(session):
+    repo = PortRepository(session)
+
+    saved = await repo.create_port("Update Port", "Country U", 1.0, 2.0)
+    updated = await repo.update_port(saved.id, country="Country V", latitude=3.0)
+
+    assert updated.id == saved.id
+    assert updated.name == "Update Port"
+    assert updated.country == "Country V"
+    assert updated.latitude == 3.0
+    assert updated.longitude == 2.0
+
+@pytest.mark.asyncio
+async def test_update_and_delete_missing_port(session):
+    repo = PortRepository(session)
+
+    assert await repo.update_port(-1, name="Nope") is None
+    assert await repo.delete_port(-1) is False
+
+@pytest.mark.asyncio
+async def test_delete_port(session):
+    repo = PortRepository(session)
+
+    saved = await repo.create_port("Delete Port", "Country D", 1.0, 2.0)
+
+    assert await repo.delete_port(saved.id) is True
+    assert await repo.get_port_by_id(saved.id) is None
+
+@pytest.mark.asyncio
+async def test_upsert_ports_reports_status_per_row(session):
+    repo = PortRepository(session)
+
+    existing = await repo.create_port("Upsert Same", "Country U", 1.0, 2.0)
+    await repo.create_port("Upsert Changed", "Country U", 1.0, 2.0)
+
+    results = await repo.upsert_ports([
+        Port(name="Upsert Same", country="Country U", latitude=1.0, longitude=2.0),
+        Port(name="Upsert Changed", country="Country U", latitude=5.0, longitude=2.0),
+        Port(name="Upsert New", country="Country U", latitude=1.0, longitude=2.0),
+    ])
+
+    assert [status for _, status in results] == ["unchanged", "updated", "created"]
+    assert results[0][0].id == existing.id
+    assert results[1][0].latitude == 5.0
+
+@pytest.mark.asyncio
+async def test_get_ports_by_ids_keeps_request_order(session):
+    repo = PortRepository(session)
+
+    a = await repo.create_port("Batch A", "Country B", 1.0, 2.0)
+    b = await repo.create_port("Batch B", "Country B", 1.0, 2.0)
+
+    ports = await repo.get_ports_by_ids([b.id, -1, a.id])
+
+    assert [p.id if p else None for p in ports] == [b.id, None, a.id]
+
+@pytest.mark.asyncio
+async def test_find_ports_in_bbox(session):
+    repo = PortRepository(session)
+
+    inside = await repo.create_port("Bbox Inside", "Country B", 10.5, 20.5)
+    outside = await repo.create_port("Bbox Outside", "Country B", 12.5, 20.5)
+
+    ports = await repo.find_ports_in_bbox(10.0, 20.0, 11.0, 21.0, 100)
+    ids = {p.id for p in ports}
+    assert inside.id in ids
+    assert outside.id not in ids
+
+@pytest.mark.asyncio
+async def test_find_ports_in_bbox_across_antimeridian(session):
+    repo = PortRepository(session)
+
+    east = await repo.create_port("Bbox East", "Country F", -17.0, 179.5)
+    west = await repo.create_port("Bbox West", "Country F", -17.0, -179.5)
+
+    ports = await repo.find_ports_in_bbox(-18.0, 179.0, -16.0, -179.0, 100)
+    ids = {p.id for p in ports}
+    assert {east.id, west.id} <= ids
+
+@pytest.mark.asyncio
+async def test_cluster_ports_in_bbox_groups_by_grid_cell(session):
+    repo = PortRepository(session)
+
+    a = await repo.create_port("Cluster A", "Country C", -30.1, 100.1)
+    b = await repo.create_port("Cluster B", "Country C", -30.2, 100.2)
+    c = await repo.create_port("Cluster C", "Country C", -35.0, 105.0)
+
+    clusters = await repo.cluster_ports_in_bbox(-40.0, 95.0, -25.0, 110.0, 1.0, 5, 100)
+    by_ids = {tuple(cluster.sample_ids): cluster for cluster in clusters}
+    assert by_ids[(a.id, b.id)].count == 2
+    assert by_ids[(a.id, b.id)].latitude == pytest.approx(-30.15)
+    assert by_ids[(c.id,)].count == 1
+
+@pytest.mark.asyncio
+async def test_cluster_centroid_across_the_antimeridian(session):
+    repo = PortRepository(session)
+
+    east = await repo.create_port("Cluster East", "Country C", -17.0, 179.5)
+    west = await repo.create_port("Cluster West", "Country C", -17.0, -179.5)
+
+    # Una celda de 360° junta los dos lados: el centroide queda en ±180°, no en 0°
+    clusters = await repo.cluster_ports_in_bbox(-18.0, 179.0, -16.0, -179.0, 360.0, 5, 100)
+    cluster = next(c for c in clusters if set(c.sample_ids) >= {east.id, west.id})
+    assert abs(cluster.longitude) == pytest.approx(180.0)
+
+@pytest.mark.asyncio
+async def test_get_port_tile_contains_port(session):
+    from app.ports.application.tiles import covering_tiles
+
+    repo = PortRepository(session)
+    port = await repo.create_port("Tile Port", "Country T", 43.36, -8.41)
+
+    z, x, y = next(iter(covering_tiles(43.36, -8.41, 10)))
+    tile = await repo.get_port_tile(z, x, y)
+    assert port.id in tile.port_ids
+    assert tile.data
+
+    empty = await repo.get_port_tile(10, 0, 0)
+    assert empty.port_ids == []
+
+@pytest.mark.asyncio
+async def test_search_ports_by_prefix_and_typo(session):
+    repo = PortRepository(session)
+
+    port = await repo.create_port("Algeciras Search", "Country S", 36.13, -5.45)
+
+    prefix = await repo.search_ports("algeci", 10)
+    assert prefix[0][0].id == port.id
+
+    typo = await repo.search_ports("Algecirsa Search", 10)
+    assert port.id in {p.id for p, _ in typo}
+
+async def sync_all(repo, version=0, after_id=0):
+    changes = []
+    while True:
+        page, watermark = await repo.list_port_changes(version, after_id, 100)
+        changes.extend(page)
+        if len(page) < 100:
+            return changes, max((version, after_id), (watermark, 0))
+        version, after_id = page[-1].version, page[-1].id
+
+@pytest.mark.asyncio
+async def test_list_port_changes_since_version(session):
+    repo = PortRepository(session)
+
+    created = await repo.create_port("Sync Created", "Country S", 1.0, 2.0)
+    removed = await repo.create_port("Sync Removed", "Country S", 1.0, 2.0)
+    _, cursor = await sync_all(repo)
+
+    await repo.update_port(created.id, latitude=3.0)
+    await repo.delete_port(removed.id)
+
+    changes, next_cursor = await sync_all(repo, *cursor)
+    by_id = {change.id: change for change in changes}
+
+    assert [(c.version, c.id) for c in changes] == sorted((c.version, c.id) for c in changes)
+    assert by_id[created.id].op == "upsert"
+    assert by_id[created.id].port.latitude == 3.0
+    assert by_id[removed.id].op == "delete"
+    assert by_id[removed.id].port is None
+    # Nada posterior al cursor devuelto
+    assert (await sync_all(repo, *next_cursor))[0] == []
+
+@pytest.mark.asyncio
+async def test_list_port_changes_waits_for_open_transactions(engine):
+    factory = async_sessionmaker(engine, expire_on_commit=False)
+    async with factory() as reader, factory() as slow, factory() as fast:
+        repo = PortRepository(reader)
+        _, cursor = await sync_all(repo)
+        await reader.commit()
+
+        # slow escribe primero (versión menor) pero confirma después que fast
+        await slow.execute(
+            text("INSERT INTO ports (name, country, latitude, longitude) VALUES ('Sync Slow', 'S', 1, 2)")
+        )
+        fast_port = await PortRepository(fast).create_port("Sync Fast", "S", 1.0, 2.0)
+
+        changes, cursor = await sync_all(repo, *cursor)
+        await reader.commit()
+        # Con slow abierta el cursor no puede pasar por encima de su versión
+        assert fast_port.id not in {c.id for c in changes}
+
+        await slow.commit()
+        changes, _ = await sync_all(repo, *cursor)
+        names = {c.port.name for c in changes if c.port is not None}
+        assert {"Sync Slow", "Sync Fast"} <= names
@@ -0,0 +1,92 @@
+import time
+
+import pytest
+from jose import JWTError, ExpiredSignatureError, jwt
+from app.shared.auth.jwt_service import JWTService
+
+
+def test_decode_token_is_cached():
+    service = JWTService(secret_key="secret")
+    token = service.create_access_token("1")
+
+    first = service.decode_token(token)
+    second = service.decode_token(token)
+
+    assert first == second
+    assert service.cache_misses == 1
+    assert service.cache_hits == 1
+
+def test_cached_payload_cannot_be_mutated_by_callers():
+    service = JWTService(secret_key="secret")
+    token = service.create_access_token("1")
+
+    service.decode_token(token)["sub"] = "2"
+
+    assert service.decode_token(token)["sub"] == "1"
+
+def test_cache_is_bounded():
+    service = JWTService(secret_key="secret", cache_size=2)
+    tokens = [service.create_access_token(str(i)) for i in range(3)]
+
+    for token in tokens:
+        service.decode_token(token)
+
+    # El primero se ha expulsado y vuelve a verificarse
+    service.decode_token(tokens[0])
+    assert service.cache_misses == 4
+
+def test_cached_entry_expires_at_exp(clock):
+    clock.now = time.time()
+    service = JWTService(secret_key="secret", access_token_expire_minutes=1, clock=clock)
+    token = service.create_access_token("1")
+    service.decode_token(token)
+
+    clock.now += 120
+    # La entrada ya no sirve: se vuelve a verificar y el token ha caducado
+    with pytest.raises(ExpiredSignatureError):
+        service.decode_token(token)
+    assert service.cache_misses == 2
+
+def test_revoke_subject_rejects_previous_tokens(clock):
+    clock.now = time.time()
+    service = JWTService(secret_key="secret", clock=clock)
+    token = service.create_access_token("1")
+    other = service.create_access_token("2")
+    service.decode_token(token)
+    service.decode_token(other)
+
+    clock.now += 5
+    service.revoke_subject("1")
+
+    with pytest.raises(JWTError):
+        service.decode_token(token)
+    assert service.decode_token(other)["sub"] == "2"
+
+def test_revocation_splits_tokens_within_the_same_second(clock):
+    clock.now = float(int(time.time()))
+    service = JWTService(secret_key="secret", clock=clock)
+
+    clock.now += 0.2
+    before = service.create_access_token("1")
+    clock.now += 0.1
+    service.revoke_subject("1")
+    clock.now += 0.1
+    after = service.create_access_token("1")
+
+    with pytest.raises(JWTError):
+        service.decode_token(before)
+    assert service.decode_token(after)["sub"] == "1"
+
+    # Un iat en segundos enteros del segundo de la revocación no puede situarse después: revocado
+    whole = jwt.encode({"sub": "1", "iat": int(clock.now), "exp": clock.now + 60}, "secret", algorithm="HS256")
+    with pytest.raises(JWTError):
+        service.decode_token(whole)
+
+def test_cache_can_be_disabled():
+    service = JWTService(secret_key="secret", cache_size=0)
+    token = service.create_access_token("1")
+
+    service.decode_token(token)
+    service.decode_token(token)
+
+    assert service.cache_hits == 0
@@ -0,0 +1,45 @@
+import asyncio
+import threading
+
+import pytest
+from passlib.context import CryptContext
+from app.shared.auth.password_hasher import AsyncPasswordHasher, PasswordHasherBusyError
+
+
+class BlockingContext:
+    # Simula un hash lento que no termina hasta que el test lo libera
+    def __init__(self):
+        self.release = threading.Event()
+
+    def hash(self, password):
+        self.release.wait(5)
+        return "hashed-" + password
+
+
+@pytest.mark.asyncio
+async def test_async_hash_and_verify():
+    context = CryptContext(schemes=["bcrypt"], bcrypt__rounds=4)
+    hasher = AsyncPasswordHasher(context, max_workers=2, max_pending=4)
+
+    hashed = await hasher.hash_password("secret")
+
+    assert await hasher.verify_password("secret", hashed) is True
+    assert await hasher.verify_password("wrong", hashed) is False
+    hasher.shutdown()
+
+@pytest.mark.asyncio
+async def test_rejects_when_queue_is_full():
+    context = BlockingContext()
+    hasher = AsyncPasswordHasher(context, max_workers=1, max_pending=1)
+
+    first = asyncio.create_task(hasher.hash_password("a"))
+    await asyncio.sleep(0)
+
+    with pytest.raises(PasswordHasherBusyError):
+        await hasher.hash_password("b")
+    assert hasher.rejected == 1
+
+    context.release.set()
+    assert await first == "hashed-a"
+    assert hasher.pending == 0
+    hasher.shutdown()
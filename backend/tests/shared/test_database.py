@@ -0,0 +1,48 @@
+import sqlite3
+
+import pytest
+from sqlalchemy import create_engine, exc
+from sqlalchemy.pool import QueuePool
+from app.shared.config import settings
+from app.shared.database import InstrumentedAsyncQueuePool, PoolWaitStatsMixin, engine_options, pool_stats
+
+
+class InstrumentedQueuePool(PoolWaitStatsMixin, QueuePool):
+    pass
+
+
+def test_engine_options_come_from_settings():
+    options = engine_options(settings.model_copy(update={"DB_POOL_SIZE": 3, "DB_ECHO": False}))
+
+    assert options["pool_size"] == 3
+    assert options["echo"] is False
+    assert options["poolclass"] is InstrumentedAsyncQueuePool
+    assert options["connect_args"]["prepared_statement_cache_size"] == settings.DB_STATEMENT_CACHE_SIZE
+
+def test_pool_records_acquisitions_and_timeouts():
+    pool = InstrumentedQueuePool(lambda: sqlite3.connect(":memory:"), pool_size=1, max_overflow=0, timeout=0.01)
+
+    connection = pool.connect()
+    # El pool está agotado: la segunda petición espera y acaba en timeout
+    with pytest.raises(exc.TimeoutError):
+        pool.connect()
+    connection.close()
+
+    stats = pool.wait_stats
+    assert stats.acquisitions == 1
+    assert stats.timeouts == 1
+    assert stats.waiting == 0
+
+    pool.connect().close()
+    assert stats.acquisitions == 2
+    assert stats.timeouts == 1
+
+def test_pool_stats_report_configured_max_overflow():
+    engine = create_engine(
+        "sqlite://", poolclass=InstrumentedQueuePool, pool_size=2, max_overflow=3
+    )
+
+    stats = pool_stats(engine)
+    assert stats["size"] == 2
+    assert stats["max_overflow"] == 3
+    assert stats["acquisitions"] == 0
@@ -0,0 +1,162 @@
+import pytest
+from sqlalchemy import insert, select, text
+from app.ports.infrastructure.models import PortORM
+from app.shared.replicas import (
+    LEAST_CONNECTIONS,
+    REPLICA_READ,
+    ReadPosition,
+    ReplicaSet,
+    RoutingSession,
+    parse_lsn,
+    read_position,
+)
+
+
+class FakePool:
+    def __init__(self, checked_out):
+        self._checked_out = checked_out
+
+    def checkedout(self):
+        return self._checked_out
+
+
+class FakeEngine:
+    def __init__(self, name, checked_out=0):
+        self.name = name
+        self.pool = FakePool(checked_out)
+        self.sync_engine = name
+
+
+def make_session(replicas):
+    primary = FakeEngine("primary")
+    return RoutingSession(primary=primary, replicas=ReplicaSet(replicas))
+
+
+def test_round_robin_rotates_healthy_replicas():
+    a, b = FakeEngine("a"), FakeEngine("b")
+    replica_set = ReplicaSet([a, b])
+
+    assert [replica_set.choose().name for _ in range(4)] == ["a", "b", "a", "b"]
+
+    replica_set.healthy = [b]
+    assert replica_set.choose().name == "b"
+
+    replica_set.healthy = []
+    assert replica_set.choose() is None
+
+def test_least_connections_picks_idlest_replica():
+    replica_set = ReplicaSet([FakeEngine("a", 5), FakeEngine("b", 1)], LEAST_CONNECTIONS)
+
+    assert replica_set.choose().name == "b"
+
+def test_unknown_strategy_is_rejected():
+    with pytest.raises(ValueError):
+        ReplicaSet([], "random")
+
+def test_reads_go_to_replica_until_first_write():
+    session = make_session([FakeEngine("replica")])
+
+    assert session.get_bind(clause=select(PortORM)) == "replica"
+    assert session.get_bind(clause=insert(PortORM)) == "primary"
+    # Read-your-writes: tras escribir, las lecturas también van al primario
+    assert session.get_bind(clause=select(PortORM)) == "primary"
+
+def test_locking_and_textual_statements_use_primary():
+    session = make_session([FakeEngine("replica")])
+
+    assert session.get_bind(clause=select(PortORM).with_for_update()) == "primary"
+    assert session.pinned_to_primary is True
+
+    session = make_session([FakeEngine("replica")])
+    assert session.get_bind(clause=text("SELECT 1")) == "primary"
+
+def test_textual_reads_marked_for_replicas():
+    session = make_session([FakeEngine("replica")])
+
+    assert session.get_bind(clause=text("SELECT 1").execution_options(**{REPLICA_READ: True})) == "replica"
+    assert session.pinned_to_primary is False
+
+def test_reads_after_own_write_skip_replicas_behind_it():
+    behind, caught_up = FakeEngine("behind"), FakeEngine("caught_up")
+    replica_set = ReplicaSet([behind, caught_up])
+    replica_set.replay_lsn = {behind: 90, caught_up: 120}
+
+    token = read_position.set(ReadPosition(min_lsn=100))
+    try:
+        session = RoutingSession(primary=FakeEngine("primary"), replicas=replica_set)
+        assert session.get_bind(clause=select(PortORM)) == "caught_up"
+
+        # Ninguna réplica ha aplicado la escritura del cliente: su lectura va al primario
+        replica_set.replay_lsn[caught_up] = 99
+        session = RoutingSession(primary=FakeEngine("primary"), replicas=replica_set)
+        assert session.get_bind(clause=select(PortORM)) == "primary"
+        assert session.pinned_to_primary is False
+    finally:
+        read_position.reset(token)
+
+    # Otros clientes (sin cookie) siguen leyendo de las réplicas
+    session = RoutingSession(primary=FakeEngine("primary"), replicas=replica_set)
+    assert session.get_bind(clause=select(PortORM)) in ("behind", "caught_up")
+
+def test_parse_lsn_ignores_invalid_cookies():
+    assert parse_lsn("1234") == 1234
+    assert parse_lsn(None) == 0
+    assert parse_lsn("x") == 0
+    assert parse_lsn("-5") == 0
+
+def test_reads_fall_back_to_primary_without_healthy_replicas():
+    session = make_session([])
+
+    assert session.get_bind(clause=select(PortORM)) == "primary"
+    assert session.pinned_to_primary is False
+
+def test_middleware_carries_write_position_in_a_cookie():
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    from app.shared.replicas import READ_AFTER_LSN_COOKIE, ReadYourWritesMiddleware
+
+    app = FastAPI()
+    app.add_middleware(ReadYourWritesMiddleware, max_age_seconds=15)
+    seen = []
+
+    @app.post("/write")
+    async def write():
+        position = read_position.get()
+        seen.append(position.min_lsn)
+        position.written_lsn = 500
+        return {}
+
+    @app.get("/read")
+    async def read():
+        seen.append(read_position.get().min_lsn)
+        return {}
+
+    client = TestClient(app)
+    response = client.post("/write")
+    assert response.cookies[READ_AFTER_LSN_COOKIE] == "500"
+
+    # Las lecturas no tocan la cookie; la siguiente petición del cliente trae la posición
+    assert READ_AFTER_LSN_COOKIE not in client.get("/read").cookies
+    assert seen == [0, 500]
+
+@pytest.mark.asyncio
+async def test_health_check_probes_concurrently_and_drops_hung_replicas():
+    import asyncio
+
+    hung, lagging, fresh = FakeEngine("hung"), FakeEngine("lagging"), FakeEngine("fresh")
+    status = {lagging: (30.0, 10), fresh: (0.0, 20)}
+
+    class ProbedReplicaSet(ReplicaSet):
+        @staticmethod
+        async def _probe(engine):
+            if engine is hung:
+                await asyncio.sleep(60)
+            return status[engine]
+
+    replica_set = ProbedReplicaSet([hung, lagging, fresh])
+    await asyncio.wait_for(replica_set.check_health(max_lag_seconds=5.0, timeout_seconds=0.05), 1.0)
+
+    assert replica_set.healthy == [fresh]
+    assert replica_set.lag_seconds == {0: None, 1: 30.0, 2: 0.0}
+    assert replica_set.replay_lsn == {lagging: 10, fresh: 20}
@@ -0,0 +1,85 @@
+import asyncio
+
+import pytest
+from app.users.application.principal_cache import CachingUserRepository, PrincipalCache
+from app.users.application.use_cases.change_password import ChangePasswordUseCase
+from app.users.domain.models import User
+
+
+class FakeUserRepository:
+    def __init__(self):
+        self.users = {
+            1: User(id=1, username="admin", email="admin@example.com", hashed_password="old", is_admin=True, is_employee=False),
+        }
+        self.reads = 0
+
+    async def get_user_by_id(self, user_id):
+        self.reads += 1
+        await asyncio.sleep(0)
+        user = self.users.get(user_id)
+        return User(**vars(user)) if user else None
+
+    async def update_user(self, user):
+        self.users[user.id] = User(**vars(user))
+        return user
+
+    async def delete_user(self, user_id):
+        self.users.pop(user_id, None)
+
+
+@pytest.fixture
+def make_repo(clock):
+    def make(ttl=30.0):
+        inner = FakeUserRepository()
+        cache = PrincipalCache(max_entries=10, ttl_seconds=ttl, clock=clock)
+        return CachingUserRepository(inner, cache), inner, cache, clock
+    return make
+
+
+@pytest.mark.asyncio
+async def test_user_is_cached_until_ttl(make_repo):
+    repo, inner, _, clock = make_repo(ttl=30.0)
+
+    await repo.get_user_by_id(1)
+    await repo.get_user_by_id(1)
+    assert inner.reads == 1
+
+    clock.now = 31.0
+    await repo.get_user_by_id(1)
+    assert inner.reads == 2
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_are_loaded_once(make_repo):
+    repo, inner, _, _ = make_repo()
+
+    users = await asyncio.gather(*(repo.get_user_by_id(1) for _ in range(10)))
+
+    assert inner.reads == 1
+    assert all(u.username == "admin" for u in users)
+
+@pytest.mark.asyncio
+async def test_change_password_invalidates_cached_user(make_repo):
+    repo, inner, _, _ = make_repo()
+    requester = await repo.get_user_by_id(1)
+
+    await ChangePasswordUseCase(repo).execute(user_id=1, new_password_hash="new", requester=requester)
+
+    assert (await repo.get_user_by_id(1)).hashed_password == "new"
+
+@pytest.mark.asyncio
+async def test_cached_user_is_copied(make_repo):
+    repo, _, _, _ = make_repo()
+
+    user = await repo.get_user_by_id(1)
+    user.hashed_password = "mutated"
+
+    assert (await repo.get_user_by_id(1)).hashed_password == "old"
+
+@pytest.mark.asyncio
+async def test_deleted_user_is_not_served_from_cache(make_repo):
+    repo, _, _, _ = make_repo()
+
+    await repo.get_user_by_id(1)
+    await repo.delete_user(1)
+
+    assert await repo.get_user_by_id(1) is None
@@ -44,3 +44,13 @@ async def test_user_cannot_change_other_users_password():
 
     with pytest.raises(PermissionError):
         await use_case.execute(user_id=1, new_password_hash="hack", requester=requester)
+
+@pytest.mark.asyncio
+async def test_change_password_revokes_existing_tokens():
+    repo = FakeUserRepository()
+    revoked = []
+    use_case = ChangePasswordUseCase(repo, revoked.append)
+
+    await use_case.execute(user_id=2, new_password_hash="new", requester=repo.users[2])
+
+    assert revoked == ["2"]
@@ -0,0 +1,26 @@
+import pytest
+from app.users.application.use_cases.list_users import ListUsersUseCase
+from app.users.domain.models import User
+
+@pytest.mark.asyncio
+async def test_list_users_as_admin_passes_pagination(mocker):
+    mock_repo = mocker.AsyncMock()
+    use_case = ListUsersUseCase(mock_repo)
+
+    admin = User(id=1, username="admin", email="a@a.com", hashed_password="123", is_admin=True, is_employee=False)
+    mock_repo.list_users.return_value = [admin]
+
+    result = await use_case.execute(admin, after_id=10, limit=50)
+
+    assert result == [admin]
+    mock_repo.list_users.assert_called_once_with(after_id=10, limit=50)
+
+@pytest.mark.asyncio
+async def test_list_users_as_non_admin(mocker):
+    mock_repo = mocker.AsyncMock()
+    use_case = ListUsersUseCase(mock_repo)
+
+    requester = User(id=2, username="test", email="t@t.com", hashed_password="hash", is_admin=False, is_employee=False)
+
+    with pytest.raises(PermissionError):
+        await use_case.execute(requester)
@@ -0,0 +1,22 @@
+import pytest
+from sqlalchemy import inspect
+from app.users.infrastructure.models import UserORM
+
+
+def test_has_tablename():
+    assert UserORM.__tablename__ == 'users'
+
+def test_has_columns():
+    mapper = inspect(UserORM)
+    columns = {col.key for col in mapper.attrs}
+
+    assert columns == {'id', 'username', 'email', 'hashed_password', 'is_admin', 'is_employee'}
+
+def test_username_and_email_have_unique_indexes():
+    indexes = {index.name: index for index in UserORM.__table__.indexes}
+
+    # El login busca por username: tiene que ser un índice único
+    assert indexes['ix_users_username'].unique is True
+    assert [c.name for c in indexes['ix_users_username'].columns] == ['username']
+    assert indexes['ix_users_email'].unique is True
+    assert [c.name for c in indexes['ix_users_email'].columns] == ['email']
@@ -0,0 +1,62 @@
+import uuid
+
+import pytest
+from app.users.infrastructure.repositories import UserRepository
+from app.users.domain.models import User
+
+
+def new_user(**overrides):
+    suffix = uuid.uuid4().hex[:8]
+    data = dict(
+        id=0,
+        username=f"user_{suffix}",
+        email=f"user_{suffix}@example.com",
+        hashed_password="hash",
+        is_admin=False,
+        is_employee=False,
+    )
+    data.update(overrides)
+    return User(**data)
+
+@pytest.mark.asyncio
+async def test_create_and_get_by_username(session):
+    repo = UserRepository(session)
+
+    saved = await repo.create_user(new_user())
+    assert saved.id
+
+    fetched = await repo.get_user_by_username(saved.username)
+    assert fetched == saved
+
+@pytest.mark.asyncio
+async def test_create_user_with_duplicate_username(session):
+    repo = UserRepository(session)
+
+    saved = await repo.create_user(new_user())
+
+    with pytest.raises(ValueError):
+        await repo.create_user(new_user(username=saved.username))
+
+@pytest.mark.asyncio
+async def test_update_and_delete_user(session):
+    repo = UserRepository(session)
+
+    saved = await repo.create_user(new_user())
+    saved.is_employee = True
+    updated = await repo.update_user(saved)
+    assert updated.is_employee is True
+
+    await repo.delete_user(saved.id)
+    assert await repo.get_user_by_id(saved.id) is None
+
+@pytest.mark.asyncio
+async def test_list_users_is_paginated(session):
+    repo = UserRepository(session)
+
+    for _ in range(3):
+        await repo.create_user(new_user())
+
+    first_page = await repo.list_users(limit=2)
+    assert len(first_page) == 2
+    second_page = await repo.list_users(after_id=first_page[-1].id, limit=2)
+    assert all(u.id > first_page[-1].id for u in second_page)